@@ -190,12 +190,28 @@ def build_exchange_mapping(custom_mapping: Optional[Dict[str, Any]] = None) -> D
     return merged
 
 
+# 默认映射（无自定义覆盖）的大写品种→交易所查找表，首次解析时构建，此后逐合约复用
+_default_exchange_lookup: Optional[Dict[str, str]] = None
+
+
+def _exchange_lookup(exchange_mapping: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """大写品种→交易所查找表；同名（忽略大小写）时保留映射中的第一个，与逐项扫描一致。"""
+    global _default_exchange_lookup
+    if not exchange_mapping and _default_exchange_lookup is not None:
+        return _default_exchange_lookup
+    lookup: Dict[str, str] = {}
+    for key, exchange in build_exchange_mapping(exchange_mapping).items():
+        lookup.setdefault(str(key).upper(), exchange)
+    if not exchange_mapping:
+        _default_exchange_lookup = lookup
+    return lookup
+
+
 def resolve_product_exchange(
     product_or_instrument: Optional[str],
     exchange_mapping: Optional[Dict[str, Any]] = None,
     default_exchange: str = "CFFEX",
 ) -> str:
-    normalized_mapping = build_exchange_mapping(exchange_mapping)
     token = str(product_or_instrument or "")
     product_code = token
     try:
@@ -207,11 +223,7 @@ def resolve_product_exchange(
             product_code = parsed.get('product', token)
     except (ValueError, KeyError) as e:
         logging.warning(f"[resolve_product_exchange] 解析合约失败 token={token}: {e}")
-    result = None
-    for key in normalized_mapping:
-        if str(key).upper() == product_code.upper():
-            result = normalized_mapping[key]
-            break
+    result = _exchange_lookup(exchange_mapping).get(product_code.upper())
     return result or str(default_exchange or "CFFEX")
 
 
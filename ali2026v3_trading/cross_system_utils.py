@@ -15,7 +15,6 @@ import logging
 import math
 import threading
 import time
-import traceback
 from contextlib import contextmanager
 from typing import Any, Callable, Dict, Optional
 
@@ -238,8 +237,8 @@ def log_exception_with_stack(logger_instance: logging.Logger, message: str,
         message: 错误消息
         level: 日志级别
     """
-    stack = traceback.format_exc()
-    logger_instance.log(level, "%s\n%s", message, stack)
+    # exc_info交由logging惰性格式化：级别被过滤时不遍历栈帧
+    logger_instance.log(level, "%s", message, exc_info=True)
 
 
 def safe_execute(func: Callable, *args, logger_instance: Optional[logging.Logger] = None,
@@ -253,8 +252,8 @@ def safe_execute(func: Callable, *args, logger_instance: Optional[logging.Logger
         return func(*args, **kwargs)
     except Exception as e:
         _log.error(
-            "[R4-D-14] %s 执行异常: %s\n%s",
-            func.__name__, e, traceback.format_exc(),
+            "[R4-D-14] %s 执行异常: %s",
+            func.__name__, e, exc_info=True,
         )
         return default
 
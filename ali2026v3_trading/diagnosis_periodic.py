@@ -47,6 +47,15 @@ def _emit_periodic_resource_ownership_snapshot(runtime_core) -> None:
 
 
 _DIAGNOSIS_STARTUP_GRACE_SECONDS = 60.0
+
+# 线程资源归属扫描：视为平台/系统线程的名称前缀（str.startswith元组一次匹配）
+_SYSTEM_THREAD_PREFIXES = (
+    'Main', 'Thread-', 'APScheduler', 'ThreadPoolExecutor',
+    'Storage-AsyncWriter[shared-service]', 'Storage-Cleanup[shared-service]',
+    'SubAsyncWriter[shared-service]', 'SubRetry[shared-service]', 'SubCleanup[shared-service]',
+    'TTypeService-Preload[shared-service]', 'onStop-worker',
+)
+
 _first_diagnosis_call_time: Optional[float] = None
 _first_diagnosis_call_lock = threading.Lock()
 
@@ -418,12 +427,6 @@ class ResourceOwnershipScanner:
             _sid = 'unknown'
         strategy_id = _sid
         run_id = getattr(strategy_core, '_lifecycle_run_id', 'N/A')
-        ALLOWED_PREFIXES = (
-            'Main', 'Thread-', 'APScheduler', 'ThreadPoolExecutor',
-            'Storage-AsyncWriter[shared-service]', 'Storage-Cleanup[shared-service]',
-            'SubAsyncWriter[shared-service]', 'SubRetry[shared-service]', 'SubCleanup[shared-service]',
-            'TTypeService-Preload[shared-service]', 'onStop-worker',
-        )
         threads = _threading.enumerate()
         strategy_threads = []
         shared_threads = []
@@ -432,7 +435,7 @@ class ResourceOwnershipScanner:
             name = t.name or ''
             if '[shared-service]' in name:
                 shared_threads.append(name)
-            elif any(name.startswith(p) for p in ALLOWED_PREFIXES):
+            elif name.startswith(_SYSTEM_THREAD_PREFIXES):
                 system_threads.append(name)
             elif 'strategy' in name.lower() or strategy_id in name:
                 strategy_threads.append(name)
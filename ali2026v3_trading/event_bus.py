@@ -84,7 +84,8 @@ class EventBus:
             enable_persistence: 是否启用事件持久化（默认False）
             persistence_dir: 持久化目录（默认None）
         """
-        self._subscribers: Dict[str, List[Tuple[Callable, int]]] = {}
+        # 订阅者列表以不可变tuple保存（写时复制，按priority降序），发布时直接引用无需复制/排序
+        self._subscribers: Dict[str, Tuple[Tuple[Callable, int], ...]] = {}
         self._callback_mapping: Dict[Callable, Callable] = {}  # P1 Bug #59修复：original_callback -> wrapped_callback映射
         self._callback_set: Dict[str, Set[Callable]] = {}  # P2 Bug #116修复：使用set存储回调引用，O(1)查找
         self._lock = threading.RLock()
@@ -202,13 +203,14 @@ class EventBus:
         
         with self._lock:
             if event_type not in self._subscribers:
-                self._subscribers[event_type] = []
+                self._subscribers[event_type] = ()
                 self._callback_set[event_type] = set()
             
             if actual_callback not in self._callback_set[event_type]:
-                self._subscribers[event_type].append((actual_callback, priority))
                 self._callback_set[event_type].add(actual_callback)
-                self._subscribers[event_type].sort(key=lambda x: x[1], reverse=True)
+                self._subscribers[event_type] = tuple(sorted(
+                    self._subscribers[event_type] + ((actual_callback, priority),),
+                    key=lambda x: x[1], reverse=True))
                 logging.debug(f"[EventBus] Subscribed to '{event_type}' with priority {priority} "
                             f"(total: {len(self._subscribers[event_type])} subscribers)")
 
@@ -282,10 +284,10 @@ class EventBus:
                 _, weak_wrapper = self._weak_refs.pop(original_callback)
                 # 从订阅者列表中移除weak_wrapper
                 if event_type in self._subscribers:
-                    self._subscribers[event_type] = [
+                    self._subscribers[event_type] = tuple(
                         (cb, pri) for cb, pri in self._subscribers[event_type]
                         if cb is not weak_wrapper
-                    ]
+                    )
                     if event_type in self._callback_set:
                         self._callback_set[event_type].discard(weak_wrapper)
                     if not self._subscribers[event_type]:
@@ -313,10 +315,10 @@ class EventBus:
                 
                 # 从列表中移除
                 original_len = len(self._subscribers[event_type])
-                self._subscribers[event_type] = [
+                self._subscribers[event_type] = tuple(
                     (cb, priority) for cb, priority in self._subscribers[event_type]
                     if cb != actual_callback
-                ]
+                )
                 
                 # R13-P1-DEAD-07修复: 记录订阅者计数递减，确保unsubscribe可追踪
                 removed_count = original_len - len(self._subscribers[event_type])
@@ -387,8 +389,7 @@ class EventBus:
                 _CRITICAL_EVENT_TYPES = frozenset(['SignalEvent', 'OrderEvent', 'RiskEvent', 'CircuitBreakerTriggeredEvent'])
                 if _event_type_name in _CRITICAL_EVENT_TYPES:
                     logging.warning("[RES-P1-15] 背压降级: 关键事件%s转为同步分发", _event_type_name)
-                    with self._lock:
-                        callbacks = self._subscribers.get(_event_type_name, []).copy()
+                    callbacks = self._subscribers.get(_event_type_name, ())
                     if callbacks:
                         self._invoke_all_callbacks(callbacks, event, _event_type_name)
                     return True
@@ -420,9 +421,8 @@ class EventBus:
         # 记录事件历史
         self._record_event(event_type, event)
         
-        # 获取所有订阅者
-        with self._lock:
-            callbacks = self._subscribers.get(event_type, []).copy()
+        # 获取所有订阅者（不可变快照，无需加锁复制）
+        callbacks = self._subscribers.get(event_type, ())
         
         if not callbacks:
             logging.debug(
@@ -485,12 +485,21 @@ class EventBus:
                     f"Publish callback error: {e}"
                 )
     
-    def _invoke_all_callbacks(self, callbacks: List[tuple], event: Any, event_type: str) -> bool:
-        # R15-P1-PERF-09修复: 按priority降序排序，高优先级先执行
-        sorted_callbacks = sorted(callbacks, key=lambda cb: cb[1], reverse=True)
+    def _invoke_all_callbacks(self, callbacks: Tuple[tuple, ...], event: Any, event_type: str) -> bool:
+        """按给定顺序依次执行订阅者回调
+        
+        Args:
+            callbacks: 订阅快照元组 ((callback, priority), ...)，调用方须传入subscribe时已按priority降序排好的快照
+            event: 事件对象
+            event_type: 事件类型（仅用于日志）
+        
+        Returns:
+            bool: 全部回调成功返回 True
+        """
+        # R15-P1-PERF-09修复: 按priority降序执行；订阅快照在subscribe时已排好序，此处不再重复排序
         # R5-E-06/R5-T-06修复: 单个订阅者异常不影响其他订阅者（已有try/except隔离）；事件不丢失（all_success标记但不中断）
         all_success = True
-        for callback, priority in sorted_callbacks:
+        for callback, priority in callbacks:
             try:
                 callback(event)
             except Exception as e:
@@ -972,8 +981,7 @@ class EventBus:
 
         for event_record in replayed:
             etype = event_record.get('type', '')
-            with self._lock:
-                callbacks = self._subscribers.get(etype, []).copy()
+            callbacks = self._subscribers.get(etype, ())
             for callback, _priority in callbacks:
                 try:
                     callback(event_record)
@@ -514,16 +514,16 @@ class ParamsService:
             raise
 
     def get_all_instrument_cache(self) -> Dict[str, Dict[str, Any]]:
-        """返回当前合约缓存的深拷贝副本（基于新架构）。"""
-        import copy
+        """返回当前合约缓存的副本（基于新架构，每条元数据浅拷贝）。"""
         with self._lock:
-            # 从新架构构建等效的instrument_cache格式
+            # 从新架构构建等效的instrument_cache格式，一次遍历完成筛选与拷贝
+            meta_by_id = self._instrument_meta_by_id
             result = {}
             for instrument_id, internal_id in self._instrument_id_to_internal_id.items():
-                meta = self._instrument_meta_by_id.get(internal_id)
+                meta = meta_by_id.get(internal_id)
                 if meta:
-                    result[instrument_id] = meta
-            return {k: dict(v) if isinstance(v, dict) else v for k, v in result.items()}  # R21-MEM-P1-04修复: 浅拷贝替代deepcopy
+                    result[instrument_id] = dict(meta) if isinstance(meta, dict) else meta  # R21-MEM-P1-04修复: 浅拷贝替代deepcopy
+            return result
 
     def get_all_instrument_ids(self) -> List[str]:
         """返回当前缓存中的全部合约代码（基于新架构）。"""
@@ -1956,7 +1956,7 @@ class ParamsService:
             result: Dict[str, Any] = {}
             quant_prefixes = ('kelly_', 'risk_', 'max_', 'delay_', 'tvf_', 'sortino_', 'calmar_', 'sharpe_')
             for k, v in self._params.items():
-                if isinstance(k, str) and any(k.startswith(p) for p in quant_prefixes):
+                if isinstance(k, str) and k.startswith(quant_prefixes):
                     result[k] = v
             result.setdefault('kelly_fraction', 0.25)
             result.setdefault('max_drawdown_pct', 5.0)
@@ -1979,7 +1979,7 @@ class ParamsService:
             result: Dict[str, Any] = {}
             intuition_prefixes = ('box_', 'spring_', 'resonance_', 'correct_', 'incorrect_', 'other_')
             for k, v in self._params.items():
-                if isinstance(k, str) and any(k.startswith(p) for p in intuition_prefixes):
+                if isinstance(k, str) and k.startswith(intuition_prefixes):
                     result[k] = v
             result.setdefault('box_gain_ratio', 0.618)
             result.setdefault('spring_threshold', 0.5)
@@ -2083,15 +2083,16 @@ def get_params_by_strategy_type(strategy_type: str = "all") -> Dict[str, Any]:
     all_params = ps.get_all()
     if strategy_type == "all":
         return all_params
+    # 前缀用元组：str.startswith 一次调用匹配全部前缀
     strategy_prefix_map = {
-        "box_extreme": ["box_", "extreme_", "n1_"],
-        "spring": ["spring_", "bounce_"],
-        "trend": ["trend_", "ma_", "ema_", "macd_"],
-        "arbitrage": ["arb_", "spread_"],
-        "market_making": ["mm_", "quote_"],
+        "box_extreme": ("box_", "extreme_", "n1_"),
+        "spring": ("spring_", "bounce_"),
+        "trend": ("trend_", "ma_", "ema_", "macd_"),
+        "arbitrage": ("arb_", "spread_"),
+        "market_making": ("mm_", "quote_"),
     }
-    prefixes = strategy_prefix_map.get(strategy_type, [strategy_type + "_"])
-    return {k: v for k, v in all_params.items() if any(k.startswith(p) for p in prefixes)}
+    prefixes = strategy_prefix_map.get(strategy_type, strategy_type + "_")
+    return {k: v for k, v in all_params.items() if k.startswith(prefixes)}
 
 
 
@@ -2645,7 +2646,6 @@ def verify_rollback(original_params: Dict[str, Any],
     Returns:
         Dict: {can_rollback: bool, missing_keys: list, extra_keys: list, value_diffs: list}
     """
-    import copy as _copy
     original_keys = set(original_params.keys())
     backup_keys = set(backup_params.keys())
 
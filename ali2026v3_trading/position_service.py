@@ -21,8 +21,14 @@ Handles position lifecycle: open, close, query, and risk management.
 - 使用 storage.py 统一数据持久化"""
 from __future__ import annotations
 
+import atexit as _atexit
+import hashlib
+import itertools
 import json
 import logging
+import operator
+import re
+import weakref
 from ali2026v3_trading.serialization_utils import json_dumps, json_loads, json_default_serializer
 from ali2026v3_trading.performance_monitor import count_call
 from ali2026v3_trading import config_params
@@ -49,10 +55,12 @@ from ali2026v3_trading.resilience_utils import (
 )
 import os
 import threading
+import time
+from collections import defaultdict
 from dataclasses import dataclass, field, asdict
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 # R22-TIME-01: 统一时区常量
 _CHINA_TZ = timezone(timedelta(hours=8))
@@ -107,6 +115,7 @@ class PositionRecord(object):
         stop_profit_price: 止盈价格
         chase_count: 追单次数
         open_reason: V7新增-开仓理由编码 (CORRECT_RESONANCE/CORRECT_DIVERGENCE/INCORRECT_REVERSAL/OTHER_SCALP/MANUAL)
+        dir_sign: 方向符号 (+1=多, -1=空)，开仓时由volume确定，供止盈止损等热路径无分支比较
     """
     position_id: str
     instrument_id: str
@@ -131,7 +140,19 @@ class PositionRecord(object):
     profit_slope: float = 0.0
     current_price: float = 0.0
     option_premium: float = 0.0
-    
+    dir_sign: int = 0
+    _open_date_str: str = field(default='', init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.dir_sign:
+            self.dir_sign = 1 if self.volume > 0 else -1
+        # 开仓日期不变，展示用字符串创建时格式化一次
+        open_date = self.open_date
+        if isinstance(open_date, datetime):
+            open_date = open_date.date()
+        if open_date is not None:
+            self._open_date_str = open_date.strftime("%Y-%m-%d")
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典（用于 JSON 序列化）"""
         return {
@@ -193,6 +214,7 @@ class PositionLimitConfig(object):
         position_type: 投机/套保/套利分类  # CMP-04新增
         effective_until: 有效期至
         created_at: 创建时间
+        _deadline_ns: 有效期截止的monotonic_ns时刻(0=永久)，创建时由effective_until换算，供is_valid整数比较
     """
     limit_amount: float
     account_id: str
@@ -201,14 +223,19 @@ class PositionLimitConfig(object):
     position_type: str = "SPECULATIVE"  # CMP-04新增: 投机/套保/套利
     effective_until: Optional[datetime] = None
     created_at: datetime = field(default_factory=lambda: datetime.now(_CHINA_TZ))
-    
+    _deadline_ns: int = field(default=0, init=False, repr=False, compare=False)
+    _until_str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # datetime只在创建/序列化边界使用，有效期检查换算为单调时钟截止时刻
+        if self.effective_until:
+            self._until_str = self.effective_until.strftime("%Y-%m-%d %H:%M:%S")
+            remaining_ns = int((self.effective_until.timestamp() - time.time()) * 1e9)
+            self._deadline_ns = max(time.monotonic_ns() + remaining_ns, 1)
+
     def is_valid(self) -> bool:
         """检查限额有效"""
-        if self.limit_amount <= 0:
-            return False
-        if self.effective_until and datetime.now(_CHINA_TZ) > self.effective_until:
-            return False
-        return True
+        return self.limit_amount > 0 and (self._deadline_ns == 0 or time.monotonic_ns() < self._deadline_ns)
 
 
 class PositionService(object):
@@ -274,6 +301,22 @@ class PositionService(object):
     DEFAULT_VALID_HOURS = 24
     MAX_VALID_HOURS = 720
 
+    # 成交/行情对象字段提取：每个字段按优先级排列的候选属性名及缺省值
+    _TRADE_FIELDS = (
+        ("instrument_id", "InstrumentID"), ("exchange", "ExchangeID"),
+        ("direction", "Direction"), ("offset_flag", "OffsetFlag"),
+        ("price", "Price"), ("volume", "Volume"), ("order_id", "OrderID"),
+    )
+    _TRADE_DEFAULTS = ("", "", "", "", 0, 0, "")
+    _TICK_FIELDS = (("last_price", "LastPrice", "price", "last"), ("instrument_id", "InstrumentID"))
+    _TICK_DEFAULTS = (0, "")
+    # 按类型缓存的提取器上限，防止Mock等每实例独立类型的对象无限增长
+    _EXTRACTOR_CACHE_MAX = 64
+
+    # 限额配置落盘去抖：最后一次变更后延迟写入，累计变更达到阈值时立即写入
+    CONFIG_SAVE_DEBOUNCE_SEC = 2.0
+    CONFIG_SAVE_FORCE_FLUSH_COUNT = 50
+
     CRM_SL_CLIP_LOWER = 0.01
     CRM_SL_CLIP_UPPER = 0.99
     DEFAULT_TARGET_PLR = 2.0
@@ -299,6 +342,17 @@ class PositionService(object):
         self._data_service_ready: bool = False
         # 持仓数据结构：{ instrument_id: { position_id: PositionRecord } }
         self.positions: Dict[str, Dict[str, PositionRecord]] = {}
+        # 持仓ID索引：{ position_id: (instrument_id, PositionRecord) }，与positions同步增删，O(1)按ID定位
+        self._pid_index: Dict[str, Tuple[str, PositionRecord]] = {}
+        # 持仓ID生成：实例启动时刻(毫秒,16进制)区分进程，自增计数保证进程内唯一，开仓时不再读时钟/生成uuid
+        self._pid_session = format(int(time.time() * 1000), 'x')
+        self._pid_counter = itertools.count(1)
+        # 标的期货倒排索引：{ future_root: {instrument_id, ...} }，仅含当前有持仓的合约
+        self._future_to_insts: Dict[str, set] = {}
+        # 有持仓合约集合：变更时整体替换为新frozenset(RCU式发布)，on_tick无锁读取做快速过滤
+        self._interest_set: frozenset = frozenset()
+        # 持仓索引(_future_to_insts/_interest_set)专用叶子锁：在合约锁内获取，不与global_lock嵌套，避免锁顺序反转
+        self._position_index_lock = threading.Lock()
         # [FR-P1-05-FIX] 持仓快照时间戳和TTL校验
         self._position_snapshot_time: float = 0.0
         self._position_snapshot_ttl: float = 300.0  # 5分钟TTL
@@ -306,8 +360,15 @@ class PositionService(object):
         # 持仓限额配置：已删除limit_configs本地存储，统一使用RiskService._position_limits
         # ✅ 传递渠道唯一#65：RiskService为唯一限额源，本地仅从ID读取
 
-        # 配置文件
-        self.config_file = "option_buy_limits.json"
+        # 配置文件：运行期限额变更落盘于此，启动时覆盖get_config()中的同账户限额
+        self.config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "option_buy_limits.json")
+        # 配置落盘去抖状态：上次写入内容摘要、未落盘变更计数（到期时刻登记在类级_config_flush_due）
+        self._last_saved_config_digest: Optional[bytes] = None
+        self._config_dirty_count: int = 0
+        self._config_save_lock = threading.Lock()
+
+        # 成交/行情字段提取器缓存：{(type, fields): extractor}
+        self._extractor_cache: Dict[Tuple[type, tuple], Callable[[Any], tuple]] = {}
 
         # 线程安全锁 - 按合约分片锁
         # R21-CC-P2-05修复: RLock vs Lock选择说明
@@ -527,6 +588,72 @@ class PositionService(object):
                 return val
         return default
 
+    def _extract_fields(self, obj: Any, fields: tuple, defaults: tuple) -> tuple:
+        """按对象类型缓存的批量字段提取，语义与逐字段_get_platform_attr一致
+
+        Args:
+            obj: 成交/行情对象
+            fields: 每个字段的候选属性名元组
+            defaults: 每个字段的缺省值
+
+        Returns:
+            tuple: 与fields一一对应的字段值
+        """
+        cache = self._extractor_cache
+        key = (type(obj), fields)
+        extract = cache.get(key)
+        if extract is None:
+            extract = self._build_extractor(obj, fields, defaults)
+            if len(cache) < self._EXTRACTOR_CACHE_MAX:
+                cache[key] = extract
+        try:
+            return extract(obj)
+        except AttributeError:
+            # 同类型实例属性不一致(如SimpleNamespace)，退回逐字段查找
+            get_attr = self._get_platform_attr
+            return tuple(get_attr(obj, *names, default=dflt) for names, dflt in zip(fields, defaults))
+
+    def _build_extractor(self, obj: Any, fields: tuple, defaults: tuple) -> Callable[[Any], tuple]:
+        """以首个样本对象探测每个字段实际存在的属性名，生成单次attrgetter提取闭包
+
+        主属性取值为None/''时仍按候选链回退，样本上不存在的字段每次走逐字段查找。
+        """
+        present = []
+        primaries = []
+        for idx, names in enumerate(fields):
+            for name in names:
+                if hasattr(obj, name):
+                    present.append(idx)
+                    primaries.append(name)
+                    break
+        absent = tuple(idx for idx in range(len(fields)) if idx not in present)
+        present = tuple(present)
+        get_attr = self._get_platform_attr
+        if not present:
+            def extract(o):
+                return tuple(get_attr(o, *names, default=dflt) for names, dflt in zip(fields, defaults))
+            return extract
+        getter = operator.attrgetter(*primaries)
+        single = len(primaries) == 1
+        complete = not absent
+
+        def extract(o):
+            got = getter(o)
+            if single:
+                got = (got,)
+            # 稳态快路径：字段齐全且主属性均有值时直接返回attrgetter结果，不再逐字段回退
+            if complete and None not in got and '' not in got:
+                return got
+            values = list(defaults)
+            for idx, val in zip(present, got):
+                if val is None or val == '':
+                    val = get_attr(o, *fields[idx], default=defaults[idx])
+                values[idx] = val
+            for idx in absent:
+                values[idx] = get_attr(o, *fields[idx], default=defaults[idx])
+            return tuple(values)
+        return extract
+
     # R15-P0-RES-06修复: 持仓状态持久化与恢复
     def _append_position_state(self, instrument_id: str, position_id: str, action: str, detail: dict = None):
         """追加写入持仓状态到JSONL文件"""
@@ -615,16 +742,10 @@ class PositionService(object):
         )
 
         try:
-            # 使用统一方法获取平台属性，避免重复的双属性路径
-            inst_id = self._get_platform_attr(trade, "instrument_id", "InstrumentID", default="")
-            exch = self._get_platform_attr(trade, "exchange", "ExchangeID", default="")
-
+            # 按成交对象类型缓存的提取器一次取齐字段，避免逐字段getattr双属性路径
             # Direction: 0=Buy, 1=Sell; Offset: 0=Open, 1=Close
-            d_raw = self._get_platform_attr(trade, "direction", "Direction", default="")
-            o_raw = self._get_platform_attr(trade, "offset_flag", "OffsetFlag", default="")
-
-            price = self._get_platform_attr(trade, "price", "Price", default=0)
-            volume = self._get_platform_attr(trade, "volume", "Volume", default=0)
+            inst_id, exch, d_raw, o_raw, price, volume, order_id = self._extract_fields(
+                trade, self._TRADE_FIELDS, self._TRADE_DEFAULTS)
             # R24-P2-IV-06修复: trade字段提取容错——验证price/volume类型和范围
             try:
                 price = float(price) if price is not None else 0.0
@@ -639,8 +760,7 @@ class PositionService(object):
             is_buy = (str(d_raw) == "0")
             is_open = (str(o_raw) == "0")
 
-            # ✅ P0修复: order_id在partial_fill_handler块外初始化，避免平仓分支UnboundLocalError
-            order_id = self._get_platform_attr(trade, "order_id", "OrderID", default="")
+            # ✅ P0修复: order_id在partial_fill_handler块外初始化(随字段提取一并取得)，避免平仓分支UnboundLocalError
 
             # ✅ 集成部分成交处理（L-P0-3）
             if self.partial_fill_handler is not None:
@@ -670,7 +790,8 @@ class PositionService(object):
             if is_open:
                 vol_signed = volume if is_buy else -volume
                 open_reason = self._get_open_reason_from_order(inst_id, order_id=order_id)
-                self._add_position(exch, inst_id, vol_signed, price, open_reason=open_reason, order_id=order_id)
+                self._add_position(exch, inst_id, vol_signed, price, open_reason=open_reason,
+                                   order_id=order_id, now=datetime.now(_CHINA_TZ))
             else:
                 # 平仓：买入平仓(减空), 卖出平仓 (减多)
                 self._reduce_position(exch, inst_id, volume, is_buy, price)
@@ -690,88 +811,20 @@ class PositionService(object):
             tick: Tick 数据对象
         """
         try:
-            # 使用统一方法获取价格（优先级：last_price > LastPrice > price > last）
-            price = self._get_platform_attr(tick, "last_price", "LastPrice", "price", "last", default=0)
+            # 价格优先级：last_price > LastPrice > price > last；合约ID随价格一并提取
+            price, inst_id = self._extract_fields(tick, self._TICK_FIELDS, self._TICK_DEFAULTS)
 
             # R24-P1-IV-10修复: 使用safe_price_check替代price<=0，防止NaN/Inf穿透
             from ali2026v3_trading.shared_utils import safe_price_check
             if not safe_price_check(price):
                 return
             
-            # 使用统一方法获取合约ID
-            inst_id = self._get_platform_attr(tick, "instrument_id", "InstrumentID", default="")
             if not inst_id:
                 return
             
-            # R13-P1-BIZ-04修复: 期权到期日检查 — 每个tick检查持仓的days_to_expiry
-            self._check_option_expiry(inst_id)
-            
-            # 检查该合约的所有持仓
-            # R21-CC-P1-09修复: 将np.polyfit计算移到锁外，减少持锁时间
-            _slope_updates = {}  # pid -> computed_slope，锁外计算，锁内赋值
-            with self._get_instrument_lock(inst_id):
-                if inst_id in self.positions:
-                    # R15-P0-PERF-03修复: 仅复制键列表，避免tuple(items())创建完整快照
-                    for pid in list(self.positions[inst_id]):
-                        record = self.positions[inst_id].get(pid)
-                        if record is None:
-                            continue
-                        self._check_stop_profit(record, price)
-                        self._check_stop_loss(record, price)
-
-                        if record.volume != 0 and record.open_price > 0:
-                            # DFG-01修复: 更新current_price，供check_trailing_stop()使用
-                            record.current_price = price
-                            if record.volume > 0:
-                                profit_pct = (price - record.open_price) / record.open_price
-                            else:
-                                profit_pct = (record.open_price - price) / record.open_price
-                            prev_max = getattr(record, '_max_profit_pct', 0.0)
-                            if profit_pct > prev_max:
-                                record._max_profit_pct = profit_pct
-                            # ✅ P0-8修复: 计算profit_slope
-                            if record._profit_history is None:
-                                record._profit_history = []
-                            record._profit_history.append(profit_pct)
-                            # R21-CC-P1-09修复: 仅在锁内快照_profit_history，计算移到锁外
-                            if len(record._profit_history) >= 5:
-                                _slope_updates[pid] = list(record._profit_history)
-
-            # R21-CC-P1-09修复: np.polyfit在锁外执行，避免GIL+锁双重阻塞
-            _computed_slopes = {}
-            for pid, history_snapshot in _slope_updates.items():
-                _computed_slope = None
-                if len(history_snapshot) >= 5:
-                    if _HAS_NUMPY:
-                        try:
-                            _computed_slope = float(np.polyfit(
-                                range(len(history_snapshot)),
-                                history_snapshot, 1)[0])
-                        except (ValueError, np.linalg.LinAlgError):
-                            n = len(history_snapshot)
-                            x_mean = (n - 1) / 2.0
-                            y_mean = sum(history_snapshot) / n
-                            num = sum((i - x_mean) * (history_snapshot[i] - y_mean) for i in range(n))
-                            den = sum((i - x_mean) ** 2 for i in range(n))
-                            _computed_slope = num / den if den > 0 else 0.0
-                    else:
-                        n = len(history_snapshot)
-                        x_mean = (n - 1) / 2.0
-                        y_mean = sum(history_snapshot) / n
-                        num = sum((i - x_mean) * (history_snapshot[i] - y_mean) for i in range(n))
-                        den = sum((i - x_mean) ** 2 for i in range(n))
-                        _computed_slope = num / den if den > 0 else 0.0
-                    if _computed_slope is not None:
-                        _computed_slopes[pid] = _computed_slope
-
-            # R21-CC-P1-09修复: 锁内仅做赋值操作
-            if _computed_slopes:
-                with self._get_instrument_lock(inst_id):
-                    if inst_id in self.positions:
-                        for pid, slope in _computed_slopes.items():
-                            record = self.positions[inst_id].get(pid)
-                            if record is not None:
-                                record.profit_slope = slope
+            # 无持仓合约的tick直接跳过持仓检查，不触碰任何锁（_interest_set按引用整体替换发布，读无需加锁）
+            if inst_id in self._interest_set:
+                self._check_positions_on_tick(inst_id, price)
 
             # DFG-04修复: 发布TickEvent到EventBus
             try:
@@ -786,6 +839,78 @@ class PositionService(object):
         except Exception as e:
             logging.error(f"[PositionService.on_tick] Error: {e}")
     
+    def _check_positions_on_tick(self, inst_id: str, price: float) -> None:
+        """对有持仓的合约执行逐tick检查 (期权到期/止盈/止损/利润斜率)"""
+        # R13-P1-BIZ-04修复: 期权到期日检查 — 每个tick检查持仓的days_to_expiry
+        self._check_option_expiry(inst_id)
+
+        # 检查该合约的所有持仓
+        # R21-CC-P1-09修复: 将np.polyfit计算移到锁外，减少持锁时间
+        _slope_updates = {}  # pid -> computed_slope，锁外计算，锁内赋值
+        # 止盈止损触发先收集、遍历结束后再平仓：平仓可能同步回调成交并删除记录，
+        # 延后执行后可直接遍历items()，无需每tick复制键列表；局部列表保证多线程on_tick互不干扰
+        _triggered: List[Tuple[PositionRecord, str, float]] = []
+        with self._get_instrument_lock(inst_id):
+            pos_map = self.positions.get(inst_id)
+            if pos_map:
+                for pid, record in pos_map.items():
+                    self._check_stop_profit(record, price, _triggered)
+                    self._check_stop_loss(record, price, _triggered)
+
+                    if record.volume != 0 and record.open_price > 0:
+                        # DFG-01修复: 更新current_price，供check_trailing_stop()使用
+                        record.current_price = price
+                        profit_pct = (price - record.open_price) * record.dir_sign / record.open_price
+                        prev_max = getattr(record, '_max_profit_pct', 0.0)
+                        if profit_pct > prev_max:
+                            record._max_profit_pct = profit_pct
+                        # ✅ P0-8修复: 计算profit_slope
+                        if record._profit_history is None:
+                            record._profit_history = []
+                        record._profit_history.append(profit_pct)
+                        # R21-CC-P1-09修复: 仅在锁内快照_profit_history，计算移到锁外
+                        if len(record._profit_history) >= 5:
+                            _slope_updates[pid] = list(record._profit_history)
+
+            for record, reason, close_price in _triggered:
+                self._trigger_close_position(record, reason, close_price)
+
+        # R21-CC-P1-09修复: np.polyfit在锁外执行，避免GIL+锁双重阻塞
+        _computed_slopes = {}
+        for pid, history_snapshot in _slope_updates.items():
+            _computed_slope = None
+            if len(history_snapshot) >= 5:
+                if _HAS_NUMPY:
+                    try:
+                        _computed_slope = float(np.polyfit(
+                            range(len(history_snapshot)),
+                            history_snapshot, 1)[0])
+                    except (ValueError, np.linalg.LinAlgError):
+                        n = len(history_snapshot)
+                        x_mean = (n - 1) / 2.0
+                        y_mean = sum(history_snapshot) / n
+                        num = sum((i - x_mean) * (history_snapshot[i] - y_mean) for i in range(n))
+                        den = sum((i - x_mean) ** 2 for i in range(n))
+                        _computed_slope = num / den if den > 0 else 0.0
+                else:
+                    n = len(history_snapshot)
+                    x_mean = (n - 1) / 2.0
+                    y_mean = sum(history_snapshot) / n
+                    num = sum((i - x_mean) * (history_snapshot[i] - y_mean) for i in range(n))
+                    den = sum((i - x_mean) ** 2 for i in range(n))
+                    _computed_slope = num / den if den > 0 else 0.0
+                if _computed_slope is not None:
+                    _computed_slopes[pid] = _computed_slope
+
+        # R21-CC-P1-09修复: 锁内仅做赋值操作
+        if _computed_slopes:
+            with self._get_instrument_lock(inst_id):
+                if inst_id in self.positions:
+                    for pid, slope in _computed_slopes.items():
+                        record = self.positions[inst_id].get(pid)
+                        if record is not None:
+                            record.profit_slope = slope
+
     def on_tick_dropped(self, event_data: dict) -> None:
         """R31-P0-04修复: tick丢弃事件处理 — 标记该合约行情中断，止损基于最后已知价格
         
@@ -847,6 +972,7 @@ class PositionService(object):
                         effective_until=until
                     )
                     logging.info(f"[PositionService.set_position_limit] Set limit via RiskService API for {account_id}")
+                    self._schedule_save_position_configs()
                     return True
                 except Exception as e:
                     logging.error(f"[PositionService.set_position_limit] Failed to set limit via RiskService: {e}")
@@ -904,6 +1030,41 @@ class PositionService(object):
                 "positions": positions
             }
     
+    def _next_position_id(self, instrument_id: str) -> str:
+        """生成持仓ID: {合约}_{会话标识}_{序号}，next(itertools.count)在GIL下原子"""
+        return f"{instrument_id}_{self._pid_session}_{next(self._pid_counter)}"
+
+    def get_position_by_id(self, position_id: str) -> Optional[PositionRecord]:
+        """按持仓ID获取持仓记录（经_pid_index直接定位，无需遍历全部合约）
+
+        Args:
+            position_id: 持仓ID
+
+        Returns:
+            PositionRecord或None
+        """
+        entry = self._pid_index.get(position_id)
+        return entry[1] if entry is not None else None
+
+    def get_positions_for_future(self, future_symbol: str) -> List[PositionRecord]:
+        """获取某标的期货(品种+月份，如IO2606/cu2606)下全部合约的持仓记录
+
+        经_future_to_insts倒排索引只访问匹配合约，无需对全部合约做子串匹配。
+
+        Args:
+            future_symbol: 标的期货代码
+
+        Returns:
+            list: PositionRecord列表
+        """
+        result: List[PositionRecord] = []
+        with self._position_index_lock:
+            insts = tuple(self._future_to_insts.get(_future_root(future_symbol), ()))
+        for inst_id in insts:
+            with self._get_instrument_lock(inst_id):
+                result.extend(self.positions.get(inst_id, {}).values())
+        return result
+
     def get_net_position(self, instrument_id: str) -> int:
         """获取某合约的净持仓量
 
@@ -912,11 +1073,14 @@ class PositionService(object):
 
         Returns:
             int: 净持仓量 (正=净多，负=净空)
+
+        只读路径不加锁：dict.get与tuple(values())在GIL下均为单次C调用，
+        读到的是某一时刻的完整快照，最多滞后一次写入。
         """
-        with self._get_instrument_lock(instrument_id):
-            if instrument_id not in self.positions:
-                return 0
-            return sum(rec.volume for rec in self.positions[instrument_id].values())
+        pos_dict = self.positions.get(instrument_id)
+        if not pos_dict:
+            return 0
+        return sum(rec.volume for rec in tuple(pos_dict.values()))
 
     def validate_net_position_consistency(self, instrument_id: str) -> bool:
         """INV-P1-02/INV-POS-02修复: 净持仓一致性验证
@@ -985,16 +1149,13 @@ class PositionService(object):
         Returns:
             bool: 是否有持仓
         """
-        with self._get_instrument_lock(instrument_id):
-            if instrument_id not in self.positions:
-                return False
-            pos_dict = self.positions[instrument_id]
-            if not pos_dict:
-                return False
-            if check_nonzero:
-                return any(r.volume != 0 for r in pos_dict.values())
-            else:
-                return len(pos_dict) > 0
+        # 只读路径不加锁，语义同get_net_position
+        pos_dict = self.positions.get(instrument_id)
+        if not pos_dict:
+            return False
+        if check_nonzero:
+            return any(r.volume != 0 for r in tuple(pos_dict.values()))
+        return True
     
     def check_position_limit(self, account_id: str, required_amount: float) -> bool:
         """检查持仓限额 - 统一为RiskService检查，本地配置仅做初始化
@@ -1051,48 +1212,52 @@ class PositionService(object):
             return 0.0
     
     def get_position_info(self) -> List[Dict[str, Any]]:
-        """获取所有持仓信息（用于 UI 展示）        
+        """获取所有持仓信息（用于 UI 展示）
+
+        不持锁：先以GIL原子的tuple(values())取持仓快照，再在锁外格式化，
+        UI读到的视图最多滞后一次写入。
+
         Returns:
             list: 持仓信息列表
         """
-        with self.global_lock:
-            result = []
-            current_date = datetime.now(_CHINA_TZ).date()
-            
-            # 展开所有持仓            all_records = []
-            for inst_map in self.positions.values():
-                all_records.extend(inst_map.values())
-            
-            for record in all_records:
-                if record.volume != 0:  # ✅ 包含空头持仓
-                    r_open_date = record.open_date
-                    if isinstance(r_open_date, datetime):
-                        r_open_date = r_open_date.date()
-                    
-                    days_held = (current_date - r_open_date).days
-                    
-                    result.append({
-                        "仓位 ID": record.position_id,
-                        "合约": record.instrument_id,
-                        "开仓价": f"{record.open_price:.2f}",
-                        "持仓量": record.volume,
-                        "方向": "多头" if record.direction == "long" else "空头",
-                        "性质": record.position_type,
-                        "开仓日期": r_open_date.strftime("%Y-%m-%d"),
-                        "持仓天数": days_held,
-                        "开仓超过3天": days_held >= 3,
-                        "止盈价": f"{record.stop_profit_price:.2f}",
-                        "追单次数": record.chase_count
-                    })
-            
-            return result
+        result = []
+        current_date = datetime.now(_CHINA_TZ).date()
+
+        # 展开所有持仓
+        all_records = []
+        for inst_map in tuple(self.positions.values()):
+            all_records.extend(tuple(inst_map.values()))
+
+        for record in all_records:
+            if record.volume != 0:  # ✅ 包含空头持仓
+                r_open_date = record.open_date
+                if isinstance(r_open_date, datetime):
+                    r_open_date = r_open_date.date()
+
+                days_held = (current_date - r_open_date).days
+
+                result.append({
+                    "仓位 ID": record.position_id,
+                    "合约": record.instrument_id,
+                    "开仓价": f"{record.open_price:.2f}",
+                    "持仓量": record.volume,
+                    "方向": "多头" if record.dir_sign > 0 else "空头",
+                    "性质": record.position_type,
+                    "开仓日期": record._open_date_str,
+                    "持仓天数": days_held,
+                    "开仓超过3天": days_held >= 3,
+                    "止盈价": f"{record.stop_profit_price:.2f}",
+                    "追单次数": record.chase_count
+                })
+
+        return result
     
     # ========== Private Helper Methods ==========
     
     @count_call()
     def _add_position(self, exchange: str, instrument_id: str,
                      volume: int, price: float, open_reason: str = '',
-                     order_id: str = '') -> None:
+                     order_id: str = '', now: Optional[datetime] = None) -> None:
         """添加持仓
 
         Args:
@@ -1102,7 +1267,11 @@ class PositionService(object):
             price: 开仓价格
             open_reason: V7新增-开仓理由编码
             order_id: 关联订单ID
+            now: 调用方缓存的当前时间，缺省时取一次datetime.now
         """
+        # 本次开仓只取一次当前时间，订单号/持仓号/开仓时间共用
+        now = now or datetime.now(_CHINA_TZ)
+        now_ms = int(now.timestamp() * 1000)
         # R13-P0-BIZ-07修复: 开仓前保证金充足性检查 — 即使上游风控被绕过也能防止超限持仓
         try:
             from ali2026v3_trading.risk_service import get_risk_service
@@ -1151,12 +1320,12 @@ class PositionService(object):
             try:
                 from ali2026v3_trading.order_persistence import OrderRecord
                 new_order = OrderRecord(
-                    order_id=f"temp_{int(datetime.now(_CHINA_TZ).timestamp()*1000)}",
+                    order_id=f"temp_{now_ms}",
                     instrument_id=instrument_id,
                     direction="buy" if volume > 0 else "sell",
                     price=price,
                     volume=abs(volume),
-                    timestamp=datetime.now(_CHINA_TZ).timestamp(),
+                    timestamp=now_ms / 1000.0,
                 )
                 is_self_trade, alert_msg = self.self_trade_detector.check_self_trade(new_order)
                 if is_self_trade:
@@ -1170,8 +1339,7 @@ class PositionService(object):
             if instrument_id not in self.positions:
                 self.positions[instrument_id] = {}
 
-            import uuid as _uuid
-            pos_id = f"{instrument_id}_{int(datetime.now(_CHINA_TZ).timestamp()*1000)}_{_uuid.uuid4().hex[:6]}"
+            pos_id = self._next_position_id(instrument_id)
             
             direction_str = "long" if volume > 0 else "short"
             p_type = "long" if volume > 0 else "short"
@@ -1208,8 +1376,8 @@ class PositionService(object):
                 volume=volume,
                 direction=direction_str,
                 open_price=price,
-                open_time=datetime.now(_CHINA_TZ),
-                open_date=datetime.now(_CHINA_TZ).date(),
+                open_time=now,
+                open_date=now.date(),
                 position_type=p_type,
                 stop_profit_price=sp_price,
                 stop_loss_price=sl_price,
@@ -1219,6 +1387,11 @@ class PositionService(object):
             )
             
             self.positions[instrument_id][pos_id] = record
+            self._pid_index[pos_id] = (instrument_id, record)
+            with self._position_index_lock:
+                self._future_to_insts.setdefault(_future_root(instrument_id), set()).add(instrument_id)
+                if instrument_id not in self._interest_set:
+                    self._interest_set = self._interest_set | {instrument_id}
 
             logging.info(f"[PositionService._add_position] Added: {instrument_id} {volume}手@ {price} reason={open_reason}")
 
@@ -1378,12 +1551,13 @@ class PositionService(object):
             
             to_close = volume
             
-            # 按开仓时间排序(FIFO)
-            records = sorted(self.positions[instrument_id].values(), key=lambda x: x.open_time)
-            
+            # FIFO: _add_position按开仓时间顺序插入，dict保持插入顺序，无需每次成交重新排序
+            # 循环内只修改记录字段，删除延后到循环结束，可直接迭代values()而不复制
+            records = self.positions[instrument_id].values()
+
             remaining_close = volume
             keys_to_remove = []
-            
+
             for rec in records:
                 if remaining_close <= 0:
                     break
@@ -1441,12 +1615,23 @@ class PositionService(object):
                     except Exception:
                         pass
                 del self.positions[instrument_id][k]
+                self._pid_index.pop(k, None)
                 # ✅ DR-01: 持仓状态持久化 — 平仓时追加写入
                 _close_detail = {'close_price': price}
                 if _greeks_snapshot:
                     _close_detail['greeks_snapshot'] = _greeks_snapshot  # R24-P1-TR-11修复
                 self._append_position_state(instrument_id, k, 'CLOSE', _close_detail)
             
+            if keys_to_remove and not self.positions[instrument_id]:
+                with self._position_index_lock:
+                    _root = _future_root(instrument_id)
+                    _insts = self._future_to_insts.get(_root)
+                    if _insts is not None:
+                        _insts.discard(instrument_id)
+                        if not _insts:
+                            del self._future_to_insts[_root]
+                    self._interest_set = self._interest_set - {instrument_id}
+
             logging.info(f"[PositionService._reduce_position] Reduced: {instrument_id} {volume}@ {price}")
 
             # DFG-04修复: 发布PositionEvent(CLOSED)到EventBus
@@ -1462,34 +1647,26 @@ class PositionService(object):
                 logging.warning("[R22-EP-P1] PositionService exception swallowed")
                 pass
 
-    def _check_stop_profit(self, record: PositionRecord, current_price: float) -> None:
+    def _check_stop_profit(self, record: PositionRecord, current_price: float,
+                           deferred: Optional[list] = None) -> None:
         """检查止盈
         R13-P0-LOG-02修复: 添加止盈触发/跳过日志
         Args:
             record: 持仓记录
             current_price: 当前价格
+            deferred: 非None时触发结果以(record, reason, price)追加到该列表，由调用方统一平仓
         """
         if record.volume == 0:
             return
 
-        # 检查止盈触发
+        # 检查止盈触发：多头价格>=止盈价、空头价格<=止盈价，统一为(价差×方向符号)>=0
         if record.stop_profit_price > 0:
-            triggered = False
-            # 统一使用 volume 正负判断多空（volume>0=多，volume<0=空）
-            is_long = record.volume > 0
-            is_short = record.volume < 0
-
-            if is_long and current_price >= record.stop_profit_price:
-                triggered = True
-            elif is_short and current_price <= record.stop_profit_price:
-                triggered = True
-
-            if triggered:
+            if (current_price - record.stop_profit_price) * record.dir_sign >= 0:
                 logging.info(
                     '[PositionService] R13-P0-LOG-02修复: 止盈触发, instrument=%s direction=%s price=%.2f tp_price=%.2f',
-                    record.instrument_id, 'LONG' if is_long else 'SHORT', current_price, record.stop_profit_price,
+                    record.instrument_id, 'LONG' if record.dir_sign > 0 else 'SHORT', current_price, record.stop_profit_price,
                 )  # R13-P0-LOG-02修复
-                self._trigger_close_position(record, f"StopProfit@{current_price:.2f}", current_price)
+                self._close_or_defer(record, f"StopProfit@{current_price:.2f}", current_price, deferred)
             else:
                 logging.debug(
                     '[PositionService] R13-P0-LOG-02修复: 止盈未触发, instrument=%s price=%.2f tp_price=%.2f (距离=%.2f)',
@@ -1497,8 +1674,9 @@ class PositionService(object):
                     abs(current_price - record.stop_profit_price),
                 )  # R13-P0-LOG-02修复
 
-    def _check_stop_loss(self, record: PositionRecord, current_price: float) -> None:
-        """R13-P0-LOG-02修复: 添加止损触发/跳过日志"""
+    def _check_stop_loss(self, record: PositionRecord, current_price: float,
+                         deferred: Optional[list] = None) -> None:
+        """R13-P0-LOG-02修复: 添加止损触发/跳过日志（deferred语义同_check_stop_profit）"""
         if record.volume == 0:
             return
         if record.stop_loss_price <= 0:
@@ -1510,19 +1688,13 @@ class PositionService(object):
                     logging.error("[R26-P1-BV-04] 止损价格<0(异常值),持仓无保护: inst=%s vol=%d sl=%.2f open=%.2f",
                                   record.instrument_id, record.volume, record.stop_loss_price, record.open_price)
             return
-        triggered = False
-        is_long = record.volume > 0
-        is_short = record.volume < 0
-        if is_long and current_price <= record.stop_loss_price:
-            triggered = True
-        elif is_short and current_price >= record.stop_loss_price:
-            triggered = True
-        if triggered:
+        # 多头价格<=止损价、空头价格>=止损价，统一为(价差×方向符号)>=0
+        if (record.stop_loss_price - current_price) * record.dir_sign >= 0:
             logging.info(
                 '[PositionService] R13-P0-LOG-02修复: 止损触发, instrument=%s direction=%s price=%.2f sl_price=%.2f',
-                record.instrument_id, 'LONG' if is_long else 'SHORT', current_price, record.stop_loss_price,
+                record.instrument_id, 'LONG' if record.dir_sign > 0 else 'SHORT', current_price, record.stop_loss_price,
             )
-            self._trigger_close_position(record, f"StopLoss@{current_price:.2f}", current_price)
+            self._close_or_defer(record, f"StopLoss@{current_price:.2f}", current_price, deferred)
         else:
             logging.debug(
                 '[PositionService] R13-P0-LOG-02修复: 止损未触发, instrument=%s price=%.2f sl_price=%.2f (距离=%.2f)',
@@ -1530,19 +1702,30 @@ class PositionService(object):
                 abs(current_price - record.stop_loss_price),
             )
 
+    def _close_or_defer(self, record: PositionRecord, reason: str, current_price: float,
+                        deferred: Optional[list]) -> None:
+        if deferred is None:
+            self._trigger_close_position(record, reason, current_price)
+        else:
+            deferred.append((record, reason, current_price))
+
     # R13-P1-BIZ-04修复: 期权到期日检查方法
-    def _check_option_expiry(self, instrument_id: str) -> None:
+    def _check_option_expiry(self, instrument_id: str, today: Optional[date] = None) -> None:
         """检查期权合约到期日，若days_to_expiry<=0则触发强制平仓
 
         期权合约到期后流动性急剧下降且无法交易，必须在到期前强制平仓。
         合约代码中包含到期月份(如IO2606-C-3900中的2606)，
         解析到期月份并与当前日期比较计算days_to_expiry。
+        days_to_expiry只与合约代码和日期有关，每次检查只计算一次。
         """
         if not _is_option_instrument(instrument_id):
             return
         with self._get_instrument_lock(instrument_id):
             if instrument_id not in self.positions:
                 return
+            days_to_expiry = self._calc_days_to_expiry(instrument_id, today)
+            if days_to_expiry is None or days_to_expiry > 0:
+                return
             # R15-P0-PERF-03修复: 仅复制键列表，避免tuple(items())创建完整快照
             for pid in list(self.positions[instrument_id]):
                 record = self.positions[instrument_id].get(pid)
@@ -1551,19 +1734,17 @@ class PositionService(object):
                 if record.volume == 0:
                     continue
                 try:
-                    days_to_expiry = self._calc_days_to_expiry(instrument_id)
-                    if days_to_expiry is not None and days_to_expiry <= 0:
-                        logging.warning(
-                            '[PositionService] R13-P1-BIZ-04修复: 期权到期强制平仓, '
-                            'instrument=%s days_to_expiry=%d, 触发强制平仓',
-                            instrument_id, days_to_expiry,
-                        )
-                        self._trigger_close_position(record, f"OptionExpiry@{instrument_id}")
+                    logging.warning(
+                        '[PositionService] R13-P1-BIZ-04修复: 期权到期强制平仓, '
+                        'instrument=%s days_to_expiry=%d, 触发强制平仓',
+                        instrument_id, days_to_expiry,
+                    )
+                    self._trigger_close_position(record, f"OptionExpiry@{instrument_id}")
                 except Exception as e:
                     logging.debug('[PositionService] _check_option_expiry error for %s: %s', instrument_id, e)
 
     @staticmethod
-    def _calc_days_to_expiry(instrument_id: str) -> Optional[int]:
+    def _calc_days_to_expiry(instrument_id: str, today: Optional[date] = None) -> Optional[int]:
         """从期权合约代码解析到期月份并计算距到期日的天数
 
         合约代码格式示例: IO2606-C-3900 → 到期月份2026年6月
@@ -1588,14 +1769,13 @@ class PositionService(object):
             if month < 1 or month > 12:
                 return None
             # 计算该月第三个星期五(中金所期权到期日)
-            from datetime import date
             first_day = date(year, month, 1)
             # 找到第一个星期五
             first_friday = first_day
             while first_friday.weekday() != 4:  # 4=Friday
                 first_friday = first_friday + timedelta(days=1)
             third_friday = first_friday + timedelta(days=14)
-            today = datetime.now(_CHINA_TZ).date()
+            today = today or datetime.now(_CHINA_TZ).date()
             return (third_friday - today).days
         except Exception:
             logging.warning("[R22-EP-P1] PositionService exception swallowed")
@@ -1642,6 +1822,65 @@ class PositionService(object):
             return f"TrailingStop@{current_profit_pct:.1%}(peak={peak_profit:.1%})"
         return None
 
+    def _resolve_close_price(self, instrument_id: str, direction: str, current_price: float = 0.0) -> float:
+        """计算平仓委托价：优先对手价，无对手价时用最新价±tick_size，取不到有效价格返回0.0"""
+        # 获取对手价：买平仓用bid价，卖平仓用ask价
+        price = 0.0
+        try:
+            from ali2026v3_trading.data_service import get_data_service
+            ds = get_data_service()
+            if ds and ds.realtime_cache:
+                tick = ds.realtime_cache._latest_ticks.get(instrument_id)
+                if tick:
+                    price = tick.get('bid_price' if direction == 'SELL' else 'ask_price', 0.0)
+                    if price <= 0:
+                        price = tick.get('price', 0.0)
+        except Exception as e:
+            logging.debug(f"[PositionService._trigger_close_position] Failed to get opponent price from cache: {e}")
+
+        # 无对手价，用最新价±tick_size
+        if price <= 0:
+            base = current_price or 0.0
+            if base <= 0:
+                try:
+                    from ali2026v3_trading.data_service import get_data_service
+                    ds = get_data_service()
+                    if ds and ds.realtime_cache:
+                        base = ds.realtime_cache.get_latest_price(instrument_id) or 0.0
+                except Exception as e:
+                    logging.debug(f"[PositionService._trigger_close_position] Failed to get latest price: {e}")
+                    pass
+            if base > 0:
+                try:
+                    from ali2026v3_trading.params_service import get_params_service
+                    tick_size = get_params_service().get_float('tick_size', 1.0)
+                except Exception as e:
+                    # ✅ P1修复：添加告警日志
+                    logging.warning(f"[PositionService._trigger_close_position] Failed to get tick_size, using default 1.0: {e}")
+                    tick_size = 1.0
+                price = base - tick_size if direction == 'SELL' else base + tick_size
+        return price
+
+    def _send_close_order(self, order_svc: Any, instrument_id: str, exchange: str, volume: int,
+                          price: float, direction: str, signal_id: str, operation_id: str) -> Any:
+        """发送平仓委托，可用时经网络重试管理器（L-P0-2）"""
+        def _send_order_wrapper():
+            return order_svc.send_order(
+                instrument_id=instrument_id,
+                volume=volume,
+                price=price,
+                direction=direction,
+                action='CLOSE',
+                exchange=exchange or '',
+                signal_id=signal_id,  # R24-P0-TR-01修复: signal_id链路贯通
+            )
+        if self.network_retry_manager is not None:
+            return self.network_retry_manager.execute_with_retry(
+                operation_id=operation_id,
+                func=_send_order_wrapper,
+            )
+        return _send_order_wrapper()
+
     def _trigger_close_position(self, record: PositionRecord, reason: str, current_price: float = 0.0) -> None:
         with self._get_instrument_lock(record.instrument_id):
             if record._closing:
@@ -1649,74 +1888,18 @@ class PositionService(object):
             try:
                 from ali2026v3_trading.order_service import get_order_service
                 order_svc = get_order_service()
-                direction = 'SELL' if record.volume > 0 else 'BUY'
-
-                # 获取对手价：买平仓用bid价，卖平仓用ask价
-                price = 0.0
-                try:
-                    from ali2026v3_trading.data_service import get_data_service
-                    ds = get_data_service()
-                    if ds and ds.realtime_cache:
-                        tick = ds.realtime_cache._latest_ticks.get(record.instrument_id)
-                        if tick:
-                            price = tick.get('bid_price' if direction == 'SELL' else 'ask_price', 0.0)
-                            if price <= 0:
-                                price = tick.get('price', 0.0)
-                except Exception as e:
-                    logging.debug(f"[PositionService._trigger_close_position] Failed to get opponent price from cache: {e}")
+                direction = 'SELL' if record.dir_sign > 0 else 'BUY'
 
-                # 无对手价，用最新价±tick_size
+                price = self._resolve_close_price(record.instrument_id, direction, current_price)
                 if price <= 0:
-                    base = current_price or 0.0
-                    if base <= 0:
-                        try:
-                            from ali2026v3_trading.data_service import get_data_service
-                            ds = get_data_service()
-                            if ds and ds.realtime_cache:
-                                base = ds.realtime_cache.get_latest_price(record.instrument_id) or 0.0
-                        except Exception as e:
-                            logging.debug(f"[PositionService._trigger_close_position] Failed to get latest price: {e}")
-                            pass
-                    if base > 0:
-                        try:
-                            from ali2026v3_trading.params_service import get_params_service
-                            tick_size = get_params_service().get_float('tick_size', 1.0)
-                        except Exception as e:
-                            # ✅ P1修复：添加告警日志
-                            logging.warning(f"[PositionService._trigger_close_position] Failed to get tick_size, using default 1.0: {e}")
-                            tick_size = 1.0
-                        price = base - tick_size if direction == 'SELL' else base + tick_size
-                    else:
-                        logging.warning("[PositionService._trigger_close_position] 无法获取有效价格，跳过平仓: %s", record.instrument_id)
-                        return
+                    logging.warning("[PositionService._trigger_close_position] 无法获取有效价格，跳过平仓: %s", record.instrument_id)
+                    return
 
-                # ✅ 集成网络重试管理器（L-P0-2）
                 _close_signal_id = getattr(record, 'signal_id', '') or f"CLOSE_{record.instrument_id}"  # R24-P0-TR-01修复
-                if self.network_retry_manager is not None:
-                    def _send_order_wrapper():
-                        return order_svc.send_order(
-                            instrument_id=record.instrument_id,
-                            volume=abs(record.volume),
-                            price=price,
-                            direction=direction,
-                            action='CLOSE',
-                            exchange=record.exchange or '',
-                            signal_id=_close_signal_id,  # R24-P0-TR-01修复: signal_id链路贯通
-                        )
-                    order_id = self.network_retry_manager.execute_with_retry(
-                        operation_id=f"close_{record.instrument_id}_{record.position_id}",
-                        func=_send_order_wrapper,
-                    )
-                else:
-                    order_id = order_svc.send_order(
-                        instrument_id=record.instrument_id,
-                        volume=abs(record.volume),
-                        price=price,
-                        direction=direction,
-                        action='CLOSE',
-                        exchange=record.exchange or '',
-                        signal_id=_close_signal_id,  # R24-P0-TR-01修复: signal_id链路贯通
-                    )
+                order_id = self._send_close_order(
+                    order_svc, record.instrument_id, record.exchange, abs(record.volume), price, direction,
+                    _close_signal_id, f"close_{record.instrument_id}_{record.position_id}",
+                )
 
                 if order_id:
                     record._closing = True
@@ -1733,6 +1916,57 @@ class PositionService(object):
         if need_retry:
             self._schedule_close_retry(record, price)
 
+    def _batch_close_positions(self, buckets: Dict[Tuple[str, str, str], List[PositionRecord]], reason: str) -> None:
+        """按(交易所, 合约, 平仓方向, signal_id)分组批量平仓，每组合并为一笔委托
+
+        只合并signal_id相同的持仓，合并委托沿用该signal_id（R24-P0-TR-01链路不断）；
+        单笔、批量委托失败或价格不可得时，退回逐笔_trigger_close_position（含重试）。
+
+        Args:
+            buckets: {(exchange, instrument_id, direction): [PositionRecord, ...]}
+            reason: 平仓原因
+        """
+        try:
+            from ali2026v3_trading.order_service import get_order_service
+            order_svc = get_order_service()
+        except Exception as e:
+            logging.error("[PositionService._batch_close_positions] Error: %s", e)
+            order_svc = None
+        for (exchange, instrument_id, direction), records in buckets.items():
+            fallback: List[PositionRecord] = []
+            with self._get_instrument_lock(instrument_id):
+                by_signal: Dict[str, List[PositionRecord]] = {}
+                for rec in records:
+                    if not rec._closing and rec.volume != 0:
+                        by_signal.setdefault(getattr(rec, 'signal_id', '') or '', []).append(rec)
+                for signal_id, pending in by_signal.items():
+                    if len(pending) < 2 or order_svc is None:
+                        fallback.extend(pending)
+                        continue
+                    try:
+                        price = self._resolve_close_price(instrument_id, direction)
+                        order_id = None
+                        if price > 0:
+                            total_volume = sum(abs(rec.volume) for rec in pending)
+                            order_id = self._send_close_order(
+                                order_svc, instrument_id, exchange, total_volume, price, direction,
+                                signal_id or f"CLOSE_{instrument_id}",  # R24-P0-TR-01修复
+                                f"close_batch_{instrument_id}_{direction}_{signal_id}",
+                            )
+                        if order_id:
+                            for rec in pending:
+                                rec._closing = True
+                            logging.info("[PositionService._batch_close_positions] %s for %s %d笔合并 vol=%d price=%.2f signal_id=%s positions=%s",
+                                         reason, instrument_id, len(pending), total_volume, price,
+                                         signal_id, [rec.position_id for rec in pending])
+                        else:
+                            fallback.extend(pending)
+                    except Exception as e:
+                        logging.warning("[PositionService._batch_close_positions] 批量平仓失败, 退回逐笔: %s %s", instrument_id, e)
+                        fallback.extend(pending)
+            for rec in fallback:
+                self._trigger_close_position(rec, reason)
+
     _close_retry_executor = None
 
     @classmethod
@@ -1774,10 +2008,14 @@ class PositionService(object):
             retry_success = False
             for _retry in range(1, self.CLOSE_RETRY_MAX_ATTEMPTS + 1):
                 _time.sleep(self.CLOSE_RETRY_BASE_DELAY_SEC * (2 ** (_retry - 1)))
+                if record.position_id not in self._pid_index:
+                    # 等待期间已被成交回报平掉，无需再发平仓单
+                    logging.info("[PositionService] retry %d skipped, position already closed: %s", _retry, record.position_id)
+                    return
                 try:
                     from ali2026v3_trading.order_service import get_order_service
                     order_svc = get_order_service()
-                    direction = 'SELL' if record.volume > 0 else 'BUY'
+                    direction = 'SELL' if record.dir_sign > 0 else 'BUY'
                     order_id = order_svc.send_order(
                         instrument_id=record.instrument_id,
                         volume=abs(record.volume),
@@ -2067,9 +2305,10 @@ class PositionService(object):
             self._trigger_close_position(record, f"TwoStageStop-S2@{elapsed_minutes:.0f}min")
 
     def _check_option_expiry_force_close(self) -> None:
+        today = datetime.now(_CHINA_TZ).date()
         with self.global_lock:
             for inst_id in list(self.positions):
-                self._check_option_expiry(inst_id)
+                self._check_option_expiry(inst_id, today)
 
     def _check_eod_close(self, now: datetime = None) -> None:
         now = now or datetime.now(_CHINA_TZ)
@@ -2102,17 +2341,18 @@ class PositionService(object):
         if is_eod:
             if eod_reason == "EOD_Close":
                 self._check_option_expiry_force_close()
+            # 收盘全平按(交易所, 合约, 方向)分组，每组合并为一笔平仓委托
+            buckets: Dict[Tuple[str, str, str], List[PositionRecord]] = defaultdict(list)
             with self.global_lock:
                 for inst_id in list(self.positions):
                     pos_dict = self.positions.get(inst_id)
                     if pos_dict is None:
                         continue
-                    for pid in list(pos_dict):
-                        record = pos_dict.get(pid)
-                        if record is None:
-                            continue
-                        if record.volume != 0:
-                            self._trigger_close_position(record, eod_reason)
+                    for record in list(pos_dict.values()):
+                        if record.volume != 0 and not record._closing:
+                            direction = 'SELL' if record.dir_sign > 0 else 'BUY'
+                            buckets[(record.exchange, inst_id, direction)].append(record)
+            self._batch_close_positions(buckets, eod_reason)
 
     # ✅ 传递渠道唯一：通过get_config()获取配置，不再直接读取JSON文件
     def _load_position_configs(self) -> None:
@@ -2121,49 +2361,58 @@ class PositionService(object):
             from ali2026v3_trading.config_service import get_config
             config = get_config()
             data = getattr(config, 'option_buy_limits', None)
-            if data is None:
-                # 降级：尝试从配置文件读取
-                if not os.path.exists(self.config_file):
-                    return
+            if data is not None and not isinstance(data, dict):
+                return
+            data = dict(data or {})
+            # set_position_limit的运行期变更经_save_position_configs落盘，按账户覆盖配置值
+            if os.path.exists(self.config_file):
                 with open(self.config_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            elif not isinstance(data, dict):
+                    persisted = json.load(f)
+                if isinstance(persisted, dict):
+                    data.update(persisted)
+            if not data:
                 return
             
-            with self.global_lock:
-                for account_id, config_data in data.items():
-                    if not isinstance(config_data, dict):
-                        continue
-                    
-                    # 解析时间字段
-                    if "effective_until" in config_data and isinstance(config_data["effective_until"], str):
-                        try:
-                            config_data["effective_until"] = datetime.strptime(
-                                config_data["effective_until"], "%Y-%m-%d %H:%M:%S"
-                            )
-                        except Exception as e:
-                            logging.error(f"[PositionService._load_position_configs] Error parsing date: {e}")
-                            continue
-                    
-                    if "created_at" in config_data and isinstance(config_data["created_at"], str):
-                        try:
-                            config_data["created_at"] = datetime.strptime(
-                                config_data["created_at"], "%Y-%m-%d %H:%M:%S"
-                            )
-                        except Exception as e:
-                            logging.error(f"[PositionService._load_position_configs] Error parsing date: {e}")
-                            continue
-                    
+            # 解析/校验在锁外完成，锁内只做最终写入
+            parsed: List[Tuple[str, PositionLimitConfig]] = []
+            now = datetime.now(_CHINA_TZ)
+            for account_id, config_data in data.items():
+                if not isinstance(config_data, dict):
+                    continue
+
+                # 解析时间字段
+                if "effective_until" in config_data and isinstance(config_data["effective_until"], str):
                     try:
-                        config = PositionLimitConfig(**config_data)
+                        # 落盘时间串为北京时间且不带时区，解析后补上时区以便与now比较
+                        config_data["effective_until"] = datetime.strptime(
+                            config_data["effective_until"], "%Y-%m-%d %H:%M:%S"
+                        ).replace(tzinfo=_CHINA_TZ)
                     except Exception as e:
-                        logging.error(f"[PositionService._load_position_configs] Error creating config: {e}")
+                        logging.error(f"[PositionService._load_position_configs] Error parsing date: {e}")
                         continue
-                    
-                    # 跳过过期配置
-                    if config.effective_until and datetime.now(_CHINA_TZ) > config.effective_until:
+
+                if "created_at" in config_data and isinstance(config_data["created_at"], str):
+                    try:
+                        config_data["created_at"] = datetime.strptime(
+                            config_data["created_at"], "%Y-%m-%d %H:%M:%S"
+                        ).replace(tzinfo=_CHINA_TZ)
+                    except Exception as e:
+                        logging.error(f"[PositionService._load_position_configs] Error parsing date: {e}")
                         continue
-                    
+
+                try:
+                    config = PositionLimitConfig(**config_data)
+                except Exception as e:
+                    logging.error(f"[PositionService._load_position_configs] Error creating config: {e}")
+                    continue
+
+                # 跳过过期配置
+                if config.effective_until and now > config.effective_until:
+                    continue
+                parsed.append((account_id, config))
+
+            with self.global_lock:
+                for account_id, config in parsed:
                     # ✅ 传递渠道唯一#65：直接写入RiskService而非本地limit_configs
                     if self._risk_service:
                         self._risk_service.set_position_limit(account_id, config.limit_amount, config.effective_until)
@@ -2176,52 +2425,129 @@ class PositionService(object):
                 # ✅ 传递渠道唯一#65：加载失败时不需清空本地（已无本地存储）
                 pass
 
+    # 配置落盘去抖：所有实例共用一个类级落盘线程，按弱引用登记各实例的落盘到期时刻，
+    # 既不为每次变更新建定时器线程，也不让落盘线程/atexit持有实例强引用
+    _config_flush_cond = threading.Condition()
+    _config_flush_due: "weakref.WeakKeyDictionary[PositionService, float]" = weakref.WeakKeyDictionary()
+    _config_flush_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def _config_flush_loop(cls) -> None:
+        """类级落盘线程：休眠至最早到期时刻，写入到期实例的未落盘变更"""
+        cond, due_map = cls._config_flush_cond, cls._config_flush_due
+        while True:
+            with cond:
+                now = time.monotonic()
+                due = [svc for svc, deadline in list(due_map.items()) if deadline <= now]
+                if not due:
+                    cond.wait(min(due_map.values()) - now if due_map else None)
+                    continue
+            for svc in due:
+                svc._flush_position_configs()
+            del due, svc
+
+    @classmethod
+    def _flush_all_position_configs(cls) -> None:
+        """进程退出时补写所有实例最后一批未落盘变更（atexit）"""
+        with cls._config_flush_cond:
+            pending = list(cls._config_flush_due)
+        for svc in pending:
+            svc._flush_position_configs()
+
+    def _schedule_save_position_configs(self) -> None:
+        """登记一次限额变更，去抖后批量落盘
+
+        每次变更把本实例的落盘到期时刻推后CONFIG_SAVE_DEBOUNCE_SEC，由类级落盘线程统一写入；
+        未落盘变更累计达到CONFIG_SAVE_FORCE_FLUSH_COUNT时立即写入，进程退出时atexit补写最后一批。
+        """
+        with self._config_save_lock:
+            self._config_dirty_count += 1
+            force_flush = self._config_dirty_count >= self.CONFIG_SAVE_FORCE_FLUSH_COUNT
+        if force_flush:
+            self._flush_position_configs()
+            return
+        cls = PositionService
+        with cls._config_flush_cond:
+            cls._config_flush_due[self] = time.monotonic() + self.CONFIG_SAVE_DEBOUNCE_SEC
+            if cls._config_flush_thread is None:
+                cls._config_flush_thread = threading.Thread(
+                    target=cls._config_flush_loop, name='pos_config_flush', daemon=True,
+                )
+                cls._config_flush_thread.start()
+                _atexit.register(cls._flush_all_position_configs)
+            cls._config_flush_cond.notify()
+
+    def _flush_position_configs(self) -> None:
+        """立即写入未落盘的限额变更（落盘线程/atexit/强制阈值共用入口）"""
+        with PositionService._config_flush_cond:
+            PositionService._config_flush_due.pop(self, None)
+        with self._config_save_lock:
+            if self._config_dirty_count == 0:
+                return
+            self._config_dirty_count = 0
+        self._save_position_configs()
+
     def _save_position_configs(self) -> None:
-        """保存持仓限额配置（从RiskService唯一源读取）"""
+        """保存持仓限额配置（从RiskService唯一源读取）
+
+        内容摘要与上次写入一致时跳过磁盘IO；写入采用tmp+os.replace原子替换。
+        """
         try:
             if not self._risk_service:
                 return
-            save_data = {}
+            # 锁内只做浅拷贝快照，格式化/序列化/写盘均在锁外，慢盘不阻塞行情线程
             with self.global_lock:
                 # ✅ 传递渠道唯一#65：从RiskService._position_limits读取
-                for account_id, limit_info in getattr(self._risk_service, '_position_limits', {}).items():
-                    if isinstance(limit_info, PositionLimitConfig):
-                        limit_amount = limit_info.limit_amount
-                        effective_until = limit_info.effective_until
-                    elif isinstance(limit_info, dict):
-                        limit_amount = limit_info.get('limit_amount', 0)
-                        effective_until = limit_info.get('effective_until')
-                    else:
-                        limit_amount = 0
-                        effective_until = None
-                    save_data[account_id] = {
-                        "limit_amount": float(limit_amount),
-                        "account_id": account_id,
-                        "effective_until": effective_until.strftime("%Y-%m-%d %H:%M:%S")
-                            if effective_until else None,
-                    }
-            
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
-            
+                limits_snapshot = list(getattr(self._risk_service, '_position_limits', {}).items())
+            save_data = {}
+            for account_id, limit_info in limits_snapshot:
+                if isinstance(limit_info, PositionLimitConfig):
+                    # 有效期字符串在配置创建时已格式化
+                    limit_amount = limit_info.limit_amount
+                    until_str = limit_info._until_str
+                elif isinstance(limit_info, dict):
+                    limit_amount = limit_info.get('limit_amount', 0)
+                    effective_until = limit_info.get('effective_until')
+                    until_str = effective_until.strftime("%Y-%m-%d %H:%M:%S") if effective_until else None
+                else:
+                    limit_amount = 0
+                    until_str = None
+                save_data[account_id] = {
+                    "limit_amount": float(limit_amount),
+                    "account_id": account_id,
+                    "effective_until": until_str,
+                }
+
+            payload = json.dumps(save_data, indent=2, ensure_ascii=False).encode("utf-8")
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            if digest == self._last_saved_config_digest:
+                logging.debug("[PositionService._save_position_configs] Unchanged, skip write")
+                return
+
+            _tmp_path = self.config_file + '.tmp'
+            with open(_tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(_tmp_path, self.config_file)
+            self._last_saved_config_digest = digest
+
             logging.debug(f"[PositionService._save_position_configs] Saved to {self.config_file}")
-            
+
         except Exception as e:
             logging.error(f"[PositionService._save_position_configs] Error: {e}")
-    
+
     def get_status(self) -> str:
         """获取服务状态        
         Returns:
             str: 状态字符串
         """
-        with self.global_lock:
-            total_instruments = len(self.positions)
-            total_records = sum(len(v) for v in self.positions.values())
-            # ✅ 传递渠道唯一#65：从RiskService统计限额数
-            total_configs = len(getattr(self._risk_service, '_position_limits', {})) if self._risk_service else 0
-            
-            return (f"PositionService: Tracking {total_instruments} instruments, "
-                    f"{total_records} positions, {total_configs} limits")
+        # 只读统计不加锁：len()与tuple(values())在GIL下原子
+        total_instruments = len(self.positions)
+        total_records = sum(len(v) for v in tuple(self.positions.values()))
+        # ✅ 传递渠道唯一#65：从RiskService统计限额数
+        total_configs = len(getattr(self._risk_service, '_position_limits', {})) if self._risk_service else 0
+
+        return (f"PositionService: Tracking {total_instruments} instruments, "
+                f"{total_records} positions, {total_configs} limits")
 
 
 # ========== Scoped Singleton Instances ==========
@@ -2399,6 +2725,19 @@ def _is_option_instrument(instrument_id: str) -> bool:
     return '-C-' in instrument_id or '-P-' in instrument_id
 
 
+_FUTURE_ROOT_RE = re.compile(r'^([A-Za-z]+\d{3,4})')
+
+
+def _future_root(instrument_id: str) -> str:
+    """提取合约的品种+月份前缀作为标的期货键
+
+    IO2606-C-3900 → IO2606, CU2603C5000 → CU2603, cu2606 → cu2606, SHFE.cu2606 → cu2606
+    """
+    code = instrument_id.rsplit('.', 1)[-1]
+    match = _FUTURE_ROOT_RE.match(code)
+    return match.group(1) if match else code
+
+
 def _estimate_option_delta(instrument_id: str, direction: str, volume: int) -> float:
     # R14-P1-BIZ-07修复: 优先从greeks_calculator获取实时delta，固定值仅作fallback
     try:
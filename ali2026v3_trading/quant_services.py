@@ -192,7 +192,7 @@ class HotConfigManager:
 
     __slots__ = ('_lock', '_config_path', '_config', '_callbacks',
                  '_watcher_thread', '_running', '_last_mtime', '_poll_interval',
-                 '_callback_failures')
+                 '_callback_failures', '_stop_event')
 
     def __init__(self, config_path: Optional[str] = None, poll_interval: float = 5.0):
         self._lock = threading.RLock()
@@ -204,6 +204,7 @@ class HotConfigManager:
         self._last_mtime = 0.0
         self._poll_interval = poll_interval
         self._callback_failures: Dict[str, str] = {}
+        self._stop_event = threading.Event()  # stop_watching立即唤醒轮询线程
         if config_path and os.path.exists(config_path):
             self._load_config()
 
@@ -272,12 +273,14 @@ class HotConfigManager:
         if self._running or not self._config_path or not os.path.exists(self._config_path):
             return
         self._running = True
+        self._stop_event.clear()
         self._watcher_thread = threading.Thread(target=self._watch_loop, daemon=True)
         self._watcher_thread.start()
         logging.info("[HotConfig] Started watching %s", self._config_path)
 
     def stop_watching(self) -> None:
         self._running = False
+        self._stop_event.set()
         if self._watcher_thread is not None:
             self._watcher_thread.join(timeout=2.0)
             self._watcher_thread = None
@@ -291,7 +294,8 @@ class HotConfigManager:
                         self._load_config()
             except OSError:
                 pass
-            time.sleep(self._poll_interval)
+            if self._stop_event.wait(self._poll_interval):
+                break
 
     def update_config(self, key: str, value: Any) -> None:
         with self._lock:
@@ -27,6 +27,7 @@ from __future__ import annotations
 import logging
 import os
 import csv
+import sys
 import time
 import threading
 from typing import Any, Dict, List, Optional, Tuple
@@ -294,6 +295,10 @@ class _KlineAggregator:
         return agg
 
 
+# 股指期权品种 → 标的期货品种（其余期权与标的同名）
+_OPTION_TO_FUTURE_MAP = {'MO': 'IM', 'IO': 'IF', 'HO': 'IH'}
+
+
 class QueryService:
     """
     数据查询服务
@@ -619,12 +624,12 @@ class QueryService:
                 logging.error("[Init-VerifyFutures] ❌ %s", error_detail)
                 raise RuntimeError(error_detail)
 
-        # 构建完整订阅列表
-        subscribe_list = list(selected_futures_list)
-        for option_ids in selected_options_dict.values():
-            subscribe_list.extend(option_ids or [])
-        seen = set()
-        subscribed_instruments = [inst for inst in subscribe_list if not (inst in seen or seen.add(inst))]
+        # 构建完整订阅列表（与 SubscriptionManager.subscribe_all_instruments 同一遍历顺序）
+        # 保序去重：dict.fromkeys 一次性批量建表，不再逐项 add 触发集合反复扩容
+        from ali2026v3_trading.subscription_manager import iter_subscription_targets
+        subscribed_instruments = list(dict.fromkeys(
+            inst for inst, _ in iter_subscription_targets(selected_futures_list, selected_options_dict)
+        ))
 
         # ========== 阶段2：预注册（重试3次） ==========
         preregister_stats = None
@@ -755,7 +760,7 @@ class QueryService:
 
     @staticmethod
     def _normalize_instruments(instrument_ids: List[str]) -> List[str]:
-        """去重、去空、去交易所前缀"""
+        """去重、去空、去交易所前缀（合约ID在加载时驻留，后续各级dict/set键比较可走指针相等）"""
         seen = set()
         result = []
         for inst_id in instrument_ids or []:
@@ -763,6 +768,7 @@ class QueryService:
             if '.' in normalized:
                 _, normalized = normalized.split('.', 1)
             if normalized and normalized not in seen:
+                normalized = sys.intern(normalized)
                 seen.add(normalized)
                 result.append(normalized)
         return result
@@ -782,10 +788,11 @@ class QueryService:
                 if '.' in normalized_opt:
                     _, normalized_opt = normalized_opt.split('.', 1)
                 if normalized_opt and normalized_opt not in seen:
+                    normalized_opt = sys.intern(normalized_opt)
                     seen.add(normalized_opt)
                     normalized_ids.append(normalized_opt)
             if normalized_underlying and normalized_ids:
-                result[normalized_underlying] = normalized_ids
+                result[sys.intern(normalized_underlying)] = normalized_ids
         return result
 
     @staticmethod
@@ -797,21 +804,20 @@ class QueryService:
     def _derive_underlying_futures(options_dict: Dict[str, List[str]]) -> List[str]:
         """从期权字典推导标的期货列表（从具体期权合约ID解析标的期货）"""
         from ali2026v3_trading.subscription_manager import SubscriptionManager
-        underlying_set = set()
-        OPTION_TO_FUTURE_MAP = {'MO': 'IM', 'IO': 'IF', 'HO': 'IH'}
+        # 先按 (品种, 年月) 去重，标的期货ID每个组合只拼一次
+        underlying_pairs = set()
         for option_ids in (options_dict or {}).values():
             for opt_id in option_ids:
                 try:
                     parsed = SubscriptionManager.parse_option(str(opt_id).strip())
-                    opt_product = parsed.get('product', '')
-                    year_month = parsed.get('year_month', '')
-                    if opt_product and year_month:
-                        future_product = OPTION_TO_FUTURE_MAP.get(opt_product, opt_product)
-                        future_id = f"{future_product}{year_month}"
-                        underlying_set.add(future_id)
                 except Exception:
                     continue
-        return sorted(underlying_set)
+                underlying_pairs.add((parsed.get('product', ''), parsed.get('year_month', '')))
+        return sorted({
+            f"{_OPTION_TO_FUTURE_MAP.get(opt_product, opt_product)}{year_month}"
+            for opt_product, year_month in underlying_pairs
+            if opt_product and year_month
+        })
 
     # ========================================================================
     # 品种与合约查询
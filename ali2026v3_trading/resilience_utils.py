@@ -7,12 +7,15 @@ P2修复: 降级日志级别(DR-P2-01~04)、熔断仪表盘(DR-P2-05~07)、看
          兼容性桥接(FC-P2-01~03)、@deprecated标记(FC-P2-04~06)
 """
 
+import heapq
+import itertools
 import math
 import time
 import threading
 import logging
 from typing import Any, Callable, Dict, List, Optional, Tuple
 from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
 
 logger = logging.getLogger(__name__)
@@ -259,8 +262,73 @@ class DbQueryTimeout:
 # ============================================================================
 # DR-P1-06修复: 看门狗定时器
 # ============================================================================
+class _WatchdogDispatcher:
+    """看门狗共享调度线程：进程内所有Watchdog共用一个线程，按下次检查时刻小根堆调度
+
+    线程数与看门狗数量无关；停止的看门狗其堆条目按代号惰性丢弃。
+    超时回调不在调度线程执行，而是提交到小型回调线程池，单个回调阻塞不会延误其他看门狗的检查。
+    """
+
+    _instance: Optional['_WatchdogDispatcher'] = None
+    _instance_lock = threading.Lock()
+    _CALLBACK_WORKERS = 4
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, 'Watchdog', int]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._callback_pool: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def get_instance(cls) -> '_WatchdogDispatcher':
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+        return cls._instance
+
+    def schedule(self, watchdog: 'Watchdog', delay: float, generation: int) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), watchdog, generation))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._dispatch_loop, daemon=True, name='wd_dispatcher')
+                self._thread.start()
+            self._cond.notify()
+
+    def submit_callback(self, func: Callable[[], None]) -> Future:
+        """提交超时回调到回调线程池（按需创建）"""
+        with self._cond:
+            if self._callback_pool is None:
+                self._callback_pool = ThreadPoolExecutor(
+                    max_workers=self._CALLBACK_WORKERS, thread_name_prefix='wd_callback',
+                )
+            pool = self._callback_pool
+        return pool.submit(func)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        _, _, watchdog, generation = heapq.heappop(self._heap)
+                        break
+                    self._cond.wait(delay)
+            if not watchdog._is_current(generation):
+                continue
+            try:
+                watchdog._check()
+            except Exception as e:
+                logging.error("[DR-P1-06] 看门狗'%s'检查异常: %s", watchdog._name, e)
+            if watchdog._is_current(generation):
+                self.schedule(watchdog, watchdog._check_interval, generation)
+
+
 class Watchdog:
-    """看门狗定时器：超时未feed则触发回调"""
+    """看门狗定时器：超时未feed则触发回调（由共享调度线程定期检查）"""
 
     def __init__(self, timeout_sec: float = 30.0, on_timeout: Optional[Callable] = None,
                  name: str = 'watchdog'):
@@ -269,9 +337,11 @@ class Watchdog:
         self._name = name
         self._last_feed = time.time()
         self._running = False
-        self._thread: Optional[threading.Thread] = None
+        self._generation = 0
+        self._check_interval = min(timeout_sec / 2, 5.0)
         self._lock = threading.Lock()
         self._timeout_count = 0
+        self._callback_future: Optional[Future] = None
 
     def start(self) -> None:
         with self._lock:
@@ -279,40 +349,50 @@ class Watchdog:
                 return
             self._running = True
             self._last_feed = time.time()
-        self._thread = threading.Thread(target=self._watch_loop, daemon=True, name=f'wd_{self._name}')
-        self._thread.start()
+            self._generation += 1
+            generation = self._generation
+        _WatchdogDispatcher.get_instance().schedule(self, self._check_interval, generation)
 
     def stop(self) -> None:
         with self._lock:
             self._running = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=2.0)
-            # R23-P2-17修复: join超时后检查线程状态
-            if self._thread.is_alive():
-                logging.warning("[R23-P2-17] 看门狗线程'%s'未在2.0s内终止", self._name)
 
     def feed(self) -> None:
         with self._lock:
             self._last_feed = time.time()
 
-    def _watch_loop(self) -> None:
-        while True:
+    def _is_current(self, generation: int) -> bool:
+        with self._lock:
+            return self._running and self._generation == generation
+
+    def _check(self) -> None:
+        with self._lock:
+            elapsed = time.time() - self._last_feed
+        if elapsed > self._timeout:
+            self._timeout_count += 1
+            logging.warning("[DR-P1-06] 看门狗'%s'超时(%.1fs>%.1fs), 第%d次",
+                            self._name, elapsed, self._timeout, self._timeout_count)
+            if self._on_timeout:
+                # 同一看门狗上次回调未结束时不再叠加提交，避免阻塞的回调占满回调线程池
+                previous = self._callback_future
+                if previous is not None and not previous.done():
+                    logging.warning("[DR-P1-06] 看门狗'%s'上次超时回调仍在执行，跳过本次回调", self._name)
+                else:
+                    self._callback_future = _WatchdogDispatcher.get_instance().submit_callback(self._run_on_timeout)
             with self._lock:
-                if not self._running:
-                    break
-                elapsed = time.time() - self._last_feed
-            if elapsed > self._timeout:
-                self._timeout_count += 1
-                logging.warning("[DR-P1-06] 看门狗'%s'超时(%.1fs>%.1fs), 第%d次",
-                                self._name, elapsed, self._timeout, self._timeout_count)
-                if self._on_timeout:
-                    try:
-                        self._on_timeout()
-                    except Exception as e:
-                        logging.error("[DR-P1-06] 看门狗回调异常: %s", e)
-                with self._lock:
-                    self._last_feed = time.time()
-            time.sleep(min(self._timeout / 2, 5.0))
+                self._last_feed = time.time()
+
+    def _run_on_timeout(self) -> None:
+        """在回调线程池中执行超时回调，耗时超过检查间隔时告警"""
+        started = time.monotonic()
+        try:
+            self._on_timeout()
+        except Exception as e:
+            logging.error("[DR-P1-06] 看门狗回调异常: %s", e)
+        elapsed = time.monotonic() - started
+        if elapsed > self._check_interval:
+            logging.warning("[DR-P1-06] 看门狗'%s'超时回调耗时%.1fs(>检查间隔%.1fs)",
+                            self._name, elapsed, self._check_interval)
 
     @property
     def timeout_count(self) -> int:
@@ -1120,6 +1200,8 @@ class StrategyRegistry:
 
     def __init__(self):
         self._registry: Dict[str, Dict[str, Any]] = {}
+        # 按类型索引策略ID（dict保持注册顺序），discover无需全表扫描
+        self._by_type: Dict[str, Dict[str, None]] = {}
         self._lock = threading.Lock()
 
     @classmethod
@@ -1132,6 +1214,10 @@ class StrategyRegistry:
     def register(self, strategy_id: str, strategy_type: str,
                  factory: Optional[Callable] = None, metadata: Optional[Dict] = None) -> None:
         with self._lock:
+            old = self._registry.get(strategy_id)
+            if old is not None and old['strategy_type'] != strategy_type:
+                self._by_type.get(old['strategy_type'], {}).pop(strategy_id, None)
+            self._by_type.setdefault(strategy_type, {})[strategy_id] = None
             self._registry[strategy_id] = {
                 'strategy_id': strategy_id,
                 'strategy_type': strategy_type,
@@ -1144,8 +1230,7 @@ class StrategyRegistry:
     def discover(self, strategy_type: Optional[str] = None) -> List[str]:
         with self._lock:
             if strategy_type:
-                return [sid for sid, info in self._registry.items()
-                        if info['strategy_type'] == strategy_type]
+                return list(self._by_type.get(strategy_type, ()))
             return list(self._registry.keys())
 
     def get_factory(self, strategy_id: str) -> Optional[Callable]:
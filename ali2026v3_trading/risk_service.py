@@ -1479,11 +1479,10 @@ class RiskService:
                 current_volume = 0
                 if self.position_manager is not None:
                     try:
-                        import copy as _copy2
-                        positions_raw = getattr(self.position_manager, "positions", {})
-                        positions = positions_raw  # PF-06修复: 消除deepcopy，持仓数据只读遍历不修改，无需深拷贝
-                        for inst_map in positions.values():
-                            for pos in inst_map.values():
+                        positions = getattr(self.position_manager, "positions", {})
+                        # PF-06修复: 消除deepcopy，持仓数据只读遍历不修改；list()快照避免遍历中被并发修改
+                        for inst_map in list(positions.values()):
+                            for pos in list(inst_map.values()):
                                 current_volume += abs(getattr(pos, "volume", 0))
                     except Exception as e:
                         logging.debug("[RiskService._check_position_limit] Volume calc error: %s", e)
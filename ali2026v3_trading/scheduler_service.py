@@ -22,16 +22,76 @@ scheduler_service.py - 调度服务
 
 from __future__ import annotations
 
+import functools
+import heapq
+import itertools
+import math
+import operator
+import os
 import time
 import logging
 import logging.handlers
 import threading
-from typing import Any, Callable, Dict, Optional, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, List, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from datetime import time as dt_time, timezone  # ENV-P1-01修复: 导入timezone
 from enum import Enum, auto
 
+from ali2026v3_trading.shared_utils import CHINA_TZ
+
+# 调度计时使用单调时钟，不受NTP校时/墙钟跳变影响；time.time()仅用于生成任务ID
+_now = time.monotonic
+
+# 任务优先级排序键（模块级复用，避免每次重建快照新建lambda）
+_priority_key = operator.attrgetter('priority')
+
+def _next_slot(due: float, now: float, interval: float) -> float:
+    """下次到期时刻：本次计划到期时刻due + interval及之后第一个interval整数倍时刻
+
+    以计划到期时刻而非实际派发时刻推算，派发略晚于边界时不会跳过一个周期；同周期（及整数倍周期）
+    的任务对齐到同一时刻唤醒且不累积漂移，相邻两次计划时刻至少间隔一个周期。
+    派发已晚于该时刻（积压）时改取now之后第一个interval整数倍时刻，不补跑错过的周期。
+    """
+    # 商减去微小容差，避免due本身是边界时浮点误差多进一格
+    slot = math.ceil((due + interval) / interval - 1e-9) * interval
+    if slot <= now:
+        slot = (math.floor(now / interval) + 1) * interval
+    return slot
+
+
+# 调度堆条目类型
+_ENTRY_JOB = 0       # 定时任务到期
+_ENTRY_ONCE = 1      # 一次性任务到期
+_ENTRY_TIMEOUT = 2   # 运行超时检查
+
+_scheduler_logger = logging.getLogger('ali2026v3_trading.scheduler_service')
+_file_handler_lock = threading.Lock()
+
+
+def _ensure_file_handler() -> None:
+    """P2-5修复: 添加FileHandler确保日志文件创建（进程内只配置一次）"""
+    if _scheduler_logger.handlers:
+        return
+    with _file_handler_lock:
+        if _scheduler_logger.handlers:
+            return
+        try:
+            _log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+            os.makedirs(_log_dir, exist_ok=True)
+            _log_path = os.path.join(_log_dir, 'scheduler_service.log')
+            _fh = logging.handlers.RotatingFileHandler(
+                _log_path, maxBytes=10 * 1024 * 1024, backupCount=3, encoding='utf-8',
+            )
+            _fh.setFormatter(logging.Formatter(
+                '%(asctime)s %(levelname)s [%(name)s] %(message)s',
+            ))
+            _scheduler_logger.addHandler(_fh)
+            _scheduler_logger.setLevel(logging.INFO)
+        except Exception:
+            pass
+
 
 # ============================================================================
 # DR-P1-12修复: 时钟同步检测
@@ -163,13 +223,17 @@ class JobStatus(Enum):
     CANCELLED = auto()   # 已取消
 
 
+# 出堆后不再执行、也不再入堆的任务状态
+_INACTIVE_STATUSES = frozenset((JobStatus.PAUSED, JobStatus.CANCELLED))
+
+
 @dataclass(slots=True)
 class JobInfo:
     """任务信息"""
     job_id: str
     func: Callable
     interval: float = 60.0
-    last_run: float = 0.0
+    last_run: float = 0.0       # 上次调度时刻（time.monotonic）
     run_count: int = 0
     status: JobStatus = JobStatus.PENDING
     run_async: bool = False
@@ -180,6 +244,9 @@ class JobInfo:
     max_retries: int = 0        # 最大重试次数
     retry_count: int = 0        # 当前重试次数
     last_error: Optional[str] = None  # 最后一次错误信息
+    last_stuck_log: float = 0.0       # 上次输出"仍在执行"告警的时刻（time.monotonic）
+    last_trace_log: float = 0.0       # 上次输出异常堆栈的时刻（time.monotonic）
+    due: float = 0.0                  # 本次运行的计划到期时刻（出堆时记录，供推算下次到期）
 
 
 @dataclass(slots=True)
@@ -189,21 +256,21 @@ class OnceJobInfo:
     func: Callable
     delay: float
     cancelled: bool = False
-    thread: Optional[threading.Thread] = None
-    stop_event: Optional[threading.Event] = None
+    due: float = 0.0                  # 到期时刻（time.monotonic）
+    future: Optional[Future] = None   # 到期后提交到工作线程池的future
 
     def is_running(self) -> bool:
-        """检查任务是否正在运行"""
-        if self.thread is None:
-            return False
-        return self.thread.is_alive()
+        """检查任务是否等待执行或正在执行"""
+        if self.future is None:
+            return not self.cancelled
+        return not self.future.done()
 
     def stop(self) -> bool:
-        """停止一次性任务"""
-        if self.stop_event is not None:
-            self.stop_event.set()
+        """停止一次性任务（尚未开始执行时生效）"""
+        if self.future is None:
+            self.cancelled = True
             return True
-        return False
+        return self.future.cancel()
 
 
 # ============================================================================
@@ -234,39 +301,37 @@ class SchedulerService:
             logger_func: 日志输出函数（可选）
         """
         self._logger = logger_func or print
-        # P2-5修复: 添加FileHandler确保日志文件创建
-        try:
-            _scheduler_logger = logging.getLogger('ali2026v3_trading.scheduler_service')
-            if not _scheduler_logger.handlers:
-                import os
-                _log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
-                os.makedirs(_log_dir, exist_ok=True)
-                _log_path = os.path.join(_log_dir, 'scheduler_service.log')
-                _fh = logging.handlers.RotatingFileHandler(
-                    _log_path, maxBytes=10 * 1024 * 1024, backupCount=3, encoding='utf-8',
-                )
-                _fh.setFormatter(logging.Formatter(
-                    '%(asctime)s %(levelname)s [%(name)s] %(message)s',
-                ))
-                _scheduler_logger.addHandler(_fh)
-                _scheduler_logger.setLevel(logging.INFO)
-        except Exception:
-            pass
+        _ensure_file_handler()
         self._jobs: Dict[str, JobInfo] = {}
+        # 按优先级排序的只读快照：仅在增删任务时于锁内整体替换，读取方无需加锁
+        self._jobs_snapshot: Tuple[JobInfo, ...] = ()
         self._once_jobs: Dict[str, OnceJobInfo] = {}
         # ✅ P1修复：使用threading.Event替代bool标志，消除竞态
         self._running_event = threading.Event()
+        # 停止信号：stop()置位后立即打断主循环的出错退避等待
+        self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._lock = threading.RLock()
-        self._active_threads: Dict[str, threading.Thread] = {}
+        # 到期时间小顶堆：(next_due, -priority, seq, job_id, kind[, future])，同一时刻到期的按优先级出堆，
+        # seq唯一，比较不会越过它；定时任务以_due_at为权威到期表，一次性任务以_once_jobs中的
+        # OnceJobInfo.due为准，超时检查以_pending_runs为准，堆中与之不符的条目视为已失效
+        self._cond = threading.Condition(self._lock)
+        self._heap: List[tuple] = []
+        self._heap_seq = itertools.count()
+        self._due_at: Dict[str, float] = {}
+        # 常驻工作线程池替代每次执行新建线程；按job_id记录尚未结束的future（结束即移除）
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._active_futures: Dict[str, Future] = {}
+        # 已提交但尚未记账的运行：job_id -> (future, 调度时刻)
+        self._pending_runs: Dict[str, Tuple[Future, float]] = {}
 
         # 配置
+        self._max_workers = 8
+        self._stuck_log_interval = 60.0
+        self._trace_log_interval = 60.0
         self._min_interval = 1.0
-        self._tick_interval = 0.5
         self._stop_timeout = 1.0
         self._default_timeout = 30.0
-        self._thread_cleanup_interval = 60.0
-        self._last_cleanup = 0.0
 
     # ========================================================================
     # 生命周期管理
@@ -279,7 +344,9 @@ class SchedulerService:
                 self._log("[Scheduler] Already running")
                 return False
 
+            self._stop_event.clear()
             self._running_event.set()
+            self._get_pool()
             self._thread = threading.Thread(
                 target=self._master_loop,
                 daemon=True,
@@ -293,12 +360,15 @@ class SchedulerService:
         """停止调度器"""
         # ✅ P1修复：使用Event.clear()替代直接赋值，线程安全
         self._running_event.clear()
+        self._stop_event.set()
         self._log("[Scheduler] Stopping...")
 
-        # 取消所有一次性任务
-        with self._lock:
+        # 取消所有一次性任务，并唤醒主循环
+        with self._cond:
             for job in self._once_jobs.values():
-                job.cancelled = True
+                job.stop()
+            self._once_jobs.clear()
+            self._cond.notify_all()
 
         # 等待主线程退出
         if self._thread and self._thread.is_alive():
@@ -307,6 +377,12 @@ class SchedulerService:
             except Exception as e:
                 logging.warning(f"[Scheduler] Error joining thread: {e}")
 
+        # 关闭工作线程池：不等待运行中的任务，丢弃排队未执行的任务
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
         self._log("[Scheduler] Stopped")
 
     def is_running(self) -> bool:
@@ -357,6 +433,8 @@ class SchedulerService:
                 timeout=max(1.0, timeout),
                 max_retries=max(0, max_retries),
             )
+            self._refresh_jobs_snapshot()
+            self._schedule(job_id, _now())
 
         self._log(f"[Scheduler] Added job: {job_id} (interval: {interval}s, priority: {priority})")
         return job_id
@@ -366,20 +444,23 @@ class SchedulerService:
         with self._lock:
             if job_id in self._jobs:
                 del self._jobs[job_id]
+                self._due_at.pop(job_id, None)
+                self._refresh_jobs_snapshot()
                 self._log(f"[Scheduler] Removed job: {job_id}")
                 return True
             return False
 
+    def _refresh_jobs_snapshot(self) -> None:
+        """重建任务快照（调用方持有self._lock）"""
+        self._jobs_snapshot = tuple(sorted(self._jobs.values(), key=_priority_key, reverse=True))
+
     def get_job(self, job_id: str) -> Optional[JobInfo]:
-        """获取任务信息"""
-        with self._lock:
-            return self._jobs.get(job_id)
+        """获取任务信息（dict.get在GIL下原子，无需加锁）"""
+        return self._jobs.get(job_id)
 
     def get_all_jobs(self) -> List[JobInfo]:
         """获取所有任务（按优先级排序）"""
-        with self._lock:
-            jobs = list(self._jobs.values())
-            return sorted(jobs, key=lambda j: j.priority, reverse=True)
+        return list(self._jobs_snapshot)
 
     def pause_job(self, job_id: str) -> bool:
         """暂停任务"""
@@ -396,6 +477,9 @@ class SchedulerService:
             job = self._jobs.get(job_id)
             if job and job.status == JobStatus.PAUSED:
                 job.status = JobStatus.PENDING
+                # 暂停期间到期条目已出堆，恢复时重新入堆
+                if job_id not in self._due_at:
+                    self._schedule(job_id, max(_now(), job.last_run + job.interval))
                 return True
             return False
 
@@ -409,10 +493,9 @@ class SchedulerService:
             # 取消一次性任务（复用统一入口）
             if job_id in self._once_jobs:
                 job_info = self._once_jobs[job_id]
-                job_info.cancelled = True
-                # P1 Bug #82修复：触发stop_event提前中断等待
-                if hasattr(job_info, 'stop_event'):
-                    job_info.stop_event.set()
+                # P1 Bug #82修复：未到期的任务直接出表，其堆条目随之失效
+                if job_info.stop():
+                    del self._once_jobs[job_id]
                 self._log(f"[Scheduler] Cancelled once job: {job_id}")
                 return True
             return False
@@ -438,199 +521,233 @@ class SchedulerService:
             job_id = f"once_{int(time.time() * 1000)}"
 
         # Bug3修复：重复任务检查
-        with self._lock:
-            if job_id in self._once_jobs:
-                existing_job = self._once_jobs[job_id]
-                if existing_job.is_running():
-                    self._log(f"[Scheduler] Once job {job_id} already running, skipped")
-                    return None
-
-        job_info = OnceJobInfo(job_id=job_id, func=func, delay=delay)
-
-        # P1 Bug #82修复：使用threading.Event.wait实现精确延迟
-        stop_event = threading.Event()
-
-        def _delayed_run():
-            try:
-                if not stop_event.wait(timeout=delay):
-                    if self._running_event.is_set() and not job_info.cancelled:
-                        try:
-                            func()
-                        except Exception as e:
-                            logging.error(f"[Scheduler] Once job {job_id} failed: {e}")
-            finally:
-                with self._lock:
-                    if job_id in self._once_jobs:
-                        del self._once_jobs[job_id]
-
-        thread = threading.Thread(target=_delayed_run, daemon=True, name=f"OnceJob_{job_id}")
-        job_info.thread = thread
-        job_info.stop_event = stop_event  # 保存stop_event用于取消
-        thread.start()
-
-        with self._lock:
+        with self._cond:
+            existing_job = self._once_jobs.get(job_id)
+            if existing_job is not None and existing_job.is_running():
+                self._log(f"[Scheduler] Once job {job_id} already running, skipped")
+                return None
+
+            # P1 Bug #82修复：到期时刻登记到调度堆，由主循环提交线程池执行，等待期间不占用线程
+            job_info = OnceJobInfo(job_id=job_id, func=func, delay=delay, due=_now() + max(0.0, delay))
             self._once_jobs[job_id] = job_info
+            heapq.heappush(self._heap, (job_info.due, 0, next(self._heap_seq), job_id, _ENTRY_ONCE))
+            self._cond.notify()
 
         self._log(f"[Scheduler] Added once job: {job_id} (delay: {delay}s)")
         return job_id
 
+    def _run_once_job(self, job_info: OnceJobInfo) -> None:
+        """在工作线程中执行一次性任务，完成后出表"""
+        try:
+            job_info.func()
+        except Exception as e:
+            logging.error("[Scheduler] Once job %s failed: %s", job_info.job_id, e)
+        finally:
+            with self._lock:
+                if self._once_jobs.get(job_info.job_id) is job_info:
+                    del self._once_jobs[job_info.job_id]
+
     # ========================================================================
     # 主循环
     # ========================================================================
 
+    def _schedule(self, job_id: str, due: float) -> None:
+        """登记任务下次到期时间并唤醒主循环（调用方持有self._lock）"""
+        self._due_at[job_id] = due
+        heapq.heappush(self._heap, (due, -self._jobs[job_id].priority, next(self._heap_seq), job_id, _ENTRY_JOB))
+        self._cond.notify()
+
+    def _reschedule(self, job: JobInfo, due: float) -> None:
+        """任务仍登记且未在堆中时重新入堆（调用方持有self._lock）"""
+        if self._jobs.get(job.job_id) is job and job.job_id not in self._due_at:
+            self._schedule(job.job_id, due)
+
+    def _pop_due_jobs(self, now: float) -> Tuple[List[JobInfo], List[OnceJobInfo]]:
+        """弹出所有已到期的定时任务和一次性任务，并处理到期的超时检查（调用方持有self._lock）
+
+        已移除/重新登记的任务留下的旧条目按_due_at比对后丢弃；
+        暂停/取消的任务出堆后不再入堆，恢复时由resume_job重新登记。
+        """
+        heap, heappop = self._heap, heapq.heappop
+        due_at, jobs_map = self._due_at, self._jobs
+        due_jobs = []
+        once_jobs = []
+        while heap and heap[0][0] <= now:
+            entry = heappop(heap)
+            due, _, _, job_id, kind = entry[:5]
+            if kind == _ENTRY_TIMEOUT:
+                self._expire_run(job_id, entry[5])
+                continue
+            if kind == _ENTRY_ONCE:
+                job_info = self._once_jobs.get(job_id)
+                if job_info is not None and job_info.due == due and not job_info.cancelled:
+                    once_jobs.append(job_info)
+                continue
+            if due_at.get(job_id) != due:
+                continue
+            del due_at[job_id]
+            job = jobs_map.get(job_id)
+            if job is None or job.status in _INACTIVE_STATUSES:
+                continue
+            job.due = due
+            due_jobs.append(job)
+        return due_jobs, once_jobs
+
     def _master_loop(self) -> None:
-        """主调度循环"""
-        while self._running_event.is_set():
+        """主调度循环：休眠至最早到期时间，只负责提交任务，不等待任务执行"""
+        # 循环内反复使用的属性/方法预先绑定为局部变量（_heap等容器只原地修改，不会被替换）
+        is_running = self._running_event.is_set
+        cond, heap = self._cond, self._heap
+        wait = cond.wait
+        pop_due_jobs, run_due_jobs = self._pop_due_jobs, self._run_due_jobs
+        run_once = self._run_once_job
+        while is_running():
             try:
-                now = time.time()
-
-                # 定期清理死线程
-                if now - self._last_cleanup > self._thread_cleanup_interval:
-                    self._cleanup_dead_threads()
-                    self._last_cleanup = now
-
-                # 复制任务列表避免长时间锁定，并按优先级排序
-                with self._lock:
-                    jobs_to_run = sorted(
-                        [job for job in self._jobs.values()
-                         if job.status not in (JobStatus.PAUSED, JobStatus.CANCELLED)],
-                        key=lambda j: j.priority,
-                        reverse=True
-                    )
-
-                for job in jobs_to_run:
-                    self._try_run_job(job, now)
-
-                # 分段休眠，快速响应停止
-                for _ in range(int(self._tick_interval * 10)):
-                    if not self._running_event.is_set():
-                        break
-                    time.sleep(0.1)
+                with cond:
+                    now = _now()
+                    if not heap or heap[0][0] > now:
+                        # 入堆/停止均会notify，故直接按CLOCK_MONOTONIC定时等待到最早到期时刻，
+                        # 空堆时无限期等待；不设周期性自检唤醒
+                        wait(heap[0][0] - now if heap else None)
+                        continue
+                    jobs_to_run, once_jobs = pop_due_jobs(now)
+                    if once_jobs:
+                        submit = self._get_pool().submit
+                        for job_info in once_jobs:
+                            job_info.future = submit(run_once, job_info)
+                    # 出堆顺序即(到期时间, 优先级)顺序，无需再排序
+                    if jobs_to_run:
+                        run_due_jobs(jobs_to_run, now)
 
             except Exception as e:
                 logging.error(f"[Scheduler] Master loop error: {e}")
-                time.sleep(1)
+                if self._stop_event.wait(1):
+                    break
 
-    def _try_run_job(self, job: JobInfo, now: float) -> None:
-        """尝试执行任务"""
-        if now - job.last_run < job.interval:
-            return
-
-        try:
-            # 所有任务都在独立线程执行，防止阻塞
-            self._run_job_with_timeout(job)
+    def _run_due_jobs(self, jobs: List[JobInfo], now: float) -> None:
+        """提交到期任务（调用方持有self._lock）
 
-            # 更新执行时间 - [R22-TIME-P1-07] 使用预期时间避免漂移累积
-            with self._lock:
-                if job.job_id in self._jobs:
-                    self._jobs[job.job_id].last_run = now  # 使用调度时的now，而非time.time()
-                    self._jobs[job.job_id].run_count += 1
-                    self._jobs[job.job_id].status = JobStatus.PENDING
-                    self._jobs[job.job_id].retry_count = 0
-                    self._jobs[job.job_id].last_error = None
-
-        except Exception as e:
-            error_msg = str(e)
-            logging.error(f"[Scheduler] Job {job.job_id} error: {error_msg}")
-
-            with self._lock:
-                if job.job_id in self._jobs:
-                    self._jobs[job.job_id].last_error = error_msg
+        任务一律在工作线程执行，结果由完成回调记账并重新入堆，超时由堆中的检查条目处理，
+        主循环不会因任何任务阻塞。
+        """
+        submit_job = self._submit_job
+        for job in jobs:
+            if submit_job(job, now) is None:
+                self._reschedule(job, _next_slot(job.due, now, job.interval))
 
-                    if job.retry_count < job.max_retries:
-                        job.retry_count += 1
-                        self._log(f"[Scheduler] Job {job.job_id} retry {job.retry_count}/{job.max_retries}")
-                        self._jobs[job.job_id].last_run = 0
-                    else:
-                        self._jobs[job.job_id].status = JobStatus.FAILED
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """获取工作线程池（按需创建，stop后再次start会重建）"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="JobWorker",
+                )
+            return self._pool
 
-    def _run_job_with_timeout(self, job: JobInfo) -> None:
-        """带超时保护的任务执行
+    def _submit_job(self, job: JobInfo, now: float) -> Optional[Future]:
+        """提交任务到工作线程池（调用方持有self._lock），上次未结束时返回None
 
         R5-E-11修复: 添加重叠执行防护，防止同一任务并发执行。
         R15-P1-RES-14修复: 添加task_timeout_sec默认300秒，超时cancel。
         """
+        # R5-E-11修复: 重叠执行防护——上次提交的future未结束（含超时后仍在运行）则跳过
+        previous = self._active_futures.get(job.job_id)
+        if previous is not None and not previous.done():
+            # 持续卡住的任务按固定间隔告警，避免每次调度刷屏
+            if now - job.last_stuck_log >= self._stuck_log_interval:
+                job.last_stuck_log = now
+                logging.warning("[R5-E-11] Job %s仍在执行中，跳过本次调度(防重叠)", job.job_id)
+            return None
         # R15-P1-RES-14修复: 全局task超时上限
         _task_timeout_sec = getattr(self, '_task_timeout_sec', 300.0)
         _effective_timeout = min(job.timeout, _task_timeout_sec)
-        # R5-E-11修复: 重叠执行防护
-        if getattr(job, '_is_executing', False):
-            logging.warning("[R5-E-11] Job %s仍在执行中，跳过本次调度(防重叠)", job.job_id)
-            return
-        job._is_executing = True
-        try:
-            with self._lock:
-                if job.job_id in self._jobs:
-                    self._jobs[job.job_id].status = JobStatus.RUNNING
-
-            result_container = {'error': None, 'done': False}
-
-            cancel_event = threading.Event()
-
-            def _run():
-                try:
-                    if not cancel_event.is_set():
-                        job.func()
-                except Exception as e:
-                    logging.error(f"[Scheduler] Job {job.job_id} execution error: {e}")
-                    result_container['error'] = e
-                finally:
-                    result_container['done'] = True
-
-            thread = threading.Thread(target=_run, daemon=True, name=f"JobWorker_{job.job_id}")
-            # ✅ P1修复：加锁保护_active_threads写入，避免并发竞态
-            with self._lock:
-                self._active_threads[job.job_id] = thread
-            thread.start()
-
-            # 等待超时
-            thread.join(timeout=_effective_timeout)
-
-            if not result_container['done']:
-                logging.warning(f"[Scheduler] Job {job.job_id} timeout after {_effective_timeout}s, setting cancel event")
-                cancel_event.set()
-                with self._lock:
-                    self._active_threads.pop(job.job_id, None)
-                raise TimeoutError(f"Job {job.job_id} exceeded timeout of {job.timeout}s")
 
-            if result_container['error']:
-                raise result_container['error']
-        finally:
-            _still_alive = False
-            try:
-                _still_alive = thread.is_alive()
-            except NameError:
-                pass
-            if _still_alive:
-                job._is_executing = True
-                logging.warning("[R5-E-11] Job %s超时后线程仍存活，保持_is_executing=True防重叠", job.job_id)
-            else:
-                job._is_executing = False
-
-    def _cleanup_dead_threads(self) -> None:
-        """清理已结束的线程"""
+        job.status = JobStatus.RUNNING
+        future = self._get_pool().submit(job.func)
+        self._active_futures[job.job_id] = future
+        self._pending_runs[job.job_id] = (future, now)
+        heapq.heappush(self._heap, (now + _effective_timeout, 0, next(self._heap_seq),
+                                    job.job_id, _ENTRY_TIMEOUT, future))
+        future.add_done_callback(functools.partial(self._on_job_done, job))
+        return future
+
+    def _on_job_done(self, job: JobInfo, future: Future) -> None:
+        """任务结束回调（工作线程中执行）：释放future引用，未超时的运行在此记账并重新入堆"""
         with self._lock:
-            dead_jobs = [
-                job_id for job_id, thread in self._active_threads.items()
-                if not thread.is_alive()
-            ]
-            for job_id in dead_jobs:
-                del self._active_threads[job_id]
+            if self._active_futures.get(job.job_id) is future:
+                del self._active_futures[job.job_id]
+            run = self._pending_runs.get(job.job_id)
+            if run is None or run[0] is not future:
+                return  # 已按超时记账
+            del self._pending_runs[job.job_id]
+            dispatched_at = run[1]
+            if future.cancelled():
+                # stop()丢弃的排队任务不计入执行结果，重新启动后立即补跑
+                job.status = JobStatus.PENDING
+                self._reschedule(job, dispatched_at)
+                return
+            error = future.exception()
+            self._reschedule(job, self._record_result(job, dispatched_at, error))
+        # 出锁后再输出日志，格式化/写盘不占用调度锁
+        if error is not None:
+            self._log_job_error(job, error)
+
+    def _log_job_error(self, job: JobInfo, error: BaseException) -> None:
+        """输出任务异常：按任务限频附带堆栈，其余仅输出一行，均由logging延迟格式化"""
+        now = _now()
+        if now - job.last_trace_log >= self._trace_log_interval:
+            job.last_trace_log = now
+            logging.error("[Scheduler] Job %s execution error: %s", job.job_id, error, exc_info=error)
+        else:
+            logging.error("[Scheduler] Job %s execution error: %s", job.job_id, error)
+
+    def _expire_run(self, job_id: str, future: Future) -> None:
+        """超时检查到期（调用方持有self._lock）：运行仍未结束则按超时记账"""
+        run = self._pending_runs.get(job_id)
+        if run is None or run[0] is not future or future.done():
+            return
+        del self._pending_runs[job_id]
+        # 尚未开始执行的直接取消；已在运行的保留在_active_futures中继续防重叠
+        future.cancel()
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        logging.warning("[Scheduler] Job %s timeout, cancelling", job_id)
+        error = TimeoutError(f"Job {job_id} exceeded timeout of {job.timeout}s")
+        self._reschedule(job, self._record_result(job, run[1], error))
 
-            if dead_jobs:
-                self._log(f"[Scheduler] Cleaned up {len(dead_jobs)} dead threads")
+    def _record_result(self, job: JobInfo, now: float, error: Optional[BaseException]) -> float:
+        """记录执行结果（调用方持有self._lock），返回下次到期时间"""
+        if error is None:
+            # 更新执行时间 - [R22-TIME-P1-07] 使用预期时间避免漂移累积
+            job.last_run = now  # 使用调度时的now，而非当前时刻
+            job.run_count += 1
+            job.status = JobStatus.PENDING
+            job.retry_count = 0
+            job.last_error = None
+            return _next_slot(job.due, now, job.interval)
+
+        job.last_error = str(error)
+        if job.retry_count < job.max_retries:
+            job.retry_count += 1
+            self._log(f"[Scheduler] Job {job.job_id} retry {job.retry_count}/{job.max_retries}")
+            job.last_run = 0
+            return now
+        job.status = JobStatus.FAILED
+        return _next_slot(job.due, now, job.interval)
 
     # ========================================================================
     # 辅助方法
     # ========================================================================
 
     def _log(self, message: str) -> None:
-        """输出日志"""
+        """输出日志：自定义日志函数出错后降级为模块logger，不再反复触发异常"""
         try:
-            if self._logger:
-                self._logger(message)
+            self._logger(message)
         except Exception as e:
-            logging.warning(f"[Scheduler] Log error: {e}")
+            logging.warning(f"[Scheduler] Log error: {e}, falling back to module logger")
+            self._logger = _scheduler_logger.info
+            self._logger(message)
 
     # ✅ ID唯一：get_stats统一接口，返回值含service_name="SchedulerService"
     def get_stats(self) -> Dict[str, Any]:
@@ -641,9 +758,9 @@ class SchedulerService:
                 "running": self._running_event.is_set(),
                 "total_jobs": len(self._jobs),
                 "once_jobs": len(self._once_jobs),
-                "active_threads": sum(1 for t in self._active_threads.values() if t.is_alive()),  # R21-MEM-P2-03修复: 生成器替代列表推导式，避免临时列表
+                "active_threads": sum(1 for f in self._active_futures.values() if not f.done()),  # R21-MEM-P2-03修复: 生成器替代列表推导式，避免临时列表
                 "jobs": {
-                    job_id: {
+                    job.job_id: {
                         "interval": job.interval,
                         "run_count": job.run_count,
                         "status": job.status.name,
@@ -651,7 +768,7 @@ class SchedulerService:
                         "retry_count": job.retry_count,
                         "last_error": job.last_error,
                     }
-                    for job_id, job in self._jobs.items()
+                    for job in self._jobs_snapshot
                 }
             }
 
@@ -662,8 +779,12 @@ class SchedulerService:
             for job in self._once_jobs.values():
                 job.cancelled = True
             self._jobs.clear()
+            self._jobs_snapshot = ()
             self._once_jobs.clear()
-            self._active_threads.clear()
+            self._heap.clear()
+            self._due_at.clear()
+            self._active_futures.clear()
+            self._pending_runs.clear()
 
 
 # ============================================================================
@@ -724,6 +845,15 @@ class MarketTimeService:
             # P2-8修复: 金融期货(CFFEX)夜盘至23:00，无次日凌晨段
             'CFFEX': [(21, 0, 23, 0)],
         }
+        # 交易时段预先转换为dt_time，is_market_open不再逐次构造
+        self._session_times = {
+            exch: tuple((dt_time(sh, sm), dt_time(eh, em)) for sh, sm, eh, em in sessions)
+            for exch, sessions in self._sessions.items()
+        }
+        self._night_session_times = {
+            exch: tuple((dt_time(sh, sm), dt_time(eh, em)) for sh, sm, eh, em in sessions)
+            for exch, sessions in self._night_sessions.items()
+        }
         # [R22-TIME-P1-14] 默认节假日数据，防止非交易日判断失效
         self.holidays: set = set()  # 仍为空集合，但提供add_default_holidays方法
     
@@ -772,21 +902,15 @@ class MarketTimeService:
         return True
     
     def is_market_open(self, exchange: Optional[str] = None) -> bool:
-        from ali2026v3_trading.shared_utils import CHINA_TZ  # [R22-TIME-P1-01] 统一时区常量
-        now = datetime.now(CHINA_TZ)
-        now_time = now.time()
-        exchanges = [exchange] if exchange else list(self._sessions.keys())
+        now_time = datetime.now(CHINA_TZ).time()  # [R22-TIME-P1-01] 统一时区常量
+        session_times = self._session_times
+        night_session_times = self._night_session_times
+        exchanges = (exchange,) if exchange else session_times.keys()
         for exch in exchanges:
-            sessions = self._sessions.get(exch, [])
-            for start_h, start_m, end_h, end_m in sessions:
-                start_time = dt_time(start_h, start_m)
-                end_time = dt_time(end_h, end_m)
+            for start_time, end_time in session_times.get(exch, ()):
                 if start_time <= now_time <= end_time:
                     return True
-            night_sessions = self._night_sessions.get(exch, [])
-            for start_h, start_m, end_h, end_m in night_sessions:
-                start_time = dt_time(start_h, start_m)
-                end_time = dt_time(end_h, end_m)
+            for start_time, end_time in night_session_times.get(exch, ()):
                 # P1 Bug #83修复：正确处理跨午夜时段
                 if start_time <= end_time:
                     # 不跨午夜：start <= now <= end
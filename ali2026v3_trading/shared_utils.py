@@ -470,14 +470,19 @@ class ThreadLifecycleManager:
         self._phase = self.PHASE_STOPPING
         stop_event.set()
         result = {'stopped': 0, 'timeout': 0, 'daemon': 0}
+        # 各线程收到stop_event后并行退出，join共用同一截止时刻，
+        # 总等待时长取决于最慢线程而非线程数×timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        daemon_deadline = start + min(timeout, 5.0)
         for name, thread in list(self._threads.items()):
             if not thread:
                 continue
             if self._daemon_flags.get(name, False):
-                thread.join(timeout=min(timeout, 5.0))
+                thread.join(timeout=max(0.0, daemon_deadline - time.monotonic()))
                 result['daemon'] += 1
                 continue
-            thread.join(timeout=timeout)
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
             if thread.is_alive():
                 logging.warning("[ThreadMgr] %s 在 %ss 内未停止", name, timeout)
                 result['timeout'] += 1
@@ -28,14 +28,16 @@ R21-MEM-P2-18修复: 内存碎片化防护策略
 """
 from __future__ import annotations
 
+import functools
 import json
 import os
 import time
 import threading
 import logging
+import logging.handlers
 import collections
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 
 from ali2026v3_trading.serialization_utils import json_dumps
 from ali2026v3_trading.shared_utils import CHINA_TZ
@@ -87,6 +89,34 @@ class ConnectionState:
 
 logger = logging.getLogger(__name__)
 
+# onTick 降级判断使用的状态键，导入时解析一次（兼容热重载后的 Enum 实例）
+_DEGRADED_STATE_KEY = _state_key(StrategyState.DEGRADED)
+
+# 恢复标记/恢复事件/checkpoint 均落在包内 logs 目录，路径在导入时解析一次
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_LOGS_DIR = os.path.join(_MODULE_DIR, 'logs')
+
+# DR-P1-04恢复事件JSONL：独立logger，不向根logger传播（记录本身即一行JSON）
+_recovery_logger = logging.getLogger('ali2026v3_trading.strategy_core_service.recovery_events')
+_recovery_logger.propagate = False
+_recovery_handler_lock = threading.Lock()
+
+
+def _get_recovery_logger() -> logging.Logger:
+    """恢复事件logger：RotatingFileHandler进程内只配置一次，各策略实例共用同一文件句柄"""
+    if not _recovery_logger.handlers:
+        with _recovery_handler_lock:
+            if not _recovery_logger.handlers:
+                os.makedirs(_LOGS_DIR, exist_ok=True)
+                _fh = logging.handlers.RotatingFileHandler(
+                    os.path.join(_LOGS_DIR, 'recovery_events.jsonl'),
+                    maxBytes=1024 * 1024, backupCount=3, encoding='utf-8',
+                )
+                _fh.setFormatter(logging.Formatter('%(message)s'))
+                _recovery_logger.addHandler(_fh)
+                _recovery_logger.setLevel(logging.INFO)
+    return _recovery_logger
+
 # P-12修复: LiveStrategySelector实盘集成（手册9.4节）
 # P0-R8-08修复: 修正导入路径，LiveStrategySelector定义在delay_time_sharpe_3d.py中
 # R13-P1-DEAD-03修复: 添加日志记录缺失模块，便于排查
@@ -120,18 +150,16 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
     
     MAX_PROCESSED_TRADE_IDS = 10000
 
+    # Mixin状态初始化钩子，__init__中按顺序执行
+    _MIXIN_INIT_HOOKS = ('_init_historical_kline_mixin', '_init_tick_handler_mixin')
+
     def __init__(self, strategy_id: str = None, event_bus: Optional[Any] = None):
         self.strategy_id = strategy_id or f"strategy_{int(time.time())}"
 
         # R27-P0-DR-07修复: 策略独立线程池隔离，防止策略崩溃影响全局
+        # 构造时不建池，首次提交任务时由 _get_strategy_executor() 创建；
+        # 回测/参数扫描批量实例化且从未启动的策略不再各持一个线程池
         self._strategy_executor = None
-        try:
-            import concurrent.futures as _cf
-            self._strategy_executor = _cf.ThreadPoolExecutor(
-                max_workers=2, thread_name_prefix=f"strat_{self.strategy_id[:12]}"
-            )
-        except Exception as _executor_err:
-            logging.warning("[R22-P1-NEW] 策略线程池创建失败(后续可能AttributeError): %s", _executor_err)
 
         # 状态管理
         self._state = StrategyState.INITIALIZING
@@ -162,15 +190,16 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
         #   RLock(递归锁): 用于同一线程可能多次获取同一锁的场景（如方法嵌套调用）
         #     - _lock: on_tick→process_option→execute_trading 等嵌套调用链需要重入
         #     - _state_lock: start/stop/pause/resume等方法内部可能调用其他已获取_state_lock的方法
-        #     - _trading_lock: execute_option_trading_cycle内部调用子方法可能重入
-        #     - _scheduler_lock: 调度器回调可能嵌套调用
         #     - _storage_lock: 存储操作可能在已持有锁的上下文中再次调用
         #   Lock(普通锁): 用于无重入需求的简单互斥场景，性能略优于RLock
         #     - _platform_subscribe_lock: 仅保护订阅操作的简单互斥，无嵌套调用
+        #     - _trading_lock: 仅在execute_option_trading_cycle/check_position_risk入口以
+        #       acquire(blocking=False)试锁，两者的子调用均不再取此锁；占用即跳过本周期
+        #     - _scheduler_lock: 预留的调度器互斥，当前无嵌套获取
         self._lock = threading.RLock()
-        self._scheduler_lock = threading.RLock()
+        self._scheduler_lock = threading.Lock()
         self._state_lock = threading.RLock()
-        self._trading_lock = threading.RLock()
+        self._trading_lock = threading.Lock()
 
         # 调度器管理器
         from ali2026v3_trading.strategy_scheduler import StrategyScheduler
@@ -191,11 +220,9 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
             'tick_by_instrument': {}
         }
 
-        # 初始化历史K线Mixin
-        self._init_historical_kline_mixin()
-
-        # 初始化Tick处理Mixin
-        self._init_tick_handler_mixin()
+        # 初始化历史K线/Tick处理Mixin
+        for hook in self._MIXIN_INIT_HOOKS:
+            getattr(self, hook)()
 
         # R13-P0-API-07修复: Mixin初始化依赖隐式属性设置，添加显式检查
         self._validate_mixin_attributes()
@@ -222,6 +249,8 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
         # 运行时平台 API 绑定
         self.subscribe = None
         self.unsubscribe = None
+        self._subscribe_batch = None
+        self._unsubscribe_batch = None
         self.get_instrument = None
         self.get_kline = None
         self._runtime_strategy_host = None
@@ -375,6 +404,8 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
         self._future_ids: set[str] = set()
         self._option_ids: set[str] = set()
         self._subscribed_instruments: List[str] = []
+        # 合约→交易所缓存，订阅清单重建时清空（见 _do_bind_platform_apis）
+        self._instrument_exchange_cache: Dict[str, str] = {}
         self._init_instruments_result: Optional[Dict[str, Any]] = None
 
         self._storage = None
@@ -412,13 +443,10 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
     # R15-P1-RES-09修复: atexit清理ThreadPoolExecutor
     def _atexit_cleanup_executor(self):
         for _attr in ('_executor', '_log_writer_executor', '_analysis_executor', '_strategy_executor'):
-            _ex = getattr(self, _attr, None)
-            if _ex and hasattr(_ex, 'shutdown'):
-                try:
-                    _ex.shutdown(wait=False)
-                except Exception:
-                    logging.warning("[R22-EP-P1] StrategyCoreService exception swallowed")
-                    pass
+            # 解释器退出阶段：先做前置判断再调用，不依赖宽泛的异常吞没
+            _shutdown = getattr(getattr(self, _attr, None), 'shutdown', None)
+            if callable(_shutdown):
+                _shutdown(wait=False)
 
     # DR-P1-04: 崩溃后自动化恢复
     def _auto_recovery_flow(self) -> bool:
@@ -426,12 +454,7 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
 
         返回 True 表示正常或恢复成功，False 表示恢复失败（进入SAFE_MODE）。
         """
-        _recovery_marker = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), 'logs', '_shutdown_gracefully.marker'
-        )
-        _recovery_log_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), 'logs', 'recovery_events.jsonl'
-        )
+        _recovery_marker = os.path.join(_LOGS_DIR, '_shutdown_gracefully.marker')
 
         _crashed = os.path.exists(_recovery_marker)
 
@@ -514,7 +537,6 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
 
         # 记录恢复日志
         try:
-            os.makedirs(os.path.dirname(_recovery_log_path), exist_ok=True)
             _recovery_record = {
                 'timestamp': datetime.now(CHINA_TZ).isoformat(),
                 'event_type': 'auto_recovery',
@@ -524,8 +546,7 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
                 'recovery_duration_sec': round(time.time() - _recovery_start, 3),
                 'details': _recovery_details,
             }
-            with open(_recovery_log_path, 'a', encoding='utf-8') as f:
-                f.write(json_dumps(_recovery_record) + '\n')
+            _get_recovery_logger().info(json_dumps(_recovery_record))
         except Exception as e:
             logging.warning("[DR-P1-04] 恢复日志写入失败: %s", e)
 
@@ -564,10 +585,7 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
         Returns:
             Dict: 恢复结果 {recovered: bool, fields: [...], errors: [...]}
         """
-        _checkpoint_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), 'logs',
-            f'checkpoint_{self.strategy_id}.json'
-        )
+        _checkpoint_path = os.path.join(_LOGS_DIR, f'checkpoint_{self.strategy_id}.json')
         _result = {
             'recovered': False,
             'fields': [],
@@ -648,10 +666,7 @@ class StrategyCoreService(_LifecycleMixin, _InstrumentHelperMixin,
         Returns:
             bool: 保存是否成功
         """
-        _checkpoint_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), 'logs',
-            f'checkpoint_{self.strategy_id}.json'
-        )
+        _checkpoint_path = os.path.join(_LOGS_DIR, f'checkpoint_{self.strategy_id}.json')
         try:
             os.makedirs(os.path.dirname(_checkpoint_path), exist_ok=True)
             # P2-R11-11修复: 添加strategy_version到checkpoint文件，确保恢复时版本兼容性检查
@@ -1618,6 +1633,20 @@ except ImportError:
 from .ui_service import UIMixin
 
 
+@functools.lru_cache(maxsize=None)
+def _mro_names(cls: type) -> str:
+    """类的MRO名称串（按类缓存，仅用于诊断日志）"""
+    return ' -> '.join(c.__name__ for c in cls.__mro__)
+
+
+def _resolve_base_hook(cls: type, name: str) -> Any:
+    """沿 cls 的MRO（跳过 cls 自身）取首个定义 name 的原始类属性，与 super(cls, self).name 解析到同一实现"""
+    for klass in cls.__mro__[1:]:
+        if name in klass.__dict__:
+            return klass.__dict__[name]
+    return None
+
+
 class StrategyParams:
     """策略参数容器 - 替代 type('Params', (), dict)() 匿名类
 
@@ -1661,7 +1690,24 @@ class StrategyParams:
 
 
 class Strategy2026(BaseStrategy, UIMixin):
-    """策略 2026 主类 - 直接继承平台基类和 UI 混合类"""
+    """策略 2026 主类 - 直接继承平台基类和 UI 混合类
+
+    不声明 __slots__：平台 BaseStrategy 与 UIMixin 的实例本身带 __dict__，子类加槽位
+    既不能去掉 __dict__ 也不会加快属性访问；且 _market_exchanges 依赖 cached_property
+    写入实例 __dict__。逐事件读取的状态改用类级默认值/构造期绑定，而非槽位。
+    """
+
+    # onTick PQS节流：阈值为类常量，节流状态用类级默认值，逐tick无需getattr兜底
+    _PQS_THROTTLE_SEC = 5.0
+    _PQS_THROTTLE_TICKS = 10
+    _pqs_tick_count = 0
+    _pqs_next_update_time = 0.0
+    # 平台回调开关与转发目标的类级默认值：__init__完成前到达的回调也能直接读取，无需getattr兜底；
+    # strategy_core 未建立时回调以一次 is None 判断直接返回
+    _callbacks_enabled = True
+    strategy_core = None
+    _core_on_tick = None
+    _event_routes: Dict[str, Tuple[Optional[Callable], Optional[Callable]]] = {}
 
     def __init__(self, *args, **kwargs):
         BaseStrategy.__init__(self)
@@ -1685,12 +1731,12 @@ class Strategy2026(BaseStrategy, UIMixin):
         self._runtime_market_center_ref = kwargs.get('market_center')
         self._config_loaded = False
 
-        logging.info(
-            "[Strategy2026.__init__] type=%s, MRO=%s, kwargs_keys=%s",
-            type(self).__name__,
-            [c.__name__ for c in type(self).__mro__],
-            list(kwargs.keys()),
-        )
+        # 诊断信息：MRO按类缓存，且仅在DEBUG开启时输出（回测批量实例化不再逐实例拼装）
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "[Strategy2026.__init__] type=%s, MRO=%s, kwargs_keys=%s",
+                type(self).__name__, _mro_names(type(self)), list(kwargs),
+            )
 
         bootstrap_config = dict(runtime_config)
         if self._runtime_strategy_ref is not None:
@@ -1705,6 +1751,13 @@ class Strategy2026(BaseStrategy, UIMixin):
 
         self.strategy_id = kwargs.get('strategy_id', f"strategy_{int(time.time())}")
         self.strategy_core = StrategyCoreService(self.strategy_id)
+        # 行情/订单/成交回调转发目标在构造时一次解析，逐事件不再 hasattr 探测
+        self._core_on_tick = getattr(self.strategy_core, 'on_tick', None)
+        # 订单/成交回调路由：hook -> (基类实现, strategy_core 转发)，均为已绑定方法或 None
+        self._event_routes = {
+            hook: (getattr(self, '_base_' + hook), getattr(self.strategy_core, hook, None))
+            for hook in ('on_order', 'on_trade')
+        }
 
         try:
             import t_type_bootstrap as ttb
@@ -1735,6 +1788,7 @@ class Strategy2026(BaseStrategy, UIMixin):
         logging.error("[Strategy2026] %s", message)  # R13-P2-LOG-01修复
 
     def _log_tick_summary(self, tick: Any) -> None:
+        # 仅在DEBUG开启时由onTick调用（判断放在调用处，DEBUG关闭时逐tick不产生这次方法调用）
         instrument_id = getattr(tick, 'instrument_id', '') or getattr(tick, 'InstrumentID', '')
         last_price = getattr(tick, 'last_price', 0.0) or getattr(tick, 'LastPrice', 0.0)
         volume = getattr(tick, 'volume', 0) or getattr(tick, 'Volume', 0)
@@ -1768,6 +1822,7 @@ class Strategy2026(BaseStrategy, UIMixin):
 
         self.config = merged
         self.params = StrategyParams(merged)
+        self.__dict__.pop('_market_exchanges', None)  # params已替换，派生缓存失效
         self._config_loaded = True
 
         logging.info("[Strategy2026] params.strategy = %s", getattr(self.params, 'strategy', None))  # R13-P2-LOG-01修复
@@ -1811,26 +1866,31 @@ class Strategy2026(BaseStrategy, UIMixin):
             _sub_thread.join(timeout=5.0)
             self._platform_subscribe_thread = None
 
+    @functools.cached_property
+    def _market_exchanges(self) -> tuple:
+        """AUTO模式下参与开盘判断的交易所（由params解析一次；params重载时失效）"""
+        from ali2026v3_trading.config_params import get_param
+
+        exchanges_raw = getattr(self.params, 'exchanges', '')
+        if isinstance(exchanges_raw, (list, tuple, set)):
+            exchanges = tuple(str(e).strip() for e in exchanges_raw if str(e).strip())
+        else:
+            exchanges = tuple(e.strip() for e in str(exchanges_raw).split(',') if e.strip())
+
+        if not exchanges:
+            default_exchanges_raw = get_param('exchanges', 'CFFEX,SHFE,DCE,CZCE,INE,GFEX')
+            exchanges = tuple(e.strip() for e in str(default_exchanges_raw).split(',') if e.strip())
+        return exchanges
+
     def is_market_open(self, exchange: str = 'AUTO') -> bool:
         from ali2026v3_trading.scheduler_service import is_market_open as _is_market_open
-        from ali2026v3_trading.config_params import get_param
 
         try:
             exchange = exchange or 'AUTO'
             if exchange != 'AUTO':
                 return _is_market_open(exchange)
 
-            exchanges_raw = getattr(self.params, 'exchanges', '') if hasattr(self, 'params') else ''
-            if isinstance(exchanges_raw, (list, tuple, set)):
-                exchanges = [str(e).strip() for e in exchanges_raw if str(e).strip()]
-            else:
-                exchanges = [e.strip() for e in str(exchanges_raw).split(',') if e.strip()]
-
-            if not exchanges:
-                default_exchanges_raw = get_param('exchanges', 'CFFEX,SHFE,DCE,CZCE,INE,GFEX')
-                exchanges = [e.strip() for e in str(default_exchanges_raw).split(',') if e.strip()]
-
-            return any(_is_market_open(exch) for exch in exchanges)
+            return any(_is_market_open(exch) for exch in self._market_exchanges)
         except Exception:
             return any(_is_market_open(exch) for exch in ['CFFEX', 'SHFE', 'DCE', 'CZCE', 'INE', 'GFEX'])
 
@@ -2075,7 +2135,8 @@ class Strategy2026(BaseStrategy, UIMixin):
 
             self._init_pending = False
 
-            super().on_init()
+            if self._base_on_init is not None:
+                self._base_on_init()
             self._schedule_storage_warmup()
 
             return None
@@ -2197,37 +2258,34 @@ class Strategy2026(BaseStrategy, UIMixin):
 
     def onTick(self, tick):
         """平台 Tick 数据回调（必须返回 None）"""
-        if not getattr(self, '_callbacks_enabled', True):
+        if not self._callbacks_enabled:
             return None
 
         # R15-P0-RES-01修复: DEGRADED状态下阻断tick回调，避免降级后仍处理行情
-        try:
-            core_state = getattr(self.strategy_core, '_state', None) if hasattr(self, 'strategy_core') else None
-            if _state_is(core_state, StrategyState.DEGRADED):
-                return None
-        except Exception:
-            logging.warning("[R22-EP-P1] StrategyCoreService exception swallowed")
-            pass
+        # strategy_core 未建立（__init__未完成）时直接返回；其 _state 在构造时建立，无需逐tick搭建异常保护
+        # 目标状态键已在模块级预先解析，逐tick只标准化当前状态一次
+        strategy_core = self.strategy_core
+        if strategy_core is None or _state_key(strategy_core._state) == _DEGRADED_STATE_KEY:
+            return None
 
         try:
-            super().on_tick(tick)
+            if self._base_on_tick is not None:
+                self._base_on_tick(tick)
         except Exception as e:
             logging.error("[Strategy2026.onTick] super().on_tick() 错误：%s", e)  # R13-P2-LOG-01修复
 
         try:
-            self._log_tick_summary(tick)
+            if logging.root.isEnabledFor(logging.DEBUG):
+                self._log_tick_summary(tick)
 
             # R30-ARCH-02修复: 桥接PQS量化分析到策略决策链路
             # R32-ARCH-02-v2修复: 添加tick节流，避免高频tick下PQS计算成为性能瓶颈
             # 默认每5秒或每10个tick才调用一次PQS更新，减少CPU开销
             try:
-                _now_pqs = time.time()
-                _pqs_tick_count = getattr(self, '_pqs_tick_count', 0) + 1
+                _now_pqs = time.monotonic()
+                _pqs_tick_count = self._pqs_tick_count + 1
                 self._pqs_tick_count = _pqs_tick_count
-                _pqs_last_time = getattr(self, '_pqs_last_update_time', 0.0)
-                _pqs_throttle_sec = 5.0
-                _pqs_throttle_ticks = 10
-                if (_now_pqs - _pqs_last_time) >= _pqs_throttle_sec or _pqs_tick_count >= _pqs_throttle_ticks:
+                if _pqs_tick_count >= self._PQS_THROTTLE_TICKS or _now_pqs >= self._pqs_next_update_time:
                     from ali2026v3_trading.ProductionQuantSystem import get_production_quant_system
                     _pqs = get_production_quant_system()
                     if _pqs is not None and _pqs._initialized:
@@ -2239,52 +2297,46 @@ class Strategy2026(BaseStrategy, UIMixin):
                         if _close > 0:
                             _result = _pqs.update_tick(_sym, _high, _low, _close, _ret)
                             _pqs.publish_analysis_to_strategy(_result)
-                        self._pqs_last_update_time = _now_pqs
+                        self._pqs_next_update_time = _now_pqs + self._PQS_THROTTLE_SEC
                         self._pqs_tick_count = 0
             except Exception as _pqs_err:
                 logging.debug("[R22-P1-NEW] PQS量化分析tick更新失败(策略缺少量化输入): %s", _pqs_err)
 
-            if hasattr(self.strategy_core, 'on_tick'):
-                self.strategy_core.on_tick(tick)
+            _core_on_tick = self._core_on_tick
+            if _core_on_tick is not None:
+                _core_on_tick(tick)
         except Exception as e:
             logging.error("[Strategy2026.onTick] strategy_core.on_tick() 错误：%s", e)  # R13-P2-LOG-01修复
 
         return None
 
+    def _dispatch_event(self, callback: str, hook: str, data: Any) -> None:
+        """订单/成交回调公共骨架：先基类实现，再转发 strategy_core，两段各自隔离异常"""
+        route = self._event_routes.get(hook)
+        if route is None:
+            return  # __init__未完成，路由尚未建立
+        base_hook, core_hook = route
+        if base_hook is not None:
+            try:
+                base_hook(data)
+            except Exception as e:
+                logging.error("[Strategy2026.%s] super().%s() 错误：%s", callback, hook, e)  # R13-P2-LOG-01修复
+        if core_hook is not None:
+            try:
+                core_hook(data)
+            except Exception as e:
+                logging.error("[Strategy2026.%s] strategy_core.%s() 错误：%s", callback, hook, e)  # R13-P2-LOG-01修复
+
     def onOrder(self, order):
         """平台订单回调（必须返回 None）"""
-        if not getattr(self, '_callbacks_enabled', True):
-            return None
-
-        try:
-            super().on_order(order)
-        except Exception as e:
-            logging.error("[Strategy2026.onOrder] super().on_order() 错误：%s", e)  # R13-P2-LOG-01修复
-
-        try:
-            if hasattr(self.strategy_core, 'on_order'):
-                self.strategy_core.on_order(order)
-        except Exception as e:
-            logging.error("[Strategy2026.onOrder] strategy_core.on_order() 错误：%s", e)  # R13-P2-LOG-01修复
-
+        if self._callbacks_enabled:
+            self._dispatch_event('onOrder', 'on_order', order)
         return None
 
     def onTrade(self, trade):
         """平台成交回调（必须返回 None）"""
-        if not getattr(self, '_callbacks_enabled', True):
-            return None
-
-        try:
-            super().on_trade(trade)
-        except Exception as e:
-            logging.error("[Strategy2026.onTrade] super().on_trade() 错误：%s", e)  # R13-P2-LOG-01修复
-
-        try:
-            if hasattr(self.strategy_core, 'on_trade'):
-                self.strategy_core.on_trade(trade)
-        except Exception as e:
-            logging.error("[Strategy2026.onTrade] strategy_core.on_trade() 错误：%s", e)  # R13-P2-LOG-01修复
-
+        if self._callbacks_enabled:
+            self._dispatch_event('onTrade', 'on_trade', trade)
         return None
 
     on_init = onInit
@@ -2295,21 +2347,32 @@ class Strategy2026(BaseStrategy, UIMixin):
     on_order = onOrder
     on_trade = onTrade
 
+    # 基类回调实现在类创建后一次性解析（见类定义之后），实例访问时按原描述符绑定，
+    # 平台事件路径不再每次构造 super() 代理并遍历MRO；基类未实现时为 None，直接跳过
+    _base_on_init = None
+    _base_on_tick = None
+    _base_on_order = None
+    _base_on_trade = None
+
+    # 状态标志的唯一来源是 strategy_core（生命周期方法直接改写其 _is_* 字段），
+    # 门面不另存副本以免失同步；StrategyCoreService.__init__ 已保证字段存在，直接读取
     @property
     def my_is_running(self) -> bool:
-        return getattr(self.strategy_core, '_is_running', False)
+        return self.strategy_core._is_running
 
     @property
     def my_is_paused(self) -> bool:
-        return getattr(self.strategy_core, '_is_paused', False)
+        return self.strategy_core._is_paused
 
     @property
     def my_trading(self) -> bool:
-        if hasattr(self.strategy_core, '_is_trading'):
-            return getattr(self.strategy_core, '_is_trading', True)
-        return getattr(self.strategy_core, '_is_running', False) and not getattr(self.strategy_core, '_is_paused', False)
+        return self.strategy_core._is_trading
 
     @my_trading.setter
     def my_trading(self, value: bool) -> None:
-        if hasattr(self.strategy_core, '_is_trading'):
-            self.strategy_core._is_trading = bool(value)
+        self.strategy_core._is_trading = bool(value)
+
+
+for _hook in ('on_init', 'on_tick', 'on_order', 'on_trade'):
+    setattr(Strategy2026, '_base_' + _hook, _resolve_base_hook(Strategy2026, _hook))
+del _hook
@@ -12,9 +12,12 @@ strategy_lifecycle_mixin.py — StrategyState + _LifecycleMixin
 - 其他 mixin 可从此模块导入 StrategyState（不构成循环依赖）
 """
 
+from collections import deque
 from enum import Enum
 
+import itertools
 import os
+import sys
 import time
 import threading
 import logging
@@ -30,6 +33,14 @@ try:
 except ImportError:
     get_instrument_data_manager = None
 
+# 线程资源归属扫描：视为平台/系统线程的名称前缀（str.startswith元组一次匹配）
+_SYSTEM_THREAD_PREFIXES = (
+    'Main', 'Thread-', 'APScheduler', 'ThreadPoolExecutor',
+    'Storage-AsyncWriter[shared-service]', 'Storage-Cleanup[shared-service]',
+    'SubAsyncWriter[shared-service]', 'SubRetry[shared-service]', 'SubCleanup[shared-service]',
+    'TTypeService-Preload[shared-service]', 'onStop-worker',
+)
+
 
 # ============================================================================
 # StrategyState — 策略完整生命周期状态（供跨模块导入）
@@ -150,6 +161,9 @@ class _LifecycleMixin:
             logging.info("[R23-P2-01-FIX] State transition: %s -> %s", old_state.value, new_state.value)
             return True
 
+    # 平台订阅进度日志/批量提交的分块大小
+    _PLATFORM_SUBSCRIBE_CHUNK = 500
+
     def _start_platform_subscribe_async(self, instrument_ids: List[str]) -> None:
         """异步平台订阅"""
         targets = [str(x).strip() for x in (instrument_ids or []) if str(x).strip()]
@@ -174,27 +188,45 @@ class _LifecycleMixin:
         success = failed = 0
         total = len(instrument_ids)
 
-        subscribe_fn = None
-        if callable(getattr(self, 'subscribe', None)):
-            subscribe_fn = self.subscribe
-        else:
+        subscribe_fn = getattr(self, 'subscribe', None)
+
+        # 平台提供批量订阅接口时按块一次提交，省去逐合约跨越平台调用边界
+        batch_fn = self._subscribe_batch
+        if batch_fn is not None:
+            # 各块复用同一个暂存列表（批量包装函数即时转换为 (exchange, id) 列表，不持有引用）
+            pending = iter(instrument_ids)
+            chunk: List[str] = []
+            done = 0
+            while not self._platform_subscribe_stop.is_set():
+                chunk.clear()
+                chunk.extend(itertools.islice(pending, self._PLATFORM_SUBSCRIBE_CHUNK))
+                if not chunk:
+                    break
+                done += len(chunk)
+                try:
+                    batch_fn(chunk)
+                    success += len(chunk)
+                except Exception as e:
+                    failed += len(chunk)
+                    logging.warning(f"[Subscribe] Batch failed {chunk[0]}..{chunk[-1]}: {e}")
+                logging.info(f"[Subscribe] Progress {done}/{total}, ok={success}, fail={failed}")
+        elif not callable(subscribe_fn):
+            # 订阅入口不可用在循环外判定一次，整批记为失败
             logging.error("[Subscribe] self.subscribe不可用，无法订阅")
-
-        for i, inst in enumerate(instrument_ids, 1):
-            if self._platform_subscribe_stop.is_set():
-                break
-            try:
-                if subscribe_fn:
+            failed = total
+        else:
+            for i, inst in enumerate(instrument_ids, 1):
+                if self._platform_subscribe_stop.is_set():
+                    break
+                try:
                     subscribe_fn(inst)
                     success += 1
-                else:
+                except Exception as e:
                     failed += 1
-            except Exception as e:
-                failed += 1
-                logging.warning(f"[Subscribe] Failed {inst}: {e}")
+                    logging.warning(f"[Subscribe] Failed {inst}: {e}")
 
-            if i % 500 == 0 or i == total:
-                logging.info(f"[Subscribe] Progress {i}/{total}, ok={success}, fail={failed}")
+                if i % self._PLATFORM_SUBSCRIBE_CHUNK == 0 or i == total:
+                    logging.info(f"[Subscribe] Progress {i}/{total}, ok={success}, fail={failed}")
 
         logging.info(f"[Subscribe] Done: ok={success}, fail={failed}, total={total}")
         self._platform_subscribe_completed.set()
@@ -220,10 +252,19 @@ class _LifecycleMixin:
         sub = getattr(strategy_obj, 'sub_market_data', None)
         unsub = getattr(strategy_obj, 'unsub_market_data', None)
 
+        # 合约→交易所解析结果按合约缓存：订阅/退订/重订阅不再逐次解析合约并重建交易所映射
+        exchange_cache = self._instrument_exchange_cache
+
+        def _exchange_of(instrument_id: str) -> str:
+            exchange = exchange_cache.get(instrument_id)
+            if exchange is None:
+                exchange = exchange_cache[instrument_id] = sys.intern(resolve_product_exchange(instrument_id))
+            return exchange
+
         if callable(sub):
             _sub_call_counter = [0]
             def _subscribe(instrument_id: str, data_type: str = 'tick') -> None:
-                exchange = resolve_product_exchange(instrument_id)
+                exchange = _exchange_of(instrument_id)
                 _sub_call_counter[0] += 1
                 suffix = instrument_id[6:] if len(instrument_id) > 6 else ''
                 if _sub_call_counter[0] <= 10 or (exchange == 'SHFE' and ('C' in suffix or 'P' in suffix)):
@@ -235,12 +276,29 @@ class _LifecycleMixin:
 
         if callable(unsub):
             def _unsubscribe(instrument_id: str, data_type: str = 'tick') -> None:
-                exchange = resolve_product_exchange(instrument_id)
+                exchange = _exchange_of(instrument_id)
                 unsub(exchange, instrument_id)
             self.unsubscribe = _unsubscribe
         else:
             self.unsubscribe = None
 
+        # 可选的批量订阅/退订接口（参数为 [(exchange, instrument_id), ...]），不提供时逐合约调用
+        sub_batch = getattr(strategy_obj, 'sub_market_data_batch', None)
+        if callable(sub) and callable(sub_batch):
+            def _subscribe_batch(instrument_ids: List[str]) -> None:
+                sub_batch([(_exchange_of(inst), inst) for inst in instrument_ids])
+            self._subscribe_batch = _subscribe_batch
+        else:
+            self._subscribe_batch = None
+
+        unsub_batch = getattr(strategy_obj, 'unsub_market_data_batch', None)
+        if callable(unsub) and callable(unsub_batch):
+            def _unsubscribe_batch(instrument_ids: List[str]) -> None:
+                unsub_batch([(_exchange_of(inst), inst) for inst in instrument_ids])
+            self._unsubscribe_batch = _unsubscribe_batch
+        else:
+            self._unsubscribe_batch = None
+
         self.get_instrument = getattr(strategy_obj, 'get_instrument', None)
         self._platform_insert_order = _read_param(strategy_obj, 'insert_order') or _read_param(strategy_obj, 'send_order')
         self._platform_cancel_order = _read_param(strategy_obj, 'cancel_order') or _read_param(strategy_obj, 'cancel_order_ref')
@@ -851,6 +909,7 @@ class _LifecycleMixin:
             selected_futures_list = self._init_instruments_result['futures_list']
             selected_options_dict = self._init_instruments_result['options_dict']
             self._subscribed_instruments = self._init_instruments_result['subscribed_instruments']
+            self._instrument_exchange_cache.clear()
             logging.info(
                 f"[Subscribe] 使用on_init结果: "
                 f"{len(selected_futures_list)} 期货, "
@@ -889,9 +948,15 @@ class _LifecycleMixin:
                         self.transition_to(StrategyState.DEGRADED)
                         import weakref as _weakref
                         _self_ref = _weakref.ref(self)
+                        # 线性退避 5s/10s/15s 一次性折算为单调时钟上的绝对截止点，
+                        # 每次只睡到下一个截止点，重试本身的耗时不会累积成漂移
+                        _t0 = time.monotonic()
+                        _retry_deadlines = deque(_t0 + 5.0 * k * (k + 1) / 2 for k in range(1, 4))
                         def _retry_platform_subscribe():
-                            for attempt in range(1, 4):
-                                time.sleep(5.0 * attempt)
+                            attempt = 0
+                            while _retry_deadlines:
+                                attempt += 1
+                                time.sleep(max(0.0, _retry_deadlines.popleft() - time.monotonic()))
                                 _self = _self_ref()
                                 if _self is None:
                                     logging.debug("[Subscribe] 策略已销毁(weakref)，终止重试")
@@ -967,6 +1032,13 @@ class _LifecycleMixin:
             except Exception as e:
                 logging.error(f"[KlineLoadAsync] 后台历史K线加载失败: {e}", exc_info=True)
 
+        # 复用策略独立线程池（常驻、有界、随策略停止统一关闭）；线程池不可用时回退为一次性守护线程
+        try:
+            self._get_strategy_executor().submit(_kline_worker)
+            logging.info("[KlineLoadAsync] 历史K线加载已提交到策略线程池，onStart 不再阻塞")
+            return
+        except RuntimeError as e:  # 线程池已shutdown/无法创建工作线程
+            logging.warning("[KlineLoadAsync] 策略线程池不可用(%s)，回退为独立线程", e)
         threading.Thread(
             target=_kline_worker,
             name=f"kline-load-async[strategy:{self.strategy_id}]",
@@ -974,36 +1046,60 @@ class _LifecycleMixin:
         ).start()
         logging.info("[KlineLoadAsync] 历史K线加载已调度到后台线程，onStart 不再阻塞")
 
+    def _get_strategy_executor(self):
+        """策略独立线程池（停止时关闭，重启后按需重建）"""
+        executor = getattr(self, '_strategy_executor', None)
+        if executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix=f"strat_{self.strategy_id[:12]}"
+            )
+            self._strategy_executor = executor
+        return executor
+
     def _unsubscribe_all_instruments(self) -> None:
-        """停止时取消全部已订阅合约，避免平台继续向本实例推送回调。"""
-        try:
-            self._platform_subscribe_stop.set()
-            if not callable(self.unsubscribe):
-                return
+        """停止时取消全部已订阅合约，避免平台继续向本实例推送回调。
+
+        只对平台调用做逐项/批量保护；其余意外异常交由调用方（on_stop）统一记录。
+        """
+        self._platform_subscribe_stop.set()
+        if not callable(self.unsubscribe):
+            return
 
-            subscribed = list(getattr(self, '_subscribed_instruments', []) or [])
-            if not subscribed:
+        subscribed = list(getattr(self, '_subscribed_instruments', []) or [])
+        if not subscribed:
+            return
+
+        if self._unsubscribe_batch is not None:
+            try:
+                self._unsubscribe_batch(subscribed)
+                logging.info(f"[Unsubscribe] Summary: total={len(subscribed)}, batch=True")
                 return
+            except Exception as e:
+                logging.warning(f"[Unsubscribe] 批量退订失败，回退逐合约退订: {e}")
 
-            success_count = 0
-            failed_count = 0
-            for inst in subscribed:
-                try:
-                    self.unsubscribe(inst)
-                    success_count += 1
-                except Exception:
-                    failed_count += 1
+        success_count = 0
+        failed_count = 0
+        for inst in subscribed:
+            try:
+                self.unsubscribe(inst)
+                success_count += 1
+            except Exception:
+                failed_count += 1
 
-            logging.info(
-                f"[Unsubscribe] Summary: total={len(subscribed)}, success={success_count}, failed={failed_count}"
-            )
-        except Exception as e:
-            logging.error(f"[StrategyCoreService._unsubscribe_all_instruments] Error: {e}", exc_info=True)
+        logging.info(
+            f"[Unsubscribe] Summary: total={len(subscribed)}, success={success_count}, failed={failed_count}"
+        )
 
     def _shutdown_runtime_services(self) -> None:
         """停止运行时后台服务，避免卸载后仍有后台输出。"""
         self._shutdown_historical_services()
 
+        executor = getattr(self, '_strategy_executor', None)
+        if executor is not None:
+            self._strategy_executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
         if self._storage is not None and hasattr(self._storage, '_stop_async_writer'):
             try:
                 self._storage._stop_async_writer()
@@ -1195,13 +1291,6 @@ class _LifecycleMixin:
         strategy_id = _sid
         run_id = getattr(self, '_lifecycle_run_id', 'N/A')
 
-        ALLOWED_PREFIXES = (
-            'Main', 'Thread-', 'APScheduler', 'ThreadPoolExecutor',
-            'Storage-AsyncWriter[shared-service]', 'Storage-Cleanup[shared-service]',
-            'SubAsyncWriter[shared-service]', 'SubRetry[shared-service]', 'SubCleanup[shared-service]',
-            'TTypeService-Preload[shared-service]', 'onStop-worker',
-        )
-
         threads = _threading.enumerate()
         strategy_threads = []
         shared_threads = []
@@ -1211,7 +1300,7 @@ class _LifecycleMixin:
             name = t.name or ''
             if '[shared-service]' in name:
                 shared_threads.append(name)
-            elif any(name.startswith(p) for p in ALLOWED_PREFIXES):
+            elif name.startswith(_SYSTEM_THREAD_PREFIXES):
                 system_threads.append(name)
             elif 'strategy' in name.lower() or strategy_id in name:
                 strategy_threads.append(name)
@@ -13,13 +13,36 @@ strategy_scheduler.py - 策略定时任务管理
 
 from __future__ import annotations
 
+import functools
 import logging
 import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 from typing import Any, Callable, Optional
 
 _CHINA_TZ = timezone(timedelta(hours=8))
 
+_SCHEDULER_CAPABILITIES = ('add_job', 'remove_job', 'get_jobs', 'pause', 'shutdown')
+
+
+def _resolve_capabilities(scheduler: Any) -> SimpleNamespace:
+    """一次性解析调度器能力为绑定方法（不支持的能力为None）"""
+    return SimpleNamespace(**{
+        name: getattr(scheduler, name, None) if scheduler is not None else None
+        for name in _SCHEDULER_CAPABILITIES
+    })
+
+
+@dataclass(slots=True)
+class JobOwner:
+    """P0-3: job的owner元数据（slots记录，较逐job的dict更省内存）"""
+    strategy_id: str
+    run_id: Optional[str]
+    owner_scope: str
+    func_name: str
+
 
 class StrategyScheduler:
     """策略调度器管理器
@@ -36,8 +59,9 @@ class StrategyScheduler:
     
     def __init__(self):
         self._scheduler = None
+        self._caps = _resolve_capabilities(None)  # 调度器能力缓存，避免逐次hasattr探测
         self._state_checker: Optional[Callable[[], bool]] = None
-        self._job_owners: dict[str, dict[str, Any]] = {}  # ✅ P0-3: job -> owner 映射
+        self._job_owners: dict[str, JobOwner] = {}  # ✅ P0-3: job -> owner 映射
         self._job_owners_lock = threading.Lock()  # P0-3: _job_owners 线程安全保护
     
     @property
@@ -73,6 +97,7 @@ class StrategyScheduler:
                 from apscheduler.schedulers.background import BackgroundScheduler
                 self._scheduler = BackgroundScheduler()
                 self._scheduler.start()
+                self._caps = _resolve_capabilities(self._scheduler)
                 logging.info(f"[StrategyScheduler] APScheduler initialized (attempt {attempt})")
                 return  # 成功则返回
             except Exception as e:
@@ -82,7 +107,6 @@ class StrategyScheduler:
                         f"[StrategyScheduler] APScheduler init failed (attempt {attempt}/{max_retries}): {type(e).__name__}: {e}"
                     )
                     logging.info(f"[StrategyScheduler] Retrying in {retry_delay}s...")
-                    import time
                     time.sleep(retry_delay)  # R23-P2-14标记: P2级调度等待
                 else:
                     # 重试耗尽，抛出异常由上层处理
@@ -117,8 +141,8 @@ class StrategyScheduler:
         
         try:
             # ✅ P0-2: Phase 1 - 冻结新任务
-            if wait_for_zero and hasattr(self._scheduler, 'pause'):
-                self._scheduler.pause()
+            if wait_for_zero and self._caps.pause is not None:
+                self._caps.pause()
                 logging.info("[StrategyScheduler] Phase 1: Scheduler paused (no new jobs)")
             
             # ✅ P0-2: Phase 2 - 等待job归零
@@ -133,7 +157,6 @@ class StrategyScheduler:
             # Phase 3 - shutdown
             self._scheduler.shutdown(wait=wait)
             if not wait:
-                import threading
                 for t in threading.enumerate():
                     if t.name and 'APScheduler' in t.name and t.is_alive():
                         t.join(timeout=3.0)
@@ -154,8 +177,8 @@ class StrategyScheduler:
             return True
         
         try:
-            if hasattr(self._scheduler, 'pause'):
-                self._scheduler.pause()
+            if self._caps.pause is not None:
+                self._caps.pause()
                 logging.info("[StrategyScheduler] Scheduler paused (no new jobs will run)")
                 return True
         except Exception as e:
@@ -182,7 +205,7 @@ class StrategyScheduler:
         if not self._scheduler:
             return 0
         try:
-            return len(self._scheduler.get_jobs())
+            return len(self._caps.get_jobs())
         except Exception as e:
             logging.debug(f"[StrategyScheduler] get_registered_job_count error: {e}")
             return 0
@@ -191,8 +214,6 @@ class StrategyScheduler:
         if not self._scheduler:
             return True
         
-        import time
-        
         start_time = time.monotonic()
         check_interval = 0.5
         
@@ -247,7 +268,7 @@ class StrategyScheduler:
         run_id: Optional[str] = None,
         owner_scope: str = "strategy",
         **trigger_args
-    ) -> None:
+    ) -> bool:
         """
         统一的 job 注册方法，自动绑定 owner metadata
         
@@ -259,14 +280,17 @@ class StrategyScheduler:
             run_id: 运行ID（用于追踪）
             owner_scope: owner范围 ('strategy', 'global', 'shared')
             **trigger_args: 触发器参数 (seconds, minutes, hour等)
+
+        Returns:
+            是否注册成功
         """
-        if not self._scheduler:
-            logging.warning("[StrategyScheduler.add_job_with_owner] Scheduler not initialized")
-            return
+        if self._caps.add_job is None:
+            logging.warning("[StrategyScheduler.add_job_with_owner] Scheduler not initialized or does not support add_job")
+            return False
         
         try:
             # 注册 job
-            self._scheduler.add_job(
+            self._caps.add_job(
                 func,
                 trigger,
                 id=job_id,
@@ -276,20 +300,42 @@ class StrategyScheduler:
             
             # 记录 owner metadata（线程安全）
             with self._job_owners_lock:
-                self._job_owners[job_id] = {
-                    'strategy_id': strategy_id,
-                    'run_id': run_id,
-                    'owner_scope': owner_scope,
-                    'func_name': getattr(func, '__name__', str(func))
-                }
+                self._job_owners[job_id] = JobOwner(
+                    strategy_id=strategy_id,
+                    run_id=run_id,
+                    owner_scope=owner_scope,
+                    func_name=getattr(getattr(func, 'func', func), '__name__', str(func)),
+                )
             
             logging.debug(
                 f"[StrategyScheduler] Job registered: {job_id} "
                 f"(owner={strategy_id}, scope={owner_scope})"
             )
+            return True
             
         except Exception as e:
             logging.error(f"[StrategyScheduler.add_job_with_owner] Failed to register job {job_id}: {e}")
+            return False
+
+    def _add_interval_job(
+        self,
+        func: Callable,
+        job_id: str,
+        strategy_id: str = 'GLOBAL',
+        run_id: Optional[str] = None,
+        owner_scope: str = 'global',
+        **interval_args
+    ) -> bool:
+        """注册interval任务：各register_*共用的单一入口，调度器可用性只在add_job_with_owner中检查一次"""
+        return self.add_job_with_owner(
+            func=func,
+            trigger='interval',
+            job_id=job_id,
+            strategy_id=strategy_id,
+            run_id=run_id,
+            owner_scope=owner_scope,
+            **interval_args
+        )
     
     def remove_jobs_by_owner(self, strategy_id: str) -> int:
         """
@@ -308,11 +354,11 @@ class StrategyScheduler:
         with self._job_owners_lock:
             jobs_to_remove = [
                 job_id for job_id, meta in self._job_owners.items()
-                if meta.get('strategy_id') == strategy_id
+                if meta.strategy_id == strategy_id
             ]
             for job_id in jobs_to_remove:
                 try:
-                    self._scheduler.remove_job(job_id)
+                    self._caps.remove_job(job_id)
                     self._job_owners.pop(job_id, None)
                     removed_count += 1
                     logging.debug(f"[StrategyScheduler] Removed job: {job_id} (owner={strategy_id})")
@@ -336,9 +382,15 @@ class StrategyScheduler:
         """
         with self._job_owners_lock:
             return [
-                {'job_id': job_id, **meta}
+                {
+                    'job_id': job_id,
+                    'strategy_id': meta.strategy_id,
+                    'run_id': meta.run_id,
+                    'owner_scope': meta.owner_scope,
+                    'func_name': meta.func_name,
+                }
                 for job_id, meta in self._job_owners.items()
-                if meta.get('strategy_id') == strategy_id
+                if meta.strategy_id == strategy_id
             ]
     
     def verify_jobs_removed(self, strategy_id: str) -> bool:
@@ -380,57 +432,30 @@ class StrategyScheduler:
         """
         try:
             # P0-3修复：job_id 加入 strategy_id 前缀，避免多实例场景下互相覆盖
+            owner = {'strategy_id': strategy_id, 'run_id': run_id, 'owner_scope': 'strategy'}
             # 注册 3 个核心交易 job
-            self.add_job_with_owner(
-                func=execute_option_trading_cycle,
-                trigger='interval',
-                job_id=f'{strategy_id}_option_trading_cycle',
-                strategy_id=strategy_id,
-                run_id=run_id,
-                owner_scope='strategy',
-                seconds=self.DEFAULT_TRADING_INTERVAL_SEC
+            self._add_interval_job(
+                execute_option_trading_cycle, f'{strategy_id}_option_trading_cycle',
+                seconds=self.DEFAULT_TRADING_INTERVAL_SEC, **owner
             )
             
-            self.add_job_with_owner(
-                func=check_position_risk,
-                trigger='interval',
-                job_id=f'{strategy_id}_position_risk_check',
-                strategy_id=strategy_id,
-                run_id=run_id,
-                owner_scope='strategy',
-                seconds=self.DEFAULT_POSITION_CHECK_INTERVAL_SEC
+            self._add_interval_job(
+                check_position_risk, f'{strategy_id}_position_risk_check',
+                seconds=self.DEFAULT_POSITION_CHECK_INTERVAL_SEC, **owner
             )
             
             if order_service and hasattr(order_service, 'check_pending_orders'):
-                self.add_job_with_owner(
-                    func=order_service.check_pending_orders,
-                    trigger='interval',
-                    job_id=f'{strategy_id}_check_pending_orders',
-                    strategy_id=strategy_id,
-                    run_id=run_id,
-                    owner_scope='strategy',
-                    seconds=self.DEFAULT_PENDING_ORDER_INTERVAL_SEC
+                self._add_interval_job(
+                    order_service.check_pending_orders, f'{strategy_id}_check_pending_orders',
+                    seconds=self.DEFAULT_PENDING_ORDER_INTERVAL_SEC, **owner
                 )
 
             if order_service and hasattr(order_service, 'mark_virtual_positions_eod'):
-                def _virtual_pos_eod_job():
-                    try:
-                        if not self._can_run_jobs():
-                            return
-                        from datetime import datetime as _dt
-                        now = _dt.now(_CHINA_TZ)
-                        if now.hour == 15 and 1 <= now.minute <= 10:
-                            order_service.mark_virtual_positions_eod()
-                    except Exception as e:
-                        logging.error(f"[StrategyScheduler] virtual position eod mark failed: {e}")
-                self.add_job_with_owner(
-                    func=_virtual_pos_eod_job,
-                    trigger='interval',
-                    job_id=f'{strategy_id}_virtual_pos_eod_mark',
-                    strategy_id=strategy_id,
-                    run_id=run_id,
-                    owner_scope='strategy',
-                    minutes=1
+                # 预绑定方法，不再每次注册构造闭包
+                self._add_interval_job(
+                    functools.partial(self._run_virtual_pos_eod_mark, order_service),
+                    f'{strategy_id}_virtual_pos_eod_mark',
+                    minutes=1, **owner
                 )
             
             logging.info(
@@ -440,6 +465,17 @@ class StrategyScheduler:
         except Exception as e:
             logging.error(f"[StrategyScheduler] Failed to register trading jobs: {e}")
     
+    def _run_virtual_pos_eod_mark(self, order_service: Any) -> None:
+        """收盘后（15:01-15:10）标记虚拟持仓日终状态，每分钟触发一次。"""
+        try:
+            if not self._can_run_jobs():
+                return
+            now = datetime.now(_CHINA_TZ)
+            if now.hour == 15 and 1 <= now.minute <= 10:
+                order_service.mark_virtual_positions_eod()
+        except Exception as e:
+            logging.error(f"[StrategyScheduler] virtual position eod mark failed: {e}")
+
     def stop_strategy_jobs(self, strategy_id: str) -> int:
         """
         停止策略的所有 job（封装 P0-3 owner 移除 + 验证）
@@ -486,20 +522,10 @@ class StrategyScheduler:
                     logging.error(f"[StrategyScheduler] Option status diagnosis failed: {e}", exc_info=True)
             
             # 添加定时任务：每3分钟执行一次
-            if self._scheduler is not None and hasattr(self._scheduler, 'add_job'):
-                # ✅ P0-3: 使用统一注册方法，标记为全局任务
-                self.add_job_with_owner(
-                    func=_diagnose_job,
-                    trigger='interval',
-                    job_id='option_status_diagnosis',
-                    strategy_id='GLOBAL',
-                    run_id=None,
-                    owner_scope='global',
-                    minutes=self.DEFAULT_DIAGNOSTIC_INTERVAL_MIN
-                )
+            # ✅ P0-3: 使用统一注册方法，标记为全局任务
+            if self._add_interval_job(_diagnose_job, 'option_status_diagnosis',
+                                      minutes=self.DEFAULT_DIAGNOSTIC_INTERVAL_MIN):
                 logging.info(f"[StrategyScheduler] ✅ 期权5种状态诊断任务已添加 (每{self.DEFAULT_DIAGNOSTIC_INTERVAL_MIN}分钟)")
-            else:
-                logging.warning("[StrategyScheduler] Scheduler not available or does not support add_job")
         except Exception as e:
             logging.error(f"[StrategyScheduler] Failed to add option status diagnosis job: {e}", exc_info=True)
     
@@ -575,20 +601,9 @@ class StrategyScheduler:
                     logging.error(f"[StrategyScheduler] Cache flush failed: {e}{retry_info}, WAL not truncated", exc_info=True)
             
             # 添加定时任务：每5分钟检查一次
-            if self._scheduler is not None and hasattr(self._scheduler, 'add_job'):
-                # ✅ P0-3: 使用统一注册方法，标记为全局任务
-                self.add_job_with_owner(
-                    func=_flush_job,
-                    trigger='interval',
-                    job_id='tick_data_sync',
-                    strategy_id='GLOBAL',
-                    run_id=None,
-                    owner_scope='global',
-                    minutes=5
-                )
+            # ✅ P0-3: 使用统一注册方法，标记为全局任务
+            if self._add_interval_job(_flush_job, 'tick_data_sync', minutes=5):
                 logging.info("[StrategyScheduler] 缓存刷写任务已添加 (每5分钟，窗口: 12:00-12:50, 15:30-20:00)")
-            else:
-                logging.warning("[StrategyScheduler] Scheduler not available or does not support add_job")
         except Exception as e:
             logging.error(f"[StrategyScheduler] Failed to add cache flush job: {e}", exc_info=True)
     
@@ -619,20 +634,10 @@ class StrategyScheduler:
                     logging.error(f"[StrategyScheduler] monitored contracts diagnosis failed: {e}", exc_info=True)
             
             # 添加定时任务：每30秒执行一次
-            if self._scheduler is not None and hasattr(self._scheduler, 'add_job'):
-                # ✅ P0-3: 使用统一注册方法，标记为全局任务
-                self.add_job_with_owner(
-                    func=_diagnose_job,
-                    trigger='interval',
-                    job_id='14_contracts_diagnosis',
-                    strategy_id='GLOBAL',
-                    run_id=None,
-                    owner_scope='global',
-                    seconds=self.DEFAULT_DIAGNOSTIC_INTERVAL_SEC
-                )
+            # ✅ P0-3: 使用统一注册方法，标记为全局任务
+            if self._add_interval_job(_diagnose_job, '14_contracts_diagnosis',
+                                      seconds=self.DEFAULT_DIAGNOSTIC_INTERVAL_SEC):
                 logging.info("[StrategyScheduler] ✅ %d合约12环节诊断任务已添加 (每%d秒)", MONITORED_CONTRACT_COUNT, self.DEFAULT_DIAGNOSTIC_INTERVAL_SEC)
-            else:
-                logging.warning("[StrategyScheduler] Scheduler not available or does not support add_job")
         except ImportError as e:
             logging.warning(f"[StrategyScheduler] Cannot import diagnosis_service: {e}")
         except Exception as e:
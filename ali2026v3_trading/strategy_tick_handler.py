@@ -24,6 +24,7 @@ import threading
 import uuid
 import weakref
 import os
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 # P1-R11-12修复: 中国标准时间UTC+8，替代裸datetime.now()，确保交易系统时间判断一致
 _CHINA_TZ = timezone(timedelta(hours=8))
@@ -61,6 +62,21 @@ class TickHandlerMixin:
     MAX_TICK_QUEUE_DEPTH = 1000
     _UNIFIED_TICK_PATH_ENABLED = True
 
+    # 检查层的可选钩子（由HistoricalKlineMixin提供）：组合类创建时按MRO一次解析为函数元组，
+    # 逐tick按元组顺序调用，不再做hasattr反射
+    _TICK_CHECK_HOOK_NAMES = (
+        '_emit_historical_kline_diagnostic_on_first_tick',
+        '_check_and_start_historical_load_on_tick',
+    )
+    _tick_check_hooks: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._tick_check_hooks = tuple(
+            hook for hook in (getattr(cls, name, None) for name in cls._TICK_CHECK_HOOK_NAMES)
+            if callable(hook)
+        )
+
     _TICK_FIELD_NAMES = {
         'instrument_id': ['instrument_id', 'InstrumentID'],
         'exchange': ['exchange', 'ExchangeID'],
@@ -107,7 +123,8 @@ class TickHandlerMixin:
         self._tick_count = 0
 
         # [R23-P2-ID-04-FIX] tick处理去重：同一tick的instrument_id+timestamp在100ms内不重复处理
-        self._tick_dedup_cache: Dict[str, float] = {}
+        # 按到达时间有序：过期条目只会出现在队首，逐tick从队首淘汰，容量只随窗口内tick数增长
+        self._tick_dedup_cache: 'OrderedDict[tuple, float]' = OrderedDict()
         self._tick_dedup_window_ms: float = 100.0
         # [R23-P2-FR-09-FIX] tick数据年龄监控
         self._tick_last_data_time: Dict[str, float] = {}
@@ -284,15 +301,18 @@ class TickHandlerMixin:
             _dedup_inst = self._get_tick_field(tick, 'instrument_id', '')
             _dedup_ts = self._get_tick_field(tick, 'timestamp', '')
             if _dedup_inst and _dedup_ts:
-                _dedup_key = f"{_dedup_inst}_{_dedup_ts}"
+                _dedup_key = (_dedup_inst, _dedup_ts)
                 _dedup_now = time.time()
-                _dedup_last = self._tick_dedup_cache.get(_dedup_key, 0.0)
-                if (_dedup_now - _dedup_last) * 1000 < self._tick_dedup_window_ms:
+                _dedup_cache = self._tick_dedup_cache
+                _cutoff = _dedup_now - self._tick_dedup_window_ms / 1000.0
+                while _dedup_cache:
+                    _oldest = next(iter(_dedup_cache))
+                    if _dedup_cache[_oldest] > _cutoff:
+                        break
+                    del _dedup_cache[_oldest]
+                if _dedup_key in _dedup_cache:
                     return
-                self._tick_dedup_cache[_dedup_key] = _dedup_now
-                if len(self._tick_dedup_cache) > 10000:
-                    _cutoff = _dedup_now - self._tick_dedup_window_ms / 1000.0
-                    self._tick_dedup_cache = {k: v for k, v in self._tick_dedup_cache.items() if v > _cutoff}
+                _dedup_cache[_dedup_key] = _dedup_now
         except Exception as _dedup_err:
             logging.debug("[R22-P1-NEW] tick去重缓存更新失败(可能重复处理): %s", _dedup_err)
         # P0-R11-14修复: 从tick数据提取时间戳赋值_current_bar_time，供硬时间止损使用
@@ -455,11 +475,8 @@ class TickHandlerMixin:
                     self._e2e_counters['dropped_paused'] = self._e2e_counters.get('dropped_paused', 0) + 1
             return False
 
-        if hasattr(self, '_emit_historical_kline_diagnostic_on_first_tick'):
-            self._emit_historical_kline_diagnostic_on_first_tick()
-
-        if hasattr(self, '_check_and_start_historical_load_on_tick'):
-            self._check_and_start_historical_load_on_tick()
+        for hook in self._tick_check_hooks:
+            hook(self)
 
         return True
 
@@ -774,14 +791,15 @@ class TickHandlerMixin:
                 self._tick_debug_last_ts = now_ts
             
             # 2. 如果开启debug_output，每条Tick都记录
-            params_dict = getattr(self, 'params', {})
-            if isinstance(params_dict, dict):
-                debug_output = params_dict.get('debug_output', False)
-            else:
-                debug_output = getattr(params_dict, 'debug_output', False)
-            
-            if debug_output and instrument_id:
-                logging.debug("[Tick] %s.%s price=%s vol=%s", exchange, instrument_id, last_price, volume)
+            # 该日志为DEBUG级：先判日志级别，DEBUG关闭时逐tick不再解析params
+            if instrument_id and logging.root.isEnabledFor(logging.DEBUG):
+                params = getattr(self, 'params', None)
+                if isinstance(params, dict):
+                    debug_output = params.get('debug_output', False)
+                else:
+                    debug_output = getattr(params, 'debug_output', False)
+                if debug_output:
+                    logging.debug("[Tick] %s.%s price=%s vol=%s", exchange, instrument_id, last_price, volume)
             # ===============================================
             
             # ✅ 阶段5.3: 使用SubscriptionManager统一Tick入口
@@ -11,8 +11,10 @@ subscription_manager_v2.py - 企业级订阅管理器 (临时优化版)
 """
 
 import atexit
+import functools
 import json
 import logging
+import operator
 import os
 import random
 import re
@@ -21,7 +23,7 @@ import time
 from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from ali2026v3_trading.serialization_utils import json_dumps
 
 try:
@@ -37,6 +39,7 @@ except ImportError:
     _HAS_MSVCRT = False
 
 from ali2026v3_trading.shared_utils import safe_float, normalize_instrument_id
+from ali2026v3_trading.diagnosis_probe import is_monitored_contract
 
 try:
     import pyarrow as pa
@@ -45,6 +48,8 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_INF = float('inf')
+
 
 def _acquire_file_lock(f):
     """EC-P1-05修复: 跨进程文件锁"""
@@ -116,8 +121,9 @@ def inst_get(inst: Any, *keys: str, default: Any = '') -> Any:
     """兼容 dict / object 两种返回结构读取字段"""
     if isinstance(inst, dict):
         for k in keys:
-            if k in inst and inst.get(k) not in (None, ''):
-                return inst.get(k)
+            val = inst.get(k)
+            if val not in (None, ''):
+                return val
         return default
     for k in keys:
         try:
@@ -130,6 +136,20 @@ def inst_get(inst: Any, *keys: str, default: Any = '') -> Any:
     return default
 
 
+# 各类合约需订阅的数据类型
+_SUBSCRIBE_DATA_TYPES = {'future': ('tick', 'kline_1min'), 'option': ('tick',)}
+
+
+def iter_subscription_targets(futures_list: List[str],
+                              options_dict: Dict[str, List[str]]) -> Iterator[Tuple[str, str]]:
+    """按订阅顺序逐个产出 (instrument_id, 'future'|'option')：先期货，再按标的分组的期权。"""
+    for inst_id in futures_list or ():
+        yield inst_id, 'future'
+    for option_ids in (options_dict or {}).values():
+        for opt_id in option_ids or ():
+            yield opt_id, 'option'
+
+
 # ========== 配置对象 (替代硬编码) ==========
 
 _MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -193,7 +213,8 @@ class SubscriptionManager:
         self._config = config or SubscriptionConfig()
         # R14-P1-LOG-13修复: alert_callback为None时设默认日志回调
         if self._config.alert_callback is None:
-            self._config.alert_callback = lambda count, msg: logging.warning("[SubscriptionManager] 告警: count=%d msg=%s", count, msg)
+            self._config.alert_callback = functools.partial(
+                logging.warning, "[SubscriptionManager] 告警: count=%d msg=%s")
         self.data_manager = data_manager
         
         # 线程安全锁
@@ -257,7 +278,8 @@ class SubscriptionManager:
         self._wal_file = None
         # R13-P2-LOG-08修复: 显式初始化属性，替代hasattr检查
         self._wal_queue: deque = deque(maxlen=10000)
-        self._pending_subscriptions: Dict[str, Any] = {}
+        # data_manager 未绑定期间的待订阅请求：(instrument_id, data_type)
+        self._pending_subscriptions: List[Tuple[str, str]] = []
         self._op_error_circuit: Dict[str, Dict] = {}
         self._async_thread: Optional[threading.Thread] = None
         self._stop_async = threading.Event()
@@ -810,7 +832,7 @@ class SubscriptionManager:
         with self._retry_lock:
             # still_pending是元组列表: (task, count, next_retry_time, enq_time)
             # 按next_retry_time（索引2）排序，最早重试的排前面
-            still_pending_sorted = sorted(still_pending, key=lambda x: x[2])
+            still_pending_sorted = sorted(still_pending, key=operator.itemgetter(2))
             for task_tuple in still_pending_sorted:
                 if len(self._retry_queue) >= self._config.retry_queue_max_size:
                     logger.error("[SubscriptionManagerV2] Retry queue full when returning pending tasks, dropping task")
@@ -838,9 +860,7 @@ class SubscriptionManager:
         # R13-P1-API-02修复: data_manager为None时入队等待，避免bind_platform_apis()前崩溃
         if self.data_manager is None:
             logger.warning("[SubscriptionManagerV2] data_manager未绑定，订阅请求入队等待: %s", instrument_id)
-            if not hasattr(self, '_pending_subscriptions'):
-                self._pending_subscriptions = []
-            self._pending_subscriptions.append({'instrument_id': instrument_id, 'data_type': data_type})
+            self._pending_subscriptions.append((instrument_id, data_type))
             return
         subscribe_method = getattr(self.data_manager, 'subscribe', None)
         if subscribe_method and callable(subscribe_method):
@@ -1057,19 +1077,23 @@ class SubscriptionManager:
         如 'IO2605', 'al2605'，与 ParamsService._extract_canonical_underlying 输出一致。
         """
         futures_list = []
-        options_dict = {}
+        # 逐合约按 (product, year_month) 元组分组，字符串 key 每组只拼一次
+        groups: Dict[Tuple[str, str], List[str]] = {}
         
         for inst_id in instrument_ids:
             try:
                 parsed = SubscriptionManager.parse_option(inst_id)
-                # 统一 key 语义为 product+year_month
-                underlying = f"{parsed['product']}{parsed['year_month']}"
-                if underlying not in options_dict:
-                    options_dict[underlying] = []
-                options_dict[underlying].append(inst_id)
             except ValueError:
                 futures_list.append(inst_id)
-        
+                continue
+            group_key = (parsed['product'], parsed['year_month'])
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = []
+            group.append(inst_id)
+        
+        # 统一 key 语义为 product+year_month
+        options_dict = {product + year_month: ids for (product, year_month), ids in groups.items()}
         return futures_list, options_dict
     
     # ========================================================================
@@ -1139,13 +1163,13 @@ class SubscriptionManager:
         # RES-P2-09: 合约订阅容量检查
         from ali2026v3_trading.config_params import CAPACITY_LIMITS
         _max_instruments = CAPACITY_LIMITS.get('max_instruments', 500)
-        _total_instruments = len(futures_list) + sum(len(opts) for opts in options_dict.values())
-        if _total_instruments >= _max_instruments:
-            logging.warning("[RES-P2-09] 合约订阅已达上限: %d/%d", _total_instruments, _max_instruments)
+        # 合约总数只统计一次，容量检查与订阅统计共用
+        total_count = len(futures_list) + sum(len(opts) for opts in options_dict.values())
+        if total_count >= _max_instruments:
+            logging.warning("[RES-P2-09] 合约订阅已达上限: %d/%d", total_count, _max_instruments)
             return False
 
         started_at = time.perf_counter()
-        total_count = len(futures_list) + sum(len(opts) for opts in options_dict.values())
         self._total_subscriptions = total_count
         self.ensure_background_threads()
         
@@ -1164,63 +1188,35 @@ class SubscriptionManager:
         )
         
         success_count = 0
-        failed_tasks = []
+        # 失败订阅记录：(instrument_id, data_type, error)
+        failed_tasks: List[Tuple[str, str, str]] = []
         
-        # 订阅期货
-        for inst_id in futures_list:
-            try:
-                self._subscribe_single_with_retry(inst_id, 'tick')
-                self._subscribe_single_with_retry(inst_id, 'kline_1min')
-                success_count += 1
-                
-                # ✅ 环节1: 订阅成功探针
-                from ali2026v3_trading.diagnosis_service import DiagnosisProbeManager
-                DiagnosisProbeManager.on_subscribe(inst_id, 'future', True)
-            except Exception as e:
-                logger.error("[SubscriptionManagerV2] Subscribe failed: %s - %s", inst_id, e)
-                failed_tasks.append({
-                    'type': 'subscribe',
-                    'instrument_id': inst_id,
-                    'data_type': 'tick',
-                    'error': str(e)
-                })
-                
-                # ✅ 环节1: 订阅失败探针
-                from ali2026v3_trading.diagnosis_service import DiagnosisProbeManager
-                DiagnosisProbeManager.on_subscribe(inst_id, 'future', False, str(e))
+        # 循环内用到的方法在循环外绑定一次（探针模块也只导入一次）
+        from ali2026v3_trading.diagnosis_service import DiagnosisProbeManager
+        on_subscribe = DiagnosisProbeManager.on_subscribe
+        subscribe = self._subscribe_single_with_retry
+        record_failure = failed_tasks.append
         
-        # 订阅期权
-        for underlying, option_ids in options_dict.items():
-            try:
-                # 握手
-                if option_ids:
-                    logger.debug("[SubscriptionManagerV2] Handshake removed: all subscriptions via _do_subscribe only")
-                
-                # 订阅期权合约
-                for opt_id in option_ids:
-                    try:
-                        self._subscribe_single_with_retry(opt_id, 'tick')
-                        success_count += 1
-                        
-                        # ✅ 环节1: 期权订阅成功探针
-                        from ali2026v3_trading.diagnosis_service import DiagnosisProbeManager
-                        DiagnosisProbeManager.on_subscribe(opt_id, 'option', True)
-                    except Exception as e:
-                        logger.error("[SubscriptionManagerV2] Option subscribe failed: %s - %s", opt_id, e)
-                        failed_tasks.append({
-                            'type': 'subscribe',
-                            'instrument_id': opt_id,
-                            'data_type': 'tick',
-                            'error': str(e)
-                        })
-                        
-                        # ✅ 环节1: 期权订阅失败探针
-                        from ali2026v3_trading.diagnosis_service import DiagnosisProbeManager
-                        DiagnosisProbeManager.on_subscribe(opt_id, 'option', False, str(e))
-            except Exception as e:
-                # R13-P1-API-05修复: 期权批次订阅失败时返回False阻断，而非仅log
-                logger.error("[SubscriptionManagerV2] Option batch failed: %s - %s", underlying, e)
-                return False
+        # 期货与期权共用一个循环：期货订阅 tick + 1分钟K线，期权只订阅 tick
+        try:
+            for inst_id, kind in iter_subscription_targets(futures_list, options_dict):
+                try:
+                    for data_type in _SUBSCRIBE_DATA_TYPES[kind]:
+                        subscribe(inst_id, data_type)
+                    success_count += 1
+                    
+                    # ✅ 环节1: 订阅成功探针
+                    on_subscribe(inst_id, kind, True)
+                except Exception as e:
+                    logger.error("[SubscriptionManagerV2] Subscribe failed (%s): %s - %s", kind, inst_id, e)
+                    record_failure((inst_id, 'tick', str(e)))
+                    
+                    # ✅ 环节1: 订阅失败探针
+                    on_subscribe(inst_id, kind, False, str(e))
+        except Exception as e:
+            # R13-P1-API-05修复: 订阅批次失败时返回False阻断，而非仅log
+            logger.error("[SubscriptionManagerV2] Subscription batch failed: %s", e)
+            return False
         
         # P1 Bug #38修复：累加失败计数，而非覆盖
         self._total_failures += len(failed_tasks)
@@ -1267,7 +1263,7 @@ class SubscriptionManager:
             failed_count = 0
             
             for key, sub_info in list(self._subscriptions.items()):
-                option_ids = sub_info.get('option_ids', [])
+                option_ids = sub_info.get('option_ids') or ()
                 for option_id in option_ids:
                     try:
                         unsubscribe_method = getattr(self.data_manager, 'unsubscribe', None)
@@ -1288,7 +1284,7 @@ class SubscriptionManager:
         """获取订阅统计"""
         with self._lock:
             total_options = sum(
-                len(sub_info.get('option_ids', []))
+                len(sub_info.get('option_ids') or ())
                 for sub_info in self._subscriptions.values()
             )
             
@@ -1317,16 +1313,12 @@ class SubscriptionManager:
             self._tick_dedup_drop_count += 1
             return
         # R24-P0-IV-02修复: volume NaN/Inf/负值过滤
-        import math as _math
-        if not isinstance(volume, (int, float)) or _math.isnan(volume) or _math.isinf(volume) or volume < 0:
+        # 单次链式比较完成校验：NaN 与任何数比较均为 False，+Inf 不小于 _INF
+        if not (isinstance(volume, (int, float)) and 0 <= volume < _INF):
             volume = 0
 
         # R25-P2-IV-ext修复: last_price NaN/Inf/负值过滤（防止绕过_process_tick直接调用时源头污染）
-        if (not isinstance(last_price, (int, float))
-                or _math.isnan(last_price) or _math.isinf(last_price) or last_price <= 0):
-            return
-
-        if not instrument_id or last_price in (None, ''):
+        if not (isinstance(last_price, (int, float)) and 0 < last_price < _INF) or not instrument_id:
             return
         
         # R15-P0-PERF-01修复: 使用分片锁替代全局_tick_lock
@@ -1360,9 +1352,9 @@ class SubscriptionManager:
         """on_tick内部实现（在_tick_lock内执行）"""
         normalized_id = self._strip_exchange_prefix(str(instrument_id).strip())
         
+        # 诊断开关（带TTL缓存）在模块导入时绑定，逐tick不再执行 import 语句；关闭时跳过汇总块
         diag_on = False
         try:
-            from ali2026v3_trading.diagnosis_service import is_monitored_contract
             diag_on = is_monitored_contract(normalized_id)
         except Exception:
             logger.debug("[SubscriptionManagerV2] Failed to check monitored contract for %s", normalized_id)  # R13-P2-LOG-01修复
@@ -1388,7 +1380,7 @@ class SubscriptionManager:
                 if not meta and normalized_id != instrument_id:
                     meta = ps.get_instrument_meta_by_id(instrument_id)
                 if meta:
-                    inst_type = meta.get('type', '')
+                    inst_type = meta.get('type')
                     internal_id = meta.get('internal_id')
                     # ✅ P0修复：原子引用t_type_service，避免并发替换导致None引用
                     tts = self.t_type_service
@@ -1474,12 +1466,10 @@ class SubscriptionManager:
         """记录订阅合约列表（分母）"""
         with self._subscription_success_lock:
             now = time.time()
-            products = set()
-            for inst_id in instrument_ids:
-                self._subscription_success['subscribe_time'][inst_id] = now
-                product = self._extract_product(inst_id)
-                if product:
-                    products.add(product)
+            # 订阅时间与品种集合整批构建
+            self._subscription_success['subscribe_time'].update(dict.fromkeys(instrument_ids, now))
+            extract = self._extract_product
+            products = {product for product in map(extract, instrument_ids) if product}
             self._subscription_success['total_subscribed'] = len(instrument_ids)
             self._subscription_success['subscribed_products'] = products
             self._subscription_success['total_products'] = len(products)
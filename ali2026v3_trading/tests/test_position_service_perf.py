@@ -0,0 +1,331 @@
+"""
+PositionService热路径/落盘优化回归测试
+"""
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import ali2026v3_trading.risk_service  # noqa: F401  先导入risk_service避免循环导入
+
+
+class _FakeRiskService:
+    def __init__(self):
+        self._position_limits = {}
+
+    def set_position_limit(self, account_id, limit_amount, effective_until):
+        self._position_limits[account_id] = {
+            'limit_amount': limit_amount, 'effective_until': effective_until,
+        }
+
+
+@pytest.fixture
+def make_service(tmp_path, monkeypatch):
+    """构造真实PositionService：限额/持仓状态文件与相对路径日志隔离到tmp_path，
+    不加载外部配置/持仓状态，不向config_params/全局事件总线注册回调（避免实例被全局对象持有）"""
+    from ali2026v3_trading import config_params, event_bus
+    from ali2026v3_trading.position_service import PositionService
+    monkeypatch.chdir(tmp_path)
+    load_position_configs = PositionService._load_position_configs
+    monkeypatch.setattr(PositionService, '_load_position_configs', lambda self: None)
+    monkeypatch.setattr(PositionService, '_recover_position_state', lambda self: None)
+    monkeypatch.setattr(config_params, 'register_param_change_callback', lambda callback: None)
+    monkeypatch.setattr(event_bus, 'get_global_event_bus', lambda: None)
+
+    def _make(risk_service=None, load_configs=False):
+        svc = PositionService(risk_service=risk_service)
+        svc.config_file = str(tmp_path / 'option_buy_limits.json')
+        svc._position_state_file = str(tmp_path / 'position_state.jsonl')
+        if load_configs:
+            load_position_configs(svc)
+        return svc
+    return _make
+
+
+@pytest.fixture
+def service(make_service):
+    return make_service()
+
+
+@pytest.fixture
+def config_service(make_service):
+    return make_service(risk_service=_FakeRiskService())
+
+
+def _record(volume, sp=0.0, sl=0.0, position_id='p1'):
+    from datetime import datetime, date
+    from ali2026v3_trading.position_service import PositionRecord
+    return PositionRecord(
+        position_id=position_id, instrument_id='cu2606', exchange='SHFE', volume=volume,
+        direction='long' if volume > 0 else 'short', open_price=100.0,
+        open_time=datetime.now(), open_date=date.today(), position_type='long',
+        stop_profit_price=sp, stop_loss_price=sl,
+    )
+
+
+class TestPositionConfigPersistence:
+    """限额配置落盘：内容不变跳过写入、去抖批量写入"""
+
+    def test_unchanged_config_skips_write(self, config_service):
+        svc = config_service
+        svc._risk_service.set_position_limit('acc', 100.0, None)
+        svc._save_position_configs()
+        mtime = os.stat(svc.config_file).st_mtime_ns
+        os.utime(svc.config_file, ns=(0, 0))
+        svc._save_position_configs()
+        assert os.stat(svc.config_file).st_mtime_ns == 0
+        assert mtime != 0
+
+    def test_changed_config_rewrites(self, config_service):
+        import json
+        svc = config_service
+        svc._risk_service.set_position_limit('acc', 100.0, None)
+        svc._save_position_configs()
+        svc._risk_service.set_position_limit('acc', 200.0, None)
+        svc._save_position_configs()
+        with open(svc.config_file, encoding='utf-8') as f:
+            assert json.load(f)['acc']['limit_amount'] == 200.0
+        assert not os.path.exists(svc.config_file + '.tmp')
+
+    def test_debounced_changes_flush_once(self, config_service):
+        svc = config_service
+        svc.CONFIG_SAVE_DEBOUNCE_SEC = 60.0
+        for amount in (1.0, 2.0, 3.0):
+            assert svc.set_position_limit('acc', amount)
+        assert not os.path.exists(svc.config_file)
+        assert svc._config_dirty_count == 3
+        svc._flush_position_configs()
+        assert os.path.exists(svc.config_file)
+        assert svc._config_dirty_count == 0
+        assert svc not in type(svc)._config_flush_due
+
+    def test_force_flush_at_threshold(self, config_service):
+        svc = config_service
+        svc.CONFIG_SAVE_DEBOUNCE_SEC = 60.0
+        svc.CONFIG_SAVE_FORCE_FLUSH_COUNT = 2
+        svc.set_position_limit('acc', 1.0)
+        assert not os.path.exists(svc.config_file)
+        svc.set_position_limit('acc', 2.0)
+        assert os.path.exists(svc.config_file)
+
+    def test_debounce_shares_one_thread_and_holds_no_strong_ref(self, make_service):
+        import gc
+        import weakref
+        svc = make_service(risk_service=_FakeRiskService())
+        svc.CONFIG_SAVE_DEBOUNCE_SEC = 60.0
+        svc.set_position_limit('acc', 1.0)
+        threads = threading.active_count()
+        for amount in (2.0, 3.0, 4.0):
+            svc.set_position_limit('acc', amount)
+        assert threading.active_count() == threads
+        ref = weakref.ref(svc)
+        del svc
+        gc.collect()
+        assert ref() is None
+
+    def test_debounced_write_lands_and_is_loaded_back(self, make_service):
+        from unittest.mock import patch
+        from types import SimpleNamespace
+        svc = make_service(risk_service=_FakeRiskService())
+        svc.CONFIG_SAVE_DEBOUNCE_SEC = 0.01
+        svc.set_position_limit('acc', 5.0)
+        deadline = time.monotonic() + 2
+        while not os.path.exists(svc.config_file):
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+        with patch('ali2026v3_trading.config_service.get_config',
+                   return_value=SimpleNamespace(option_buy_limits={'acc': {'limit_amount': 1.0, 'account_id': 'acc'}})):
+            loaded = make_service(risk_service=_FakeRiskService(), load_configs=True)
+        assert loaded._risk_service._position_limits['acc']['limit_amount'] == 5.0
+
+
+class TestCachedNow:
+    """时间戳缓存：调用方传入的now/today贯穿使用"""
+
+    def test_calc_days_to_expiry_uses_given_today(self):
+        from datetime import date
+        from ali2026v3_trading.position_service import PositionService
+        # 2026年6月第三个星期五为6月19日
+        assert PositionService._calc_days_to_expiry('IO2606-C-3900', date(2026, 6, 1)) == 18
+        assert PositionService._calc_days_to_expiry('IO2606-C-3900', date(2026, 6, 19)) == 0
+
+
+class TestFieldExtractor:
+    """成交/行情字段提取器缓存：与逐字段_get_platform_attr语义一致"""
+
+    def test_snake_and_camel_case_types(self, service):
+        from types import SimpleNamespace
+        from ali2026v3_trading.position_service import PositionService
+        svc = service
+
+        class CamelTrade:
+            __slots__ = ('InstrumentID', 'ExchangeID', 'Direction', 'OffsetFlag', 'Price', 'Volume', 'OrderID')
+
+            def __init__(self):
+                self.InstrumentID, self.ExchangeID = 'cu2606', 'SHFE'
+                self.Direction, self.OffsetFlag = '0', '1'
+                self.Price, self.Volume, self.OrderID = 100.0, 2, 'o1'
+
+        for _ in range(2):
+            assert svc._extract_fields(CamelTrade(), PositionService._TRADE_FIELDS,
+                                       PositionService._TRADE_DEFAULTS) == \
+                ('cu2606', 'SHFE', '0', '1', 100.0, 2, 'o1')
+        tick = SimpleNamespace(LastPrice=3.5, instrument_id='IO2606-C-3900')
+        assert svc._extract_fields(tick, PositionService._TICK_FIELDS,
+                                   PositionService._TICK_DEFAULTS) == (3.5, 'IO2606-C-3900')
+
+    def test_empty_primary_falls_back_and_missing_attr_recovers(self, service):
+        from types import SimpleNamespace
+        from ali2026v3_trading.position_service import PositionService
+        svc = service
+        fields, defaults = PositionService._TICK_FIELDS, PositionService._TICK_DEFAULTS
+        first = SimpleNamespace(last_price=None, price=7.0, instrument_id='a')
+        assert svc._extract_fields(first, fields, defaults) == (7.0, 'a')
+        # 同类型实例缺少样本探测到的属性时退回逐字段查找
+        second = SimpleNamespace(LastPrice=8.0, InstrumentID='b')
+        assert svc._extract_fields(second, fields, defaults) == (8.0, 'b')
+
+
+class TestDirSign:
+    """方向符号：开仓时由volume确定，止盈止损按(价差×方向符号)判断"""
+
+    def test_dir_sign_from_volume(self):
+        assert _record(2).dir_sign == 1
+        assert _record(-3).dir_sign == -1
+
+    def test_stop_profit_and_loss_long_short(self, service):
+        svc = service
+        svc.closed = []
+        svc._trigger_close_position = lambda rec, reason, price=0.0: svc.closed.append(reason)
+        svc._check_stop_profit(_record(1, sp=110.0), 110.0)
+        svc._check_stop_profit(_record(1, sp=110.0), 109.0)
+        svc._check_stop_profit(_record(-1, sp=90.0), 90.0)
+        svc._check_stop_profit(_record(-1, sp=90.0), 91.0)
+        svc._check_stop_loss(_record(1, sl=95.0), 95.0)
+        svc._check_stop_loss(_record(1, sl=95.0), 96.0)
+        svc._check_stop_loss(_record(-1, sl=105.0), 105.0)
+        svc._check_stop_loss(_record(-1, sl=105.0), 104.0)
+        assert svc.closed == ['StopProfit@110.00', 'StopProfit@90.00', 'StopLoss@95.00', 'StopLoss@105.00']
+
+
+class TestBatchClose:
+    """批量平仓：同(交易所, 合约, 方向)的多笔持仓合并为一笔委托"""
+
+    @pytest.fixture
+    def batch(self, service):
+        """返回(服务, 订单服务桩)构造器：平仓价固定，逐笔平仓只记录position_id"""
+        def _make(send_result='oid'):
+            from unittest.mock import MagicMock
+            svc = service
+            svc.network_retry_manager = None
+            svc._resolve_close_price = lambda inst, direction, current_price=0.0: 100.0
+            svc.single = []
+            svc._trigger_close_position = lambda rec, reason, price=0.0: svc.single.append(rec.position_id)
+            order_svc = MagicMock()
+            order_svc.send_order.return_value = send_result
+            return svc, order_svc
+        return _make
+
+    def test_bucket_merged_into_one_order(self, batch):
+        from unittest.mock import patch
+        svc, order_svc = batch()
+        recs = [_record(v) for v in (2, 3)]
+        with patch('ali2026v3_trading.order_service.get_order_service', return_value=order_svc):
+            svc._batch_close_positions({('SHFE', 'cu2606', 'SELL'): recs}, 'EOD_Close')
+        order_svc.send_order.assert_called_once()
+        assert order_svc.send_order.call_args.kwargs['volume'] == 5
+        assert all(rec._closing for rec in recs)
+        assert svc.single == []
+
+    def test_failed_batch_falls_back_to_single(self, batch):
+        from unittest.mock import patch
+        svc, order_svc = batch(send_result=None)
+        recs = [_record(v) for v in (2, 3)]
+        with patch('ali2026v3_trading.order_service.get_order_service', return_value=order_svc):
+            svc._batch_close_positions({('SHFE', 'cu2606', 'SELL'): recs}, 'EOD_Close')
+        assert svc.single == ['p1', 'p1']
+
+    def test_signal_id_kept_and_mixed_signals_not_merged(self, batch):
+        from unittest.mock import patch
+        from ali2026v3_trading.position_service import PositionRecord
+
+        class _SignalRecord(PositionRecord):
+            pass
+
+        from datetime import datetime, date
+        recs = []
+        for pid, signal_id in (('a', 'S1'), ('b', 'S1'), ('c', 'S2')):
+            rec = _SignalRecord(pid, 'cu2606', 'SHFE', 1, 'long', 100.0, datetime.now(), date.today(), 'long')
+            rec.signal_id = signal_id
+            recs.append(rec)
+        svc, order_svc = batch()
+        with patch('ali2026v3_trading.order_service.get_order_service', return_value=order_svc):
+            svc._batch_close_positions({('SHFE', 'cu2606', 'SELL'): recs}, 'EOD_Close')
+        order_svc.send_order.assert_called_once()
+        assert order_svc.send_order.call_args.kwargs['signal_id'] == 'S1'
+        assert svc.single == ['c']
+
+
+class TestFutureRoot:
+    """标的期货倒排索引键：品种+月份前缀"""
+
+    def test_future_root_formats(self):
+        from ali2026v3_trading.position_service import _future_root
+        assert _future_root('IO2606-C-3900') == 'IO2606'
+        assert _future_root('CU2603C5000') == 'CU2603'
+        assert _future_root('cu2606') == 'cu2606'
+        assert _future_root('SHFE.cu2606') == 'cu2606'
+
+
+class TestLimitDeadline:
+    """限额有效期：创建时换算为monotonic_ns截止时刻"""
+
+    def test_is_valid_against_monotonic_deadline(self):
+        from datetime import datetime, timedelta, timezone
+        from ali2026v3_trading.position_service import PositionLimitConfig
+        tz = timezone(timedelta(hours=8))
+        assert PositionLimitConfig(100.0, 'acc').is_valid()
+        assert PositionLimitConfig(100.0, 'acc', effective_until=datetime.now(tz) + timedelta(hours=1)).is_valid()
+        assert not PositionLimitConfig(100.0, 'acc', effective_until=datetime.now(tz) - timedelta(seconds=1)).is_valid()
+        assert not PositionLimitConfig(0.0, 'acc').is_valid()
+
+
+class TestTickInterestFilter:
+    """on_tick快速路径：无持仓合约不进入持仓检查"""
+
+    def test_only_interested_instruments_checked(self, service):
+        from types import SimpleNamespace
+        svc = service
+        svc._interest_set = frozenset({'cu2606'})
+        checked = []
+        svc._check_positions_on_tick = lambda inst_id, price: checked.append((inst_id, price))
+        svc.on_tick(SimpleNamespace(last_price=10.0, instrument_id='rb2610'))
+        svc.on_tick(SimpleNamespace(last_price=11.0, instrument_id='cu2606'))
+        assert checked == [('cu2606', 11.0)]
+
+
+class TestLockFreeReaders:
+    """只读查询不加锁：基于GIL原子快照"""
+
+    @pytest.fixture
+    def svc(self, service):
+        service.positions = {'cu2606': {'p1': _record(3), 'p2': _record(-1, position_id='p2')}, 'rb2610': {}}
+        return service
+
+    def test_net_position_and_has_position(self, svc):
+        assert svc.get_net_position('cu2606') == 2
+        assert svc.get_net_position('rb2610') == 0
+        assert svc.has_position('cu2606')
+        assert not svc.has_position('rb2610')
+        assert not svc.has_position('al2606', check_nonzero=False)
+
+    def test_position_info_and_status(self, svc):
+        info = svc.get_position_info()
+        assert [row['方向'] for row in info] == ['多头', '空头']
+        from datetime import date
+        assert info[0]['开仓日期'] == date.today().strftime('%Y-%m-%d')
+        assert svc.get_status() == 'PositionService: Tracking 2 instruments, 2 positions, 0 limits'
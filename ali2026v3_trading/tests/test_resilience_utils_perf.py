@@ -0,0 +1,39 @@
+"""
+Watchdog共享调度线程回归测试
+"""
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+class TestWatchdogDispatcher:
+    """共享调度线程：单个超时回调阻塞不影响其他看门狗"""
+
+    def test_blocking_callback_does_not_delay_other_watchdog(self):
+        from ali2026v3_trading.resilience_utils import Watchdog
+        release = threading.Event()
+        blocked_calls, fast_calls = [], []
+
+        def _blocking():
+            blocked_calls.append(1)
+            release.wait(5)
+
+        slow = Watchdog(timeout_sec=0.1, on_timeout=_blocking, name='slow')
+        fast = Watchdog(timeout_sec=0.1, on_timeout=lambda: fast_calls.append(1), name='fast')
+        slow.start()
+        fast.start()
+        try:
+            deadline = time.monotonic() + 2
+            while len(fast_calls) < 3:
+                assert time.monotonic() < deadline, 'fast watchdog starved'
+                time.sleep(0.01)
+            # 阻塞中的回调不重复提交
+            assert blocked_calls == [1]
+            assert slow.timeout_count >= 2
+        finally:
+            release.set()
+            slow.stop()
+            fast.stop()
@@ -0,0 +1,382 @@
+"""
+SchedulerService调度主循环优化回归测试
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def _make_scheduler():
+    from ali2026v3_trading.scheduler_service import SchedulerService
+    return SchedulerService(logger_func=lambda msg: None)
+
+
+class TestDeadlineHeap:
+    """到期堆：只弹出到期任务，失效条目被丢弃"""
+
+    def test_pop_only_due_and_skip_stale(self):
+        sched = _make_scheduler()
+        sched.add_job(lambda: None, interval=60, job_id='a')
+        sched.add_job(lambda: None, interval=60, job_id='b')
+        sched.remove_job('b')
+        sched.add_job(lambda: None, interval=60, job_id='b')
+        now = time.monotonic()
+        with sched._lock:
+            due, _ = sched._pop_due_jobs(now)
+            assert sorted(j.job_id for j in due) == ['a', 'b']
+            assert sched._pop_due_jobs(now) == ([], [])
+            sched._schedule('a', now + 60)
+            assert sched._pop_due_jobs(now) == ([], [])
+
+    def test_paused_job_parked_until_resume(self):
+        sched = _make_scheduler()
+        sched.add_job(lambda: None, interval=60, job_id='a')
+        sched.pause_job('a')
+        with sched._lock:
+            assert sched._pop_due_jobs(time.monotonic()) == ([], [])
+        assert 'a' not in sched._due_at
+        sched.resume_job('a')
+        with sched._lock:
+            assert [j.job_id for j in sched._pop_due_jobs(time.monotonic())[0]] == ['a']
+
+    def test_idle_loop_stops_promptly(self):
+        sched = _make_scheduler()
+        sched.add_job(lambda: None, interval=3600, job_id='a')
+        with sched._lock:
+            sched._pop_due_jobs(time.monotonic())
+            sched._schedule('a', time.monotonic() + 3600)
+        sched.start()
+        time.sleep(0.05)
+        t0 = time.monotonic()
+        sched.stop()
+        assert time.monotonic() - t0 < 0.5
+        assert not sched._thread.is_alive()
+
+    def test_wakes_on_deadline_without_idle_polling(self):
+        import threading
+        sched = _make_scheduler()
+        fired = []
+        done = threading.Event()
+        waits = []
+        real_wait = sched._cond.wait
+
+        def _counting_wait(timeout=None):
+            waits.append(timeout)
+            return real_wait(timeout)
+
+        sched._cond.wait = _counting_wait
+        sched.start()
+        try:
+            time.sleep(0.05)
+            assert waits == [None]
+            t0 = time.monotonic()
+            sched.add_once_job(lambda: (fired.append(time.monotonic()), done.set()), delay=0.2, job_id='o')
+            assert done.wait(2)
+            assert 0.2 <= fired[0] - t0 < 0.25
+            assert len(waits) <= 4
+        finally:
+            sched.stop()
+
+    def test_stop_interrupts_error_backoff(self):
+        sched = _make_scheduler()
+        entered = []
+
+        def _broken(now):
+            entered.append(now)
+            raise RuntimeError('boom')
+
+        sched._pop_due_jobs = _broken
+        sched.add_job(lambda: None, interval=60, job_id='a')
+        sched.start()
+        while not entered:
+            time.sleep(0.01)
+        t0 = time.monotonic()
+        sched.stop()
+        assert time.monotonic() - t0 < 0.5
+        assert not sched._thread.is_alive()
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'condition not reached'
+        time.sleep(0.005)
+
+
+def _dispatch(sched, jobs, now=None):
+    with sched._lock:
+        sched._run_due_jobs(jobs, time.monotonic() if now is None else now)
+
+
+class TestWorkerPool:
+    """任务在常驻线程池中执行；上次未完成时跳过"""
+
+    def test_jobs_reuse_pool_threads(self):
+        import threading
+        sched = _make_scheduler()
+        names = []
+        job = sched.get_job(sched.add_job(
+            lambda: names.append(threading.current_thread().name), interval=60, job_id='a'))
+        for i in range(3):
+            _dispatch(sched, [job])
+            _wait_until(lambda: job.run_count == i + 1)
+        assert len(names) == 3 and all(n.startswith('JobWorker') for n in names)
+        assert len(set(names)) <= sched._max_workers
+        sched.stop()
+        assert sched._pool is None
+
+    def test_overlap_skipped_while_previous_running(self):
+        import threading
+        sched = _make_scheduler()
+        release = threading.Event()
+        calls = []
+
+        def _slow():
+            calls.append(1)
+            release.wait(5)
+
+        sched.add_job(_slow, interval=60, job_id='a', timeout=1.0)
+        job = sched.get_job('a')
+        sched._task_timeout_sec = 0.05
+        _dispatch(sched, [job])
+        _wait_until(lambda: calls)
+        with sched._lock:
+            sched._pop_due_jobs(time.monotonic() + 1)
+        assert 'timeout' in job.last_error
+        _dispatch(sched, [job])
+        assert calls == [1]
+        stuck = sched._active_futures['a']
+        release.set()
+        stuck.result(timeout=5)
+        _wait_until(lambda: 'a' not in sched._active_futures)
+        _dispatch(sched, [job])
+        _wait_until(lambda: job.run_count == 1)
+        assert len(calls) == 2 and job.last_error is None
+        assert sched._active_futures == {} and sched._pending_runs == {}
+        sched.stop()
+
+
+class TestBatchDispatch:
+    """同批到期任务并发执行，完成回调记账并重新入堆"""
+
+    def test_batch_runs_concurrently_and_reschedules(self):
+        import threading
+        sched = _make_scheduler()
+        barrier = threading.Barrier(2, timeout=2)
+        sched.add_job(barrier.wait, interval=60, job_id='a')
+        sched.add_job(barrier.wait, interval=30, job_id='b')
+        now = time.monotonic()
+        with sched._lock:
+            jobs, _ = sched._pop_due_jobs(now)
+            sched._run_due_jobs(jobs, now)
+        _wait_until(lambda: len(sched._due_at) == 2)
+        assert [(j.run_count, j.last_error) for j in jobs] == [(1, None), (1, None)]
+        from ali2026v3_trading.scheduler_service import _next_slot
+        assert sched._due_at == {j.job_id: _next_slot(j.due, now, j.interval) for j in jobs}
+        sched.stop()
+
+    def test_next_slot_aligns_deadlines(self):
+        from ali2026v3_trading.scheduler_service import _next_slot
+        # 按计划到期时刻推算：派发略晚于边界不跳过周期
+        assert _next_slot(180.0, 180.0003, 60) == 240.0
+        assert _next_slot(180.0, 180.0, 60) == 240.0
+        # 未对齐的首次运行：对齐到边界且至少间隔一个周期
+        assert _next_slot(100.0, 100.0, 60) == 180.0
+        assert _next_slot(100.4, 100.4, 30) == _next_slot(100.0, 100.0, 30) == 150.0
+        assert _next_slot(119.9, 119.9, 60) % 30 == 0
+        # 积压：取now之后第一个边界，不补跑
+        assert _next_slot(180.0, 250.0, 60) == 300.0
+        # 浮点边界不多进一格
+        assert abs(_next_slot(0.1 * 3, 0.3, 0.1) - 0.4) < 1e-9
+
+    def test_run_just_before_boundary_waits_full_interval(self):
+        sched = _make_scheduler()
+        job = sched.get_job(sched.add_job(lambda: None, interval=2, job_id='a'))
+        due = (time.monotonic() // 2 + 2) * 2 - 0.05
+        with sched._lock:
+            sched._pop_due_jobs(time.monotonic())
+            sched._schedule('a', due)
+            assert sched._pop_due_jobs(due)[0] == [job]
+        _dispatch(sched, [job], due)
+        _wait_until(lambda: 'a' in sched._due_at)
+        assert sched._due_at['a'] - due >= 2
+        assert sched._due_at['a'] % 2 == 0
+        sched.stop()
+
+    def test_short_interval_job_runs_once_per_interval(self):
+        import threading
+        sched = _make_scheduler()
+        runs = []
+        done = threading.Event()
+
+        def _tick():
+            runs.append(time.monotonic())
+            if len(runs) >= 5:
+                done.set()
+
+        sched._min_interval = 0.2
+        sched.add_job(_tick, interval=0.2, job_id='a')
+        sched.start()
+        try:
+            assert done.wait(3)
+        finally:
+            sched.stop()
+        gaps = [b - a for a, b in zip(runs[1:], runs[2:5])]
+        assert all(0.15 < gap < 0.3 for gap in gaps), gaps
+
+    def test_same_deadline_pops_by_priority(self):
+        sched = _make_scheduler()
+        for job_id, priority in (('low', 1), ('high', 9), ('mid', 5), ('mid2', 5)):
+            sched.add_job(lambda: None, interval=60, job_id=job_id, priority=priority)
+        due = time.monotonic()
+        with sched._lock:
+            for job_id in ('low', 'high', 'mid', 'mid2'):
+                sched._schedule(job_id, due)
+            jobs, _ = sched._pop_due_jobs(due)
+        assert [j.job_id for j in jobs] == ['high', 'mid', 'mid2', 'low']
+
+    def test_blocking_job_does_not_stall_loop(self):
+        import threading
+        sched = _make_scheduler()
+        release = threading.Event()
+        fast = threading.Event()
+        sched.add_job(lambda: release.wait(5), interval=60, job_id='slow', priority=9)
+        sched.start()
+        try:
+            time.sleep(0.05)
+            sched.add_once_job(fast.set, delay=0.0, job_id='fast')
+            assert fast.wait(1)
+        finally:
+            release.set()
+            sched.stop()
+
+
+class TestOnceJobs:
+    """一次性任务：登记到调度堆，等待期间不占用线程"""
+
+    def test_once_job_runs_without_waiting_thread(self):
+        import threading
+        sched = _make_scheduler()
+        done = threading.Event()
+        sched.start()
+        try:
+            threads_before = threading.active_count()
+            sched.add_once_job(done.set, delay=0.1, job_id='o1')
+            assert threading.active_count() == threads_before
+            assert sched.add_once_job(done.set, delay=0.1, job_id='o1') is None
+            assert done.wait(2)
+            time.sleep(0.05)
+            assert 'o1' not in sched._once_jobs
+        finally:
+            sched.stop()
+
+    def test_cancelled_once_job_never_runs(self):
+        sched = _make_scheduler()
+        calls = []
+        sched.add_once_job(lambda: calls.append(1), delay=0.0, job_id='o2')
+        assert sched.cancel_job('o2')
+        assert 'o2' not in sched._once_jobs
+        with sched._lock:
+            assert sched._pop_due_jobs(time.monotonic()) == ([], [])
+        assert calls == []
+
+
+class TestStuckJobLog:
+    """卡住任务的跳过告警按固定间隔输出"""
+
+    def test_stuck_warning_throttled(self, caplog):
+        import logging
+        import threading
+        sched = _make_scheduler()
+        release = threading.Event()
+        sched.add_job(lambda: release.wait(5), interval=60, job_id='a')
+        job = sched.get_job('a')
+        now = time.monotonic()
+        with sched._lock:
+            sched._submit_job(job, now)
+            with caplog.at_level(logging.WARNING):
+                for offset in (0.0, 1.0, 30.0, 61.0):
+                    assert sched._submit_job(job, now + offset) is None
+        assert caplog.text.count('仍在执行中') == 2
+        release.set()
+        sched.stop()
+
+
+class TestJobErrorLog:
+    """任务异常：出锁后输出，堆栈按任务限频"""
+
+    def test_traceback_rate_limited(self, caplog):
+        import logging
+        sched = _make_scheduler()
+
+        def _boom():
+            raise ValueError('bad')
+
+        job = sched.get_job(sched.add_job(_boom, interval=60, job_id='a'))
+        with caplog.at_level(logging.ERROR):
+            for i in range(3):
+                _dispatch(sched, [job])
+                _wait_until(lambda: len(caplog.records) == i + 1)
+        assert [r.exc_info is not None for r in caplog.records] == [True, False, False]
+        assert all('bad' in r.getMessage() for r in caplog.records)
+        assert job.last_error == 'bad' and job.status.name == 'FAILED'
+        sched.stop()
+
+
+class TestLogPath:
+    """日志输出：自定义日志函数出错后降级，不再重复调用"""
+
+    def test_failing_logger_demoted_once(self):
+        from ali2026v3_trading.scheduler_service import SchedulerService, _scheduler_logger
+        calls = []
+
+        def _bad(msg):
+            calls.append(msg)
+            raise IOError('closed')
+
+        sched = SchedulerService(logger_func=_bad)
+        sched._log('a')
+        sched._log('b')
+        assert calls == ['a']
+        assert sched._logger == _scheduler_logger.info
+
+
+class TestStrategySchedulerRegistration:
+    """StrategyScheduler：各register_*经单一入口注册，调度器不可用时直接返回"""
+
+    def test_single_entry_registration(self):
+        from unittest.mock import MagicMock
+        from ali2026v3_trading.strategy_scheduler import StrategyScheduler, _resolve_capabilities
+        mgr = StrategyScheduler()
+        assert mgr._add_interval_job(lambda: None, 'x', seconds=1) is False
+        backend = MagicMock()
+        mgr._scheduler, mgr._caps = backend, _resolve_capabilities(backend)
+        mgr.register_trading_jobs('S1', 'r1', lambda: None, lambda: None, None)
+        mgr.register_option_diagnosis_task(MagicMock())
+        assert [c.kwargs['id'] for c in backend.add_job.call_args_list] == [
+            'S1_option_trading_cycle', 'S1_position_risk_check', 'option_status_diagnosis']
+        assert mgr._job_owners['S1_position_risk_check'].owner_scope == 'strategy'
+        assert mgr._job_owners['option_status_diagnosis'].strategy_id == 'GLOBAL'
+        assert not hasattr(mgr._job_owners['option_status_diagnosis'], '__dict__')
+        assert mgr.get_jobs_by_owner('S1')[0] == {
+            'job_id': 'S1_option_trading_cycle', 'strategy_id': 'S1', 'run_id': 'r1',
+            'owner_scope': 'strategy', 'func_name': '<lambda>'}
+        assert mgr.remove_jobs_by_owner('S1') == 2
+        assert mgr.verify_jobs_removed('S1')
+
+    def test_eod_mark_uses_bound_method(self):
+        from unittest.mock import MagicMock
+        from ali2026v3_trading.strategy_scheduler import StrategyScheduler, _resolve_capabilities
+        mgr = StrategyScheduler()
+        backend = MagicMock()
+        mgr._scheduler, mgr._caps = backend, _resolve_capabilities(backend)
+        order_service = MagicMock()
+        mgr.register_trading_jobs('S1', 'r1', lambda: None, lambda: None, order_service)
+        owner = mgr._job_owners['S1_virtual_pos_eod_mark']
+        assert owner.func_name == '_run_virtual_pos_eod_mark'
+        job = backend.add_job.call_args_list[-1].args[0]
+        assert job.func == mgr._run_virtual_pos_eod_mark and job.args == (order_service,)
+        assert mgr.remove_jobs_by_owner('S1') == 4
+        assert mgr.verify_jobs_removed('S1')
@@ -0,0 +1,125 @@
+"""
+SubscriptionManager订阅路径优化回归测试
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+class TestClassifyInstruments:
+    """期权按 product+year_month 分组，组内保持输入顺序"""
+
+    def test_groups_by_underlying(self):
+        from ali2026v3_trading.subscription_manager import SubscriptionManager
+        futures, options = SubscriptionManager.classify_instruments(
+            ['IF2605', 'IO2605-C-4000', 'al2605C18900', 'IO2605-P-3800', 'rb2605', 'al2605P18500'])
+        assert futures == ['IF2605', 'rb2605']
+        assert options == {
+            'IO2605': ['IO2605-C-4000', 'IO2605-P-3800'],
+            'al2605': ['al2605C18900', 'al2605P18500'],
+        }
+        assert list(options) == ['IO2605', 'al2605']
+
+
+class TestPendingSubscriptions:
+    """data_manager未绑定时，订阅请求以(instrument_id, data_type)元组入队"""
+
+    def test_pending_queue_uses_tuples(self):
+        from ali2026v3_trading.subscription_manager import SubscriptionManager
+        sm = SubscriptionManager(data_manager=None)
+        sm._do_subscribe('IF2605', 'tick')
+        sm._do_subscribe('IO2605-C-4000', 'tick')
+        assert sm._pending_subscriptions == [('IF2605', 'tick'), ('IO2605-C-4000', 'tick')]
+
+
+class TestResolveProductExchange:
+    """默认交易所查找表只构建一次；自定义映射仍逐次合并"""
+
+    def test_default_lookup_reused(self, monkeypatch):
+        from ali2026v3_trading import config_exchange
+        monkeypatch.setattr(config_exchange, '_default_exchange_lookup', None)
+        assert config_exchange.resolve_product_exchange('cu2605') == 'SHFE'
+        lookup = config_exchange._default_exchange_lookup
+        assert config_exchange.resolve_product_exchange('IO2605-C-4000') == 'CFFEX'
+        assert config_exchange.resolve_product_exchange('m2605') == 'DCE'
+        assert config_exchange._default_exchange_lookup is lookup
+        assert config_exchange.resolve_product_exchange('cu2605', {'CU': 'XSHF'}) == 'XSHF'
+        assert config_exchange.resolve_product_exchange('zz2605', default_exchange='DCE') == 'DCE'
+        assert config_exchange._default_exchange_lookup is lookup
+
+
+class TestSubscribeAll:
+    """全量订阅：期货订阅tick+1分钟K线，期权订阅tick，失败项入重试队列"""
+
+    def test_subscribe_all_instruments(self):
+        from unittest.mock import MagicMock
+        from ali2026v3_trading.subscription_manager import SubscriptionManager
+        def _subscribe(inst, data_type):
+            if inst == 'bad':
+                raise RuntimeError('rejected')
+
+        dm = MagicMock()
+        dm.subscribe.side_effect = _subscribe
+        sm = SubscriptionManager(data_manager=dm)
+        sm.ensure_background_threads = lambda: None
+        total = sm.subscribe_all_instruments(['IF2605'], {'IO': ['IO2605-C-4000', 'bad']})
+        assert total == 3
+        assert [c.args for c in dm.subscribe.call_args_list] == [
+            ('IF2605', 'tick'), ('IF2605', 'kline_1min'), ('IO2605-C-4000', 'tick'), ('bad', 'tick')]
+        assert [t[0]['instrument_id'] for t in sm._retry_queue] == ['bad']
+
+
+class TestDefaultAlertCallback:
+    """未配置告警回调时，默认回调输出WARNING日志"""
+
+    def test_default_alert_logs_warning(self, caplog):
+        import logging
+        from ali2026v3_trading.subscription_manager import SubscriptionManager
+        sm = SubscriptionManager(data_manager=None)
+        with caplog.at_level(logging.WARNING):
+            sm._config.alert_callback(12, 'Subscription failure rate too high')
+        assert '告警: count=12 msg=Subscription failure rate too high' in caplog.text
+
+
+class TestTickGuard:
+    """on_tick入口：非法价格直接丢弃，非法成交量按0处理"""
+
+    def test_invalid_price_and_volume(self):
+        from ali2026v3_trading.subscription_manager import SubscriptionManager
+        sm = SubscriptionManager(data_manager=None)
+        sm._bg_threads_started = True
+        seen = []
+        sm._on_tick_impl = lambda inst, price, volume: seen.append((inst, price, volume))
+        for price in (float('nan'), float('inf'), 0, -1.0, None, '1'):
+            sm.on_tick('IF2605', price, 1)
+        sm.on_tick('', 4000.0, 1)
+        assert seen == []
+        sm.on_tick('IF2605', 4000.0, float('nan'))
+        sm.on_tick('IO2605-C-4000', 12.5, 7)
+        sm.on_tick('IH2605', 2800.0, -3)
+        assert seen == [('IF2605', 4000.0, 0), ('IO2605-C-4000', 12.5, 7), ('IH2605', 2800.0, 0)]
+
+
+class TestRecordSubscription:
+    """订阅分母：订阅时间逐合约记录，品种去重"""
+
+    def test_record_subscription(self):
+        from ali2026v3_trading.subscription_manager import SubscriptionManager
+        sm = SubscriptionManager(data_manager=None)
+        sm.record_subscription(['cu2605', 'cu2606C70000', 'IF2605'])
+        stats = sm._subscription_success
+        assert set(stats['subscribe_time']) == {'cu2605', 'cu2606C70000', 'IF2605'}
+        assert len(set(stats['subscribe_time'].values())) == 1
+        assert stats['subscribed_products'] == {'CU', 'IF'}
+        assert (stats['total_subscribed'], stats['total_products']) == (3, 2)
+
+
+class TestIterSubscriptionTargets:
+    """订阅目标：先期货后期权，空分组跳过"""
+
+    def test_order_and_kind(self):
+        from ali2026v3_trading.subscription_manager import iter_subscription_targets
+        got = list(iter_subscription_targets(['IF2605'], {'IO2605': ['IO2605-C-4000'], 'HO2605': None}))
+        assert got == [('IF2605', 'future'), ('IO2605-C-4000', 'option')]
+        assert list(iter_subscription_targets([], {})) == []
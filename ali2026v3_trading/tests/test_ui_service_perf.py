@@ -0,0 +1,204 @@
+"""
+UIMixin/StrategyUI 无界面开销优化回归测试（不依赖tkinter）
+"""
+import sys
+import os
+import queue
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def _make_mixin():
+    from ali2026v3_trading.ui_service import UIMixin
+    ui = UIMixin.__new__(UIMixin)
+    ui.params = SimpleNamespace(output_mode='trade')
+    ui._ui_queue = queue.Queue()
+    return ui
+
+
+class TestScheduleRefreshScope:
+    """UI刷新消息只在界面运行时投递"""
+
+    def test_no_enqueue_without_running_ui(self):
+        ui = _make_mixin()
+        for _ in range(5):
+            ui.set_output_mode('close_debug')
+        assert ui._ui_queue.empty()
+        assert ui.params.output_mode == 'close_debug'
+
+    def test_enqueue_when_ui_running(self):
+        ui = _make_mixin()
+        ui._ui_running = True
+        ui._schedule_output_mode_ui_refresh()
+        assert ui._ui_queue.get_nowait() == {"action": "refresh_style"}
+
+
+class _FakeText:
+    def __init__(self):
+        self.inserts = []
+
+    def config(self, **kwargs):
+        pass
+
+    def delete(self, *args):
+        pass
+
+    def insert(self, index, text):
+        self.inserts.append(text)
+
+    def see(self, index):
+        pass
+
+
+class TestStatusRedraw:
+    """状态面板：内容不变时不重绘"""
+
+    def test_unchanged_status_skips_redraw(self):
+        from ali2026v3_trading.ui_service import StrategyUI
+        strategy = SimpleNamespace(my_is_running=True, my_is_paused=False, my_trading=True)
+        ui = StrategyUI(strategy_core=strategy)
+        ui._widgets["status_text"] = text = _FakeText()
+        ui._update_status()
+        ui._update_status()
+        assert len(text.inserts) == 1
+        strategy.my_is_paused = True
+        ui._update_status()
+        assert len(text.inserts) == 2
+        assert "暂停状态: True" in text.inserts[-1]
+
+
+class TestLogCoalescing:
+    """日志面板：每轮消息合并为一次写入"""
+
+    def test_batch_written_once_and_capped(self):
+        from ali2026v3_trading.ui_service import StrategyUI
+        ui = StrategyUI()
+        ui._widgets["log_text"] = text = _FakeText()
+        for i in range(25):
+            ui.log(f"m{i}")
+        ui._process_messages()
+        assert len(text.inserts) == 1
+        assert text.inserts[0].count("\n") == 20
+        ui._process_messages()
+        assert text.inserts[1].count("\n") == 5
+        ui._process_messages()
+        assert len(text.inserts) == 2
+
+
+class TestOutputSinkCache:
+    """平台output方法只解析一次"""
+
+    def test_output_resolved_once(self):
+        from ali2026v3_trading.ui_service import UIMixin
+
+        class Host(UIMixin):
+            lookups = 0
+            lines = []
+
+            def __getattribute__(self, name):
+                if name == "output":
+                    type(self).lookups += 1
+                return object.__getattribute__(self, name)
+
+            def output(self, msg, force=False):
+                type(self).lines.append(msg)
+
+        host = Host.__new__(Host)
+        for i in range(3):
+            host._log_info(f"m{i}")
+        assert Host.lines == ["m0", "m1", "m2"]
+        assert Host.lookups == 1
+
+    def test_missing_output_falls_back_to_logger(self, caplog):
+        import logging
+        ui = _make_mixin()
+        with caplog.at_level(logging.INFO, logger="ali2026v3_trading.ui_service"):
+            ui._log_error("boom")
+        assert ui._ui_output_fn is None
+        assert "boom" in caplog.text
+
+
+class TestReleaseOnClose:
+    """事件日志有界；窗口关闭后释放控件引用"""
+
+    def test_event_log_bounded(self):
+        from ali2026v3_trading.ui_service import StrategyUI
+        ui = StrategyUI()
+        for _ in range(StrategyUI.EVENT_LOG_MAXLEN + 10):
+            ui._on_flatten()
+        assert len(ui.event_log) == StrategyUI.EVENT_LOG_MAXLEN
+
+    def test_widget_refs_released(self):
+        ui = _make_mixin()
+        ui._ui_root, ui._ui_lbl, ui._ui_btn_trade = object(), object(), object()
+        ui._release_ui_widget_refs()
+        assert ui._ui_root is None and ui._ui_lbl is None and ui._ui_btn_trade is None
+        assert '_ui_root' not in ui.__dict__
+
+
+class TestPerClassUILock:
+    """UI锁按具体类分片"""
+
+    def test_lock_is_per_class_and_init_works(self):
+        from ali2026v3_trading.ui_service import UIMixin
+
+        class A(UIMixin):
+            pass
+
+        class B(UIMixin):
+            pass
+
+        a1, a2, b = A(), A(), B()
+        assert A._get_ui_lock() is A._get_ui_lock()
+        assert A._get_ui_lock() is not B._get_ui_lock()
+
+
+class _FakeButton:
+    def __init__(self):
+        self.state = {}
+
+    def config(self, **kwargs):
+        self.state.update(kwargs)
+
+
+class TestRefreshStyles:
+    """按钮样式刷新：无窗口直接返回；按模式设置选中态"""
+
+    def test_no_root_is_noop(self):
+        ui = _make_mixin()
+        ui._ui_btn_trade = btn = _FakeButton()
+        ui._refresh_output_mode_ui_styles()
+        assert btn.state == {}
+
+    def test_active_buttons_sunken(self):
+        ui = _make_mixin()
+        ui._ui_root = object()
+        ui._ui_lbl = lbl = _FakeButton()
+        ui._ui_btn_trade, ui._ui_btn_debug, ui._ui_btn_manual = _FakeButton(), _FakeButton(), _FakeButton()
+        ui._refresh_output_mode_ui_styles()
+        assert lbl.state['text'] == "当前模式: trade"
+        assert ui._ui_btn_trade.state['relief'] == "sunken"
+        assert ui._ui_btn_debug.state['relief'] == "raised"
+        assert ui._ui_btn_manual.state['relief'] == "sunken"
+
+
+class TestCallMethodByPriority:
+    """按优先级调用：类级解析缓存 + 实例属性回退"""
+
+    def test_class_resolution_cached_and_instance_fallback(self):
+        from ali2026v3_trading.ui_service import UIMixin, _PRIORITY_METHOD_CACHE
+
+        class Host(UIMixin):
+            def pause_strategy(self):
+                return 'pause'
+
+        host = Host.__new__(Host)
+        names = ['internal_pause_strategy', 'pause_strategy']
+        assert host._call_method_by_priority(names) == 'pause'
+        assert _PRIORITY_METHOD_CACHE[(Host, tuple(names))] == 'pause_strategy'
+
+        bare = UIMixin.__new__(UIMixin)
+        assert bare._call_method_by_priority(['resume_strategy']) is None
+        bare.resume_strategy = lambda: 'resumed'
+        assert bare._call_method_by_priority(['resume_strategy']) == 'resumed'
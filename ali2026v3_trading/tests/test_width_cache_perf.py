@@ -0,0 +1,68 @@
+"""
+WidthStrengthCache逐tick查询路径回归测试
+"""
+import sys
+import os
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def _make_cache():
+    from ali2026v3_trading.width_cache import WidthStrengthCache
+    ps = MagicMock()
+    ps.get_instrument_meta.side_effect = lambda fid: {'product': 'CU'} if fid == 1 else None
+    wc = WidthStrengthCache(params_service=ps)
+    wc._sync_otm_count[1]['2501']['CALL'] = 3
+    wc._sync_otm_count[1]['2501']['PUT'] = 2
+    wc._sync_otm_count[1]['2502']['PUT'] = 4
+    wc._months[1] = ['2501', '2502']
+    return wc, ps
+
+
+class TestWidthStrengthQuery:
+    """已注册期货直接读计数表，不再逐次查询元数据"""
+
+    def test_strength_sums_months_and_types(self):
+        wc, ps = _make_cache()
+        assert wc.get_width_strength(1, wc.get_all_months(1)) == 9
+        assert wc.get_width_strength(1, ['2501', '2503'], 'put') == 2
+        assert wc.get_width_strength(1, []) == 0
+        ps.get_instrument_meta.assert_not_called()
+        assert set(wc._sync_otm_count[1]) == {'2501', '2502'}
+
+    def test_unknown_future_warns_and_returns_empty(self, caplog):
+        wc, _ = _make_cache()
+        assert wc.get_width_strength(2, ['2501']) == 0
+        assert wc.get_all_months(2) == []
+        assert caplog.text.count('Unknown future_internal_id: 2') == 2
+        assert 2 not in wc._sync_otm_count and 2 not in wc._months
+
+
+class TestDailyVolumeRollover:
+    """日成交量按北京时间整数日序号换日"""
+
+    def test_rollover_at_china_midnight(self, monkeypatch):
+        from ali2026v3_trading import width_cache
+        wc, _ = _make_cache()
+        day_end = 20000 * 86400 - 8 * 3600  # 北京时间某日 24:00 的 UTC 秒数
+        monkeypatch.setattr(width_cache.time, 'time', lambda: day_end - 1)
+        assert wc._current_day_no() == 19999
+        monkeypatch.setattr(width_cache.time, 'time', lambda: day_end)
+        assert wc._current_day_no() == 20000
+
+    def test_rollover_follows_day_helper(self, monkeypatch):
+        wc, _ = _make_cache()
+        norm = wc._normalize_instrument_id('cu2501C70000')
+        wc._instrument_id_to_internal_id[norm] = 7
+        day = [19999]
+        monkeypatch.setattr(wc, '_current_day_no', lambda: day[0])
+        monkeypatch.setattr(wc, '_get_current_trading_date', lambda: str(day[0]))
+        wc.on_option_tick('cu2501C70000', 10.0, volume=5)
+        wc.on_option_tick('cu2501C70000', 10.0, volume=3)
+        assert wc._option_daily_volume[7] == 8
+        assert (wc._current_trading_day, wc._current_trading_date) == (19999, '19999')
+        day[0] = 20000
+        wc.on_option_tick('cu2501C70000', 10.0, volume=2)
+        assert wc._option_daily_volume[7] == 2 and wc._option_volume[7] == 10
+        assert (wc._current_trading_day, wc._current_trading_date) == (20000, '20000')
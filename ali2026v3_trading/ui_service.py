@@ -20,8 +20,9 @@ import json
 import threading
 import queue
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Deque, Dict, List, Optional, Callable
 from dataclasses import dataclass, field
 
 from ali2026v3_trading.scheduler_service import is_market_open
@@ -35,6 +36,19 @@ logger = logging.getLogger(__name__)
 # 辅助函数
 # =============================================================================
 
+# 仅保护各类UI锁的惰性创建
+_UI_LOCK_GUARD = threading.Lock()
+
+# 未解析标记（区别于None=已解析但不可用）
+_UNRESOLVED = object()
+
+# _call_method_by_priority解析结果缓存：(类, 方法名序列) -> 首个可用方法名
+_PRIORITY_METHOD_CACHE: Dict[Any, Optional[str]] = {}
+
+# 主线程队列消费者可处理的动作，其余消息（如create_ui）直接丢弃，不进入分支判断
+_MAIN_UI_ACTIONS = frozenset({"pause_status", "refresh_style", "bring_front", "destroy"})
+
+
 def safe_getattr_int(obj: Any, attr: str, default: int = 0, min_val: int = 0) -> int:
     """安全获取整数属性"""
     try:
@@ -70,17 +84,23 @@ class UIMixin:
         """初始化"""
         super().__init__(*args, **kwargs)
         # ✅ M21 Bug #3修复：初始化锁
-        import threading
-        if UIService._ui_lock is None:
-            UIService._ui_lock = threading.Lock()
+        type(self)._get_ui_lock()
     
     @classmethod
     def _get_ui_lock(cls):
-        """获取UI锁（确保线程安全）"""
-        if cls._ui_lock is None:
-            import threading
-            cls._ui_lock = threading.Lock()
-        return cls._ui_lock
+        """获取UI锁（确保线程安全）
+
+        锁按具体类分片：窗口单例状态(_ui_global_*)本就按cls存放，
+        不同策略类之间互不阻塞，仅同类实例共用一把锁。
+        """
+        lock = cls.__dict__.get("_ui_lock")
+        if lock is None:
+            with _UI_LOCK_GUARD:
+                lock = cls.__dict__.get("_ui_lock")
+                if lock is None:
+                    lock = threading.Lock()
+                    cls._ui_lock = lock
+        return lock
     
     # UI状态（✅ M21 Bug #3修复：添加锁保护）
     _ui_lock: Any = None  # threading.Lock
@@ -94,6 +114,8 @@ class UIMixin:
     
     _ui_running: bool = False
     _ui_creating: bool = False
+    _ui_output_fn: Any = _UNRESOLVED  # 缓存的平台output方法（None表示不可用）
+    _tick_summary_count: int = 0
     
     # 类级别单例（✅ M21 Bug #3修复：添加锁保护）
     _ui_global_root: Any = None
@@ -362,7 +384,7 @@ class UIMixin:
                 except Exception as e:
                     self._log_error(f"关闭窗口失败: {e}")
                 self._ui_running = False
-                self._ui_root = None
+                self._release_ui_widget_refs()
                 with cls._get_ui_lock():
                     setattr(cls, "_ui_global_running", False)
                     setattr(cls, "_ui_global_root", None)
@@ -501,8 +523,8 @@ class UIMixin:
                                 poll_count += 1
                     except Exception as e:
                         self._log_error(f"UI主循环线程异常: {e}")
-                        import traceback
-                        self._log_error(traceback.format_exc())
+                        # 堆栈仅在DEBUG级别开启时由logging惰性格式化
+                        logger.debug("UI主循环线程异常堆栈", exc_info=True)
                     finally:
                         # 显式销毁窗口
                         try:
@@ -539,6 +561,8 @@ class UIMixin:
                         msg = self._ui_queue.get_nowait()
                         msg_count += 1
                         action = msg.get("action")
+                        if action not in _MAIN_UI_ACTIONS:
+                            continue
                         
                         if action == "pause_status":
                             is_paused = msg.get("paused")
@@ -599,53 +623,48 @@ class UIMixin:
             self._log_error(f"调度窗口前置失败: {e}")
     
     def _refresh_output_mode_ui_styles(self) -> None:
-        """刷新UI样式"""
-        try:
-            if not hasattr(self, "_ui_root") or not getattr(self, "_ui_root"):
-                return
-            import tkinter as tk
-            cur = str(getattr(self.params, 'output_mode', 'debug')).lower()
-            # ✅ 修复：仅当 output_mode='debug' 且未明确指定时，根据时间智能判断
-            # 注意：这只是为了UI显示，不修改 params.output_mode 的实际值
-            if cur == "debug":
-                # 根据当前时间决定显示哪种调试模式
-                display_mode = "open_debug" if is_market_open() else "close_debug"
-            else:
-                display_mode = cur
+        """刷新UI样式（无窗口时直接返回，仅对Tk控件调用做异常保护）"""
+        if not self._ui_root:
+            return
+        cur = str(getattr(self.params, 'output_mode', 'debug')).lower()
+        # ✅ 修复：仅当 output_mode='debug' 且未明确指定时，根据时间智能判断
+        # 注意：这只是为了UI显示，不修改 params.output_mode 的实际值
+        if cur == "debug":
+            # 根据当前时间决定显示哪种调试模式
+            display_mode = "open_debug" if is_market_open() else "close_debug"
+        else:
+            display_mode = cur
+        
+        lbl = self._ui_lbl
+        if lbl:
             try:
-                if hasattr(self, "_ui_lbl") and self._ui_lbl:
-                    self._ui_lbl.config(text=f"当前模式: {cur}")
+                lbl.config(text=f"当前模式: {cur}")
             except Exception as e:
                 self._log_error(f"更新标签失败: {e}")
-            
-            try:
-                is_open_debug = (display_mode == 'open_debug')
-                is_close_debug = (display_mode == 'close_debug')
-                is_trade_mode = (display_mode == 'trade')
-                is_auto = getattr(self, "auto_trading_enabled", False)
-                
-                def _set_style(btn_attr, active, color="#2e7d32"):
-                    btn = getattr(self, btn_attr, None)
-                    if btn:
-                        if active:
-                            btn.config(relief=tk.SUNKEN, bg=color, fg="white")
-                        else:
-                            btn.config(relief=tk.RAISED, bg="#f0f0f0", fg="black")
-                
-                _set_style("_ui_btn_debug", is_open_debug)
-                _set_style("_ui_btn_debug_off", is_close_debug, color="#ef6c00")
-                _set_style("_ui_btn_trade", is_trade_mode)
-                _set_style("_ui_btn_auto", is_auto, color="#1565c0")
-                _set_style("_ui_btn_manual", not is_auto, color="#546e7a")
-            except Exception as e:
-                self._log_error(f"设置按钮样式失败: {e}")
+        
+        is_auto = getattr(self, "auto_trading_enabled", False)
+        styles = (
+            (self._ui_btn_debug, display_mode == 'open_debug', "#2e7d32"),
+            (self._ui_btn_debug_off, display_mode == 'close_debug', "#ef6c00"),
+            (self._ui_btn_trade, display_mode == 'trade', "#2e7d32"),
+            (self._ui_btn_auto, is_auto, "#1565c0"),
+            (self._ui_btn_manual, not is_auto, "#546e7a"),
+        )
+        try:
+            for btn, active, color in styles:
+                if not btn:
+                    continue
+                if active:
+                    btn.config(relief="sunken", bg=color, fg="white")
+                else:
+                    btn.config(relief="raised", bg="#f0f0f0", fg="black")
         except Exception as e:
-            self._log_error(f"刷新UI样式失败: {e}")
+            self._log_error(f"设置按钮样式失败: {e}")
     
     def _schedule_output_mode_ui_refresh(self) -> None:
-        """调度UI刷新"""
+        """调度UI刷新（仅在本实例界面运行时投递，无界面时不堆积消息）"""
         try:
-            if hasattr(self, "_ui_queue"):
+            if self._ui_running and hasattr(self, "_ui_queue"):
                 self._ui_queue.put({"action": "refresh_style"})
         except Exception as e:
             self._log_error(f"调度UI刷新失败: {e}")
@@ -831,23 +850,42 @@ class UIMixin:
         Returns:
             方法返回值，或None（无可用方法时）
         """
-        for name in method_names:
-            if hasattr(self, name):
-                method = getattr(self, name)
-                if callable(method):
-                    return method(*args, **kwargs)
+        # 按(类, 方法名序列)缓存首个可用方法名，同类实例不再逐个hasattr探测
+        key = (type(self), tuple(method_names))
+        name = _PRIORITY_METHOD_CACHE.get(key, _UNRESOLVED)
+        if name is _UNRESOLVED:
+            name = next((n for n in key[1] if callable(getattr(key[0], n, None))), None)
+            _PRIORITY_METHOD_CACHE[key] = name
+        if name is not None:
+            return getattr(self, name)(*args, **kwargs)
+        # 类上无可用方法时退回实例级查找（兼容运行期注入的实例属性）
+        for n in method_names:
+            method = getattr(self, n, None)
+            if callable(method):
+                return method(*args, **kwargs)
         return None
 
     def _log_output(self, msg: str, level: str = "INFO") -> None:
-        """统一日志输出入口（按级别分发）"""
-        log_func = logger.info if level.upper() == "INFO" else logger.error
-        if hasattr(self, "output"):
+        """统一日志输出入口（按级别分发）
+
+        平台output方法在首次调用时解析并缓存，之后不再逐条hasattr探测。
+        """
+        output = self._ui_output_fn
+        if output is _UNRESOLVED:
+            output = getattr(self, "output", None)
+            if not callable(output):
+                output = None
+            self._ui_output_fn = output
+        if output is not None:
             try:
-                self.output(msg, force=True)
+                output(msg, force=True)
                 return
             except Exception as e:
-                self._log_error(f"UI输出失败: {e}")
-        log_func(msg)
+                logger.error(f"UI输出失败: {e}")
+        if level.upper() == "INFO":
+            logger.info(msg)
+        else:
+            logger.error(msg)
 
     def _log_info(self, msg: str) -> None:
         """记录信息日志"""
@@ -862,11 +900,17 @@ class UIMixin:
         try:
             if hasattr(self, '_ui_root') and self._ui_root is not None:
                 self._ui_root.destroy()
-                self._ui_root = None
+            self._release_ui_widget_refs()
             self._ui_running = False
         except Exception as e:
             logger.debug(f"[UIMixin._destroy_output_mode_ui] {e}")
 
+    def _release_ui_widget_refs(self) -> None:
+        """窗口关闭后释放实例上的控件引用（回退到类级None默认值）"""
+        for attr in ("_ui_root", "_ui_lbl", "_ui_btn_debug", "_ui_btn_debug_off",
+                     "_ui_btn_trade", "_ui_btn_auto", "_ui_btn_manual"):
+            self.__dict__.pop(attr, None)
+
     def _release_runtime_caches(self) -> None:
         """释放运行时缓存"""
         try:
@@ -882,10 +926,8 @@ class UIMixin:
     def _log_tick_summary(self, tick: Any) -> None:
         """记录Tick汇总日志"""
         try:
-            if not hasattr(self, '_tick_summary_count'):
-                self._tick_summary_count = 0
             self._tick_summary_count += 1
-            if self._tick_summary_count % 1000 == 0:
+            if self._tick_summary_count % 1000 == 0 and logger.isEnabledFor(logging.DEBUG):
                 instrument_id = getattr(tick, 'instrument_id', getattr(tick, 'InstrumentID', '?'))
                 logger.debug(f"[TickSummary] received {self._tick_summary_count} ticks, last={instrument_id}")
         except Exception as e:
@@ -899,6 +941,8 @@ class UIMixin:
 class StrategyUI:
     """策略UI界面 - 独立运行的控制面板"""
     
+    EVENT_LOG_MAXLEN = 1000
+    
     def __init__(self, strategy_core=None, title="策略控制面板", width=900, height=700):
         self.strategy = strategy_core
         self.title = title
@@ -909,6 +953,7 @@ class StrategyUI:
         self._running = False
         self._ui_thread = None
         self._widgets = {}
+        self._last_status_text: Optional[str] = None
         
         # 回调
         self.on_pause: Optional[Callable] = None
@@ -917,8 +962,8 @@ class StrategyUI:
         self.on_param_change: Optional[Callable] = None
         self.on_close: Optional[Callable] = None
         
-        # 事件日志
-        self.event_log: List[UIEvent] = []
+        # 事件日志（有界，长时间运行不无限增长）
+        self.event_log: Deque[UIEvent] = deque(maxlen=self.EVENT_LOG_MAXLEN)
         self._lock = threading.Lock()
     
     def start(self) -> "StrategyUI":
@@ -967,6 +1012,10 @@ class StrategyUI:
             logger.error(f"UI error: {e}")
         finally:
             self._running = False
+            # 窗口销毁后释放控件引用，避免持有已销毁的Tk对象
+            self._widgets.clear()
+            self._last_status_text = None
+            self.root = None
     
     def _build_control_panel(self) -> None:
         """构建控制面板"""
@@ -1048,35 +1097,40 @@ class StrategyUI:
             if hasattr(self.strategy, "params"):
                 status.append(f"输出模式: {getattr(self.strategy.params, 'output_mode', 'debug')}")
             
+            content = "\n".join(status)
+            # 状态未变化时不重绘文本控件
+            if content == self._last_status_text:
+                return
             text = self._widgets.get("status_text")
             if text:
+                self._last_status_text = content
                 text.config(state="normal")
                 text.delete("1.0", "end")
-                text.insert("1.0", "\n".join(status))
+                text.insert("1.0", content)
                 text.config(state="disabled")
         except Exception as e:
             logger.error(f"Update status error: {e}")
     
     def _process_messages(self) -> None:
-        """处理消息队列"""
+        """处理消息队列（单轮最多20条，合并为一次控件写入）"""
+        batch: List[str] = []
         try:
-            msg_count = 0
-            while not self.message_queue.empty() and msg_count < 20:
-                msg = self.message_queue.get_nowait()
-                msg_count += 1
-                self._append_log(msg)
+            while len(batch) < 20:
+                batch.append(self.message_queue.get_nowait())
         except queue.Empty:
             pass
         except Exception as e:
             logger.error(f"Process messages error: {e}")
+        if batch:
+            self._append_log(*batch)
     
-    def _append_log(self, msg: str) -> None:
-        """追加日志"""
+    def _append_log(self, *msgs: str) -> None:
+        """追加日志（同一批消息共用时间戳，一次insert+see）"""
         try:
             text = self._widgets.get("log_text")
-            if text:
+            if text and msgs:
                 timestamp = datetime.now(CHINA_TZ).strftime("%H:%M:%S")
-                text.insert("end", f"[{timestamp}] {msg}\n")
+                text.insert("end", "".join(f"[{timestamp}] {msg}\n" for msg in msgs))
                 text.see("end")
         except Exception as e:
             logger.error(f"Append log error: {e}")
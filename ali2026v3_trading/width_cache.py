@@ -30,6 +30,9 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from ali2026v3_trading.shared_utils import to_float32, CHINA_TZ
 
+# CHINA_TZ 为固定UTC+8：逐tick换日判断用整数日序号，不构造datetime/格式化字符串
+_CHINA_UTC_OFFSET_SEC = int(CHINA_TZ.utcoffset(None).total_seconds())
+
 
 # ============================================================================
 # SortEntry - 排序桶条目（by_sort_bucket 索引结构）
@@ -187,6 +190,7 @@ class WidthStrengthCache:
         self._option_volume: Dict[int, float] = {}
         self._option_daily_volume: Dict[int, float] = {}
         self._current_trading_date: str = ''
+        self._current_trading_day: int = 0  # 北京时间自纪元起的日序号，与_current_trading_date同步更新
         
         # ✅ 索引：future_internal_id -> 类型 -> internal_id 列表（加速期货方向变化时的重算）
         self._options_by_future_type: Dict[int, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
@@ -836,6 +840,10 @@ class WidthStrengthCache:
         """获取当前交易日（P1-4.3修复：提取为独立方法，便于测试时mock）"""
         return datetime.now(CHINA_TZ).strftime('%Y%m%d')
 
+    def _current_day_no(self) -> int:
+        """当前北京时间自纪元起的日序号（日成交量换日判断的唯一时钟入口，便于测试时mock）"""
+        return (int(time.time()) + _CHINA_UTC_OFFSET_SEC) // 86400
+
     def on_option_tick(self, instrument_id: str, price: float, volume: float = 0):
         """更新期权价格，增量更新同步虚值计数
         
@@ -851,10 +859,11 @@ class WidthStrengthCache:
             
             if volume > 0:
                 self._option_volume[internal_id] = self._option_volume.get(internal_id, 0) + volume
-                today = self._get_current_trading_date()
-                if today != self._current_trading_date:
+                day_no = self._current_day_no()
+                if day_no != self._current_trading_day:
                     self._option_daily_volume.clear()
-                    self._current_trading_date = today
+                    self._current_trading_day = day_no
+                    self._current_trading_date = self._get_current_trading_date()
                 self._option_daily_volume[internal_id] = self._option_daily_volume.get(internal_id, 0) + volume
             info = self._option_info.get(internal_id)
             if not info:
@@ -1090,15 +1099,13 @@ class WidthStrengthCache:
         Returns:
             List[str]: 月份列表
         """
-        # ✅ 从 id_cache 获取 product
-        info = self._get_params().get_instrument_meta(future_internal_id)
-        if not info:
+        # ✅ 使用 future_internal_id 作为键；已注册期货直接返回，仅未命中时查元数据用于告警
+        months = self._months.get(future_internal_id)
+        if months is not None:
+            return months
+        if not self._get_params().get_instrument_meta(future_internal_id):
             logging.warning(f"[WidthStrengthCache] Unknown future_internal_id: {future_internal_id}")
-            return []
-        
-        product = str(info.get('product', '')).upper()
-        # ✅ 使用 future_internal_id 作为键
-        return self._months.get(future_internal_id, [])
+        return []
     
     def get_width_strength(self, future_internal_id: int, months: List[str], option_type: str = None) -> int:
         """🔴 核心方法：O(1) 查询宽度强度（同步虚值期权计数）
@@ -1112,22 +1119,24 @@ class WidthStrengthCache:
             int: 同步虚值期权计数
         """
         with self._lock:
-            # ✅ 从 id_cache 获取 product
-            info = self._get_params().get_instrument_meta(future_internal_id)
-            if not info:
-                logging.warning(f"[WidthStrengthCache] Unknown future_internal_id: {future_internal_id}")
-                return 0
-            
-            product = str(info.get('product', '')).upper()
+            # ✅ 逐tick调用：先取该期货的计数表，仅未命中时查元数据用于告警（不再每次查询元数据）
+            per_future = self._sync_otm_count.get(future_internal_id)
+            if per_future is None:
+                if not self._get_params().get_instrument_meta(future_internal_id):
+                    logging.warning(f"[WidthStrengthCache] Unknown future_internal_id: {future_internal_id}")
+                    return 0
+                per_future = {}
+
             strength = 0
-            target_types = [self._normalize_option_type(option_type)] if option_type else ['CALL', 'PUT']
-            
+            target_types = (self._normalize_option_type(option_type),) if option_type else ('CALL', 'PUT')
+
             for month in months:
-                for opt_type in target_types:
-                    # ✅ O(1) 查询：直接从内存字典读取，使用 future_internal_id 作为键
-                    count = self._sync_otm_count.get(future_internal_id, {}).get(month, {}).get(opt_type, 0)
-                    strength += count
-            
+                # ✅ O(1) 查询：月份计数表只取一次，按期权类型累加
+                month_counts = per_future.get(month)
+                if month_counts:
+                    for opt_type in target_types:
+                        strength += month_counts.get(opt_type, 0)
+
             self._query_count += 1
             self._cache_hits += 1
             